@@ -0,0 +1,368 @@
+"""
+Bankroll and risk-of-ruin analytics for betting schemes.
+
+First the distribution of a round's result is sampled from the game
+itself: basic strategy rounds are played through BlackjackGame under a
+set of Rules, noting each round's Hi-Lo true count before the deal and
+its net result per unit bet. Then many bankroll paths are simulated at
+once as NumPy arrays. Every round draws a (true count, result) pair for
+every path from that joint distribution, sizes the bet with a betting
+scheme and settles it.
+
+Rounds are drawn independently, so the model keeps how often each count
+comes up and what it is worth, but not how counts run in streaks through
+a shoe. A path is ruined once it cannot cover the scheme's minimum bet,
+like is_game_over in the game. Results are in the game's money units.
+
+Usage:
+    python bankroll.py --decks 6 --scheme all --paths 200000 --rounds 1000
+    python bankroll.py --sample-rounds 500000 --save-outcomes outcomes.npz
+    python bankroll.py --outcomes outcomes.npz --scheme ramp --spread 12
+"""
+
+import abc
+import argparse
+import math
+import random
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from constants import STARTING_BANKROLL
+from counting import HI_LO
+from game import BlackjackGame
+from rules import DEFAULT_RULES, Rules, parse_payout
+from simulate import SIMULATION_BANKROLL, STRATEGIES, play_round
+
+MAX_TRUE_COUNT = 6   # True counts are bucketed as integers clipped to +/- this
+SAMPLE_BET = 10      # Pays 3:2 and 6:5 naturals exactly
+QUANTILES = (0.5, 0.9, 0.99)
+BLOCK_PATHS = 8192   # Paths simulated together, small enough that their arrays stay in cache
+
+
+class OutcomeDistribution:
+    """Joint distribution of a round's true-count bucket and its net result per unit bet."""
+
+    def __init__(self, counts: np.ndarray, values: np.ndarray):
+        # counts[bucket, outcome] is the number of rounds seen; bucket i has true count i - MAX_TRUE_COUNT
+        self.counts = counts
+        self.values = values
+        self.rounds = int(counts.sum())
+        if self.rounds == 0:
+            raise ValueError("An outcome distribution needs at least one round")
+        self.probabilities = counts / self.rounds
+        # Every counted round laid out flat, so a draw is one random index and two lookups
+        cells = np.repeat(np.arange(counts.size), counts.ravel())
+        self._buckets, outcomes = np.divmod(cells, values.size)
+        self._values = values[outcomes]
+
+    @property
+    def true_counts(self) -> np.ndarray:
+        """True count of each bucket."""
+        return np.arange(-MAX_TRUE_COUNT, MAX_TRUE_COUNT + 1)
+
+    @property
+    def bucket_probabilities(self) -> np.ndarray:
+        """How often each true-count bucket comes up."""
+        return self.probabilities.sum(axis=1)
+
+    def _moments(self) -> Tuple[np.ndarray, np.ndarray]:
+        rounds = self.counts.sum(axis=1)
+        seen = np.maximum(rounds, 1)
+        mean = self.counts @ self.values / seen
+        variance = self.counts @ (self.values * self.values) / seen - mean * mean
+        return mean, variance
+
+    @property
+    def edges(self) -> np.ndarray:
+        """Player's expected result per unit bet in each bucket (0 where no rounds were seen)."""
+        return self._moments()[0]
+
+    @property
+    def variances(self) -> np.ndarray:
+        """Variance of the result per unit bet in each bucket."""
+        return self._moments()[1]
+
+    @property
+    def edge(self) -> float:
+        """Expected result per unit bet over all rounds."""
+        return float(self.probabilities.sum(axis=0) @ self.values)
+
+    def sample(self, rng: np.random.Generator, size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Draw `size` rounds, returning their bucket indices and results per unit bet."""
+        rounds = rng.integers(0, self.rounds, size)
+        return self._buckets.take(rounds), self._values.take(rounds)
+
+    def save(self, path: str) -> None:
+        """Write the distribution to a .npz file."""
+        np.savez(path, counts=self.counts, values=self.values)
+
+    @classmethod
+    def load(cls, path: str) -> 'OutcomeDistribution':
+        """Read a distribution written by save."""
+        with np.load(path) as data:
+            return cls(data['counts'], data['values'])
+
+    def summary(self) -> str:
+        """Get a printable table of each bucket's frequency, edge and variance."""
+        lines = [f"Rounds sampled: {self.rounds:,}  (overall edge {self.edge:+.3%})",
+                 f"{'True count':>10} {'Frequency':>10} {'Edge':>9} {'Variance':>9}"]
+        for true_count, probability, edge, variance in zip(self.true_counts, self.bucket_probabilities,
+                                                           self.edges, self.variances):
+            if probability > 0:
+                lines.append(f"{true_count:>+10d} {probability:>10.2%} {edge:>+9.3%} {variance:>9.3f}")
+        return "\n".join(lines)
+
+
+def sample_outcomes(rounds: int, rules: Rules = DEFAULT_RULES, seed: Optional[int] = None,
+                    strategy_name: str = 'basic') -> OutcomeDistribution:
+    """Play rounds through BlackjackGame and collect their joint count and result distribution."""
+    rng = random.Random(seed)
+    game = BlackjackGame(rng, rules=rules)
+    counter = game.enable_counting([HI_LO])
+    seat = game.seat
+    seat.bankroll = SIMULATION_BANKROLL
+    strategy = STRATEGIES[strategy_name]
+
+    buckets = np.empty(rounds, dtype=np.int64)
+    nets = np.empty(rounds, dtype=np.int64)
+    for index in range(rounds):
+        true_count = counter.true_count(HI_LO, game.deck.cards_remaining())
+        buckets[index] = min(MAX_TRUE_COUNT, max(-MAX_TRUE_COUNT, math.floor(true_count)))
+        nets[index] = play_round(game, strategy, SAMPLE_BET)
+        seat.bankroll = SIMULATION_BANKROLL
+        game.new_round()
+
+    values, outcomes = np.unique(nets, return_inverse=True)
+    counts = np.zeros((2 * MAX_TRUE_COUNT + 1, values.size), dtype=np.int64)
+    np.add.at(counts, (buckets + MAX_TRUE_COUNT, outcomes), 1)
+    return OutcomeDistribution(counts, values / SAMPLE_BET)
+
+
+class BettingScheme(abc.ABC):
+    """Sizes every path's bet from its bankroll and the round's true-count bucket."""
+
+    name = ''
+
+    def __init__(self, minimum: float):
+        self.minimum = minimum  # Smallest bet the table takes; paths that cannot cover it are ruined
+
+    def prepare(self, distribution: OutcomeDistribution) -> None:
+        """Precompute anything the scheme needs from the outcome distribution."""
+
+    @abc.abstractmethod
+    def bets(self, bankroll: np.ndarray, buckets: np.ndarray):
+        """Bet for each path, or one bet for all of them, before it is capped at the path's bankroll."""
+
+    def describe(self) -> str:
+        return self.name
+
+
+class FlatBet(BettingScheme):
+    """The same bet every round."""
+
+    name = 'flat'
+
+    def bets(self, bankroll: np.ndarray, buckets: np.ndarray) -> float:
+        return self.minimum
+
+    def describe(self) -> str:
+        return f"flat {self.minimum:g}"
+
+
+class KellyBet(BettingScheme):
+    """A fraction of the Kelly bet, edge / variance of the bankroll, in buckets with a player edge.
+
+    Other rounds are played at the minimum bet.
+    """
+
+    name = 'kelly'
+
+    def __init__(self, minimum: float, fraction: float = 0.5, maximum: Optional[float] = None):
+        super().__init__(minimum)
+        self.fraction = fraction
+        self.maximum = maximum
+        self._ratios = None
+
+    def prepare(self, distribution: OutcomeDistribution) -> None:
+        edges, variances = distribution.edges, distribution.variances
+        self._ratios = np.where((edges > 0) & (variances > 0),
+                                self.fraction * edges / np.maximum(variances, 1e-12), 0.0)
+
+    def bets(self, bankroll: np.ndarray, buckets: np.ndarray) -> np.ndarray:
+        bets = np.maximum(self._ratios[buckets] * bankroll, self.minimum)
+        if self.maximum is not None:
+            np.minimum(bets, self.maximum, out=bets)
+        return bets
+
+    def describe(self) -> str:
+        return f"kelly x{self.fraction:g} (min {self.minimum:g})"
+
+
+class CountRamp(BettingScheme):
+    """Bet one unit at a true count of 1 or less, and one unit per true count above that, up to a spread."""
+
+    name = 'ramp'
+
+    def __init__(self, minimum: float, spread: int = 8):
+        super().__init__(minimum)
+        self.spread = spread
+        true_counts = np.arange(-MAX_TRUE_COUNT, MAX_TRUE_COUNT + 1)
+        self._bets = minimum * np.clip(true_counts, 1, spread).astype(float)
+
+    def bets(self, bankroll: np.ndarray, buckets: np.ndarray) -> np.ndarray:
+        return self._bets[buckets]
+
+    def describe(self) -> str:
+        return f"ramp 1-{self.spread} x {self.minimum:g}"
+
+
+class RuinReport:
+    """Outcome of simulating many bankroll paths with one betting scheme."""
+
+    def __init__(self, scheme: BettingScheme, start: float, rounds: int, final: np.ndarray,
+                 max_drawdown: np.ndarray, ruined_at: np.ndarray, elapsed: float):
+        self.scheme = scheme
+        self.start = start
+        self.rounds = rounds
+        self.paths = final.size
+        self.final = final
+        self.max_drawdown = max_drawdown
+        self.ruined_at = ruined_at  # Round each path was ruined in (1-based), or 0 if it survived
+        self.elapsed = elapsed
+
+    @property
+    def ruin_probability(self) -> float:
+        return float(np.count_nonzero(self.ruined_at) / self.paths)
+
+    def drawdown_quantiles(self) -> Dict[float, float]:
+        """{quantile: largest peak-to-trough fall} over paths."""
+        return dict(zip(QUANTILES, np.quantile(self.max_drawdown, QUANTILES)))
+
+    def final_quantiles(self) -> Dict[float, float]:
+        """{quantile: bankroll after the last round} over paths."""
+        return dict(zip(QUANTILES, np.quantile(self.final, QUANTILES)))
+
+    def time_to_ruin_quantiles(self) -> Optional[Dict[float, float]]:
+        """{quantile: rounds played before ruin} over ruined paths, or None if none were ruined."""
+        ruined = self.ruined_at[self.ruined_at > 0]
+        if ruined.size == 0:
+            return None
+        return dict(zip(QUANTILES, np.quantile(ruined, QUANTILES)))
+
+    def summary(self) -> str:
+        """Get a printable report."""
+        def quantiles(values: Dict[float, float]) -> str:
+            return "  ".join(f"p{quantile * 100:g} {value:,.0f}" for quantile, value in values.items())
+
+        ruin_times = self.time_to_ruin_quantiles()
+        return "\n".join([
+            f"Scheme:        {self.scheme.describe()}, bankroll {self.start:,.0f}, "
+            f"{self.paths:,} paths x {self.rounds:,} rounds ({self.elapsed:.2f}s)",
+            f"Risk of ruin:  {self.ruin_probability:.3%}",
+            f"Time to ruin:  {quantiles(ruin_times) if ruin_times else 'no path was ruined'}",
+            f"Max drawdown:  {quantiles(self.drawdown_quantiles())}",
+            f"Final:         {quantiles(self.final_quantiles())}  (mean {self.final.mean():,.0f})",
+        ])
+
+
+def simulate_paths(distribution: OutcomeDistribution, scheme: BettingScheme, paths: int = 200000,
+                   rounds: int = 1000, bankroll: float = STARTING_BANKROLL,
+                   seed: Optional[int] = None) -> RuinReport:
+    """Play `rounds` rounds on `paths` independent bankrolls at once."""
+    if bankroll < scheme.minimum:
+        raise ValueError("The starting bankroll does not cover the minimum bet")
+    rng = np.random.default_rng(seed)
+    scheme.prepare(distribution)
+
+    start_time = time.perf_counter()
+    balance = np.full(paths, float(bankroll))
+    max_drawdown = np.zeros(paths)
+    survived = np.zeros(paths, dtype=np.int64)
+    for first in range(0, paths, BLOCK_PATHS):
+        block = slice(first, min(first + BLOCK_PATHS, paths))
+        _simulate_block(distribution, scheme, rng, rounds, balance[block], max_drawdown[block], survived[block])
+    # A ruined path stops betting, so the rounds it started are the round it was ruined in
+    ruined_at = np.where(balance < scheme.minimum, survived, 0)
+    elapsed = time.perf_counter() - start_time
+    return RuinReport(scheme, float(bankroll), rounds, balance, max_drawdown, ruined_at, elapsed)
+
+
+def _simulate_block(distribution: OutcomeDistribution, scheme: BettingScheme, rng: np.random.Generator,
+                    rounds: int, balance: np.ndarray, max_drawdown: np.ndarray, survived: np.ndarray) -> None:
+    """Play rounds on a block of paths, updating their arrays in place."""
+    peak = balance.copy()
+    drop = np.empty_like(balance)
+    for _ in range(rounds):
+        alive = balance >= scheme.minimum
+        if not alive.any():
+            break
+        survived += alive
+        buckets, outcomes = distribution.sample(rng, balance.size)
+        # A bet can use at most the whole bankroll, and ruined paths stop betting
+        bets = np.minimum(scheme.bets(balance, buckets), balance)
+        bets *= alive
+        bets *= outcomes
+        balance += bets
+        # Doubles and splits are not refused for lack of money, so keep the shortfall at zero
+        np.maximum(balance, 0.0, out=balance)
+        np.maximum(peak, balance, out=peak)
+        np.subtract(peak, balance, out=drop)
+        np.maximum(max_drawdown, drop, out=max_drawdown)
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Simulate bankroll paths and risk of ruin for betting schemes.")
+    parser.add_argument('--outcomes', default=None, metavar='PATH',
+                        help="load an outcome distribution saved with --save-outcomes instead of sampling")
+    parser.add_argument('--save-outcomes', default=None, metavar='PATH', help="save the sampled distribution (.npz)")
+    parser.add_argument('--sample-rounds', type=int, default=200000, help="game rounds to sample outcomes from")
+    parser.add_argument('--decks', type=int, default=6, help="decks in the shoe the outcomes are sampled from")
+    parser.add_argument('--h17', action='store_true', help="dealer hits soft 17")
+    parser.add_argument('--payout', default='3:2', help="blackjack payout")
+    parser.add_argument('--scheme', choices=('flat', 'kelly', 'ramp', 'all'), default='all', help="betting scheme")
+    parser.add_argument('--unit', type=float, default=10, help="minimum bet, and the flat and ramp betting unit")
+    parser.add_argument('--kelly-fraction', type=float, default=0.5, help="fraction of the Kelly bet")
+    parser.add_argument('--spread', type=int, default=8, help="largest ramp bet, in units")
+    parser.add_argument('--bankroll', type=float, default=STARTING_BANKROLL, help="starting bankroll")
+    parser.add_argument('--paths', type=int, default=200000, help="bankroll paths to simulate")
+    parser.add_argument('--rounds', type=int, default=1000, help="rounds per path")
+    parser.add_argument('--seed', type=int, default=None, help="seed for sampling and for the paths")
+    args = parser.parse_args()
+
+    if args.paths < 1 or args.rounds < 1 or args.sample_rounds < 1:
+        parser.error("--paths, --rounds and --sample-rounds must be positive")
+    if args.unit <= 0 or args.spread < 1:
+        parser.error("--unit and --spread must be positive")
+    if args.bankroll < args.unit:
+        parser.error("--bankroll must cover at least one --unit bet")
+
+    if args.outcomes:
+        distribution = OutcomeDistribution.load(args.outcomes)
+    else:
+        try:
+            rules = Rules(dealer_hits_soft_17=args.h17, blackjack_payout=parse_payout(args.payout), decks=args.decks)
+        except (ValueError, ZeroDivisionError) as e:
+            parser.error(f"Bad rule value: {e}")
+        start_time = time.perf_counter()
+        distribution = sample_outcomes(args.sample_rounds, rules, args.seed)
+        print(f"Sampled {rules.describe()} in {time.perf_counter() - start_time:.1f}s")
+    if args.save_outcomes:
+        distribution.save(args.save_outcomes)
+    print(distribution.summary())
+
+    schemes = {
+        'flat': FlatBet(args.unit),
+        'kelly': KellyBet(args.unit, args.kelly_fraction),
+        'ramp': CountRamp(args.unit, args.spread),
+    }
+    for name, scheme in schemes.items():
+        if args.scheme in (name, 'all'):
+            print()
+            print(simulate_paths(distribution, scheme, args.paths, args.rounds, args.bankroll, args.seed).summary())
+
+
+if __name__ == "__main__":
+    main()
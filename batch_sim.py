@@ -0,0 +1,233 @@
+"""
+NumPy-vectorized batch simulation of blackjack rounds.
+
+Each lane of a batch is one round dealt from its own freshly shuffled
+52-card deck. Dealing, the player's strategy-table decisions and the
+dealer's play are applied to the whole batch at once. Splits are not
+modelled: pairs are played as ordinary hard or soft totals.
+
+The results are cross-checked against BlackjackGame by replaying the
+same deck orders through the object model (see cross_check).
+
+Usage:
+    python batch_sim.py --rounds 10000000 --seed 1
+    python batch_sim.py --check 10000 --seed 1
+"""
+
+import argparse
+import time
+from typing import Callable
+
+import numpy as np
+
+from card import CARDS
+from game import BlackjackGame
+from hand import Hand
+from simulate import HIT, STAND, DOUBLE, SimulationResult, SIMULATION_BANKROLL, play_round
+
+# Strategy table actions
+ACTION_STAND = 0
+ACTION_HIT = 1
+ACTION_DOUBLE = 2  # Double if allowed, otherwise hit
+ACTION_DOUBLE_OR_STAND = 3  # Double if allowed, otherwise stand
+
+_ACTION_NAMES = {ACTION_STAND: STAND, ACTION_HIT: HIT, ACTION_DOUBLE: DOUBLE}
+
+# Card indices are positions in card.CARDS
+CARD_POINTS = np.array([card.get_numeric_value() for card in CARDS], dtype=np.int8)
+
+# Results are counted in half bets so that a 3:2 blackjack is an integer
+HALF_BETS = 2
+
+# Dealer stands on all 17s, as in BlackjackGame.update_dealer
+DEALER_STAND = 17
+
+
+def make_strategy_table(choose: Callable[[int, bool, int], int]) -> np.ndarray:
+    """Build a strategy table from a function of (player total, soft, dealer up-card value).
+
+    The table is indexed as table[soft, player_total, dealer_up_value].
+    """
+    table = np.full((2, 22, 12), ACTION_STAND, dtype=np.int8)
+    for soft in (False, True):
+        for total in range(4, 22):
+            for up in range(2, 12):
+                table[int(soft), total, up] = choose(total, soft, up)
+    return table
+
+
+def mimic_dealer_table() -> np.ndarray:
+    """Strategy table that hits below 17 and never doubles."""
+    return make_strategy_table(lambda total, soft, up: ACTION_HIT if total < 17 else ACTION_STAND)
+
+
+def deal_shoes(count: int, rng: np.random.Generator) -> np.ndarray:
+    """Shuffle one deck per lane. Column k holds the k-th card drawn."""
+    return rng.permuted(np.tile(np.arange(len(CARDS), dtype=np.int8), (count, 1)), axis=1)
+
+
+def _score(hard: np.ndarray, aces: np.ndarray):
+    """Best score and softness for hands given their hard totals and ace counts."""
+    soft = (aces > 0) & (hard + 10 <= 21)
+    return hard + 10 * soft, soft
+
+
+def simulate_batch(shoes: np.ndarray, table: np.ndarray) -> np.ndarray:
+    """Play one round per lane and return each round's net result in half bets."""
+    count = shoes.shape[0]
+    lanes = np.arange(count)
+    points = CARD_POINTS[shoes].astype(np.int16)
+    aces_dealt = points == 11
+    card_values = np.where(aces_dealt, 1, points)
+
+    # Cards are drawn in table order: player, dealer (hole), player, dealer (up)
+    player_hard = card_values[:, 0] + card_values[:, 2]
+    player_aces = aces_dealt[:, 0].astype(np.int16) + aces_dealt[:, 2]
+    dealer_hard = card_values[:, 1] + card_values[:, 3]
+    dealer_aces = aces_dealt[:, 1].astype(np.int16) + aces_dealt[:, 3]
+    dealer_up = points[:, 3]
+    position = np.full(count, 4)
+
+    player_score, _ = _score(player_hard, player_aces)
+    dealer_score, _ = _score(dealer_hard, dealer_aces)
+    player_natural = player_score == 21
+    dealer_natural = dealer_score == 21
+
+    # Player decisions, one card at a time for every lane still playing
+    wager = np.full(count, HALF_BETS, dtype=np.int64)
+    card_count = np.full(count, 2)
+    active = ~player_natural
+    while active.any():
+        player_score, soft = _score(player_hard, player_aces)
+        # Finished lanes may be bust; clip so the lookup stays in the table
+        action = table[soft.astype(np.intp), np.minimum(player_score, 21), dealer_up]
+        first_decision = card_count == 2
+        action = np.where((action == ACTION_DOUBLE) & ~first_decision, ACTION_HIT, action)
+        action = np.where(action == ACTION_DOUBLE_OR_STAND,
+                          np.where(first_decision, ACTION_DOUBLE, ACTION_STAND), action)
+
+        active &= action != ACTION_STAND
+        doubling = active & (action == ACTION_DOUBLE)
+        wager[doubling] *= 2
+
+        drawn_value = card_values[lanes, position]
+        player_hard += np.where(active, drawn_value, 0)
+        player_aces += active & aces_dealt[lanes, position]
+        position += active
+        card_count += active
+
+        player_score, _ = _score(player_hard, player_aces)
+        active &= (player_score < 21) & ~doubling
+    player_score, _ = _score(player_hard, player_aces)
+
+    # The dealer plays out every round except a player blackjack
+    drawing = ~player_natural & (dealer_score < DEALER_STAND)
+    while drawing.any():
+        dealer_hard += np.where(drawing, card_values[lanes, position], 0)
+        dealer_aces += drawing & aces_dealt[lanes, position]
+        position += drawing
+        dealer_score, _ = _score(dealer_hard, dealer_aces)
+        drawing &= dealer_score < DEALER_STAND
+
+    # Settle, mirroring BlackjackGame._handle_player_blackjack and _calculate_hand_result
+    player_bust = player_score > 21
+    dealer_bust = dealer_score > 21
+    net = np.where(player_score > dealer_score, wager, 0)
+    net = np.where(player_score < dealer_score, -wager, net)
+    net = np.where(dealer_bust, wager, net)
+    net = np.where(player_bust, -wager, net)
+    net = np.where(player_natural, np.where(dealer_natural, 0, HALF_BETS * 3 // 2), net)
+    return net
+
+
+def add_batch(result: SimulationResult, net: np.ndarray) -> None:
+    """Accumulate a batch of per-round results (in half bets) into a SimulationResult."""
+    result.rounds += len(net)
+    result.hands += len(net)
+    result.wins += int(np.count_nonzero(net > 0))
+    result.losses += int(np.count_nonzero(net < 0))
+    result.pushes += int(np.count_nonzero(net == 0))
+    result.net += int(net.sum())
+    result.net_sq += int(np.square(net).sum())
+
+
+def simulate(rounds: int, table: np.ndarray, seed: int = None,
+             batch_size: int = 100000) -> SimulationResult:
+    """Simulate a number of rounds in batches and collect the results."""
+    rng = np.random.default_rng(seed)
+    result = SimulationResult(HALF_BETS)
+
+    start_time = time.perf_counter()
+    remaining = rounds
+    while remaining > 0:
+        count = min(batch_size, remaining)
+        add_batch(result, simulate_batch(deal_shoes(count, rng), table))
+        remaining -= count
+    result.elapsed = time.perf_counter() - start_time
+
+    return result
+
+
+def table_strategy(table: np.ndarray):
+    """Strategy function for simulate.play_round that follows a strategy table."""
+    def strategy(game: BlackjackGame, hand: Hand) -> str:
+        action = table[int(hand.is_soft()), hand.calculate_score(), game.dealer_up_card.points]
+        if action == ACTION_DOUBLE_OR_STAND:
+            action = ACTION_DOUBLE if game.can_double_down() else ACTION_STAND
+        elif action == ACTION_DOUBLE and not game.can_double_down():
+            action = ACTION_HIT
+        return _ACTION_NAMES[int(action)]
+    return strategy
+
+
+def cross_check(rounds: int, table: np.ndarray, seed: int = None) -> int:
+    """Replay batch-dealt decks through BlackjackGame and compare every result.
+
+    Returns the number of rounds where the two engines disagree.
+    """
+    shoes = deal_shoes(rounds, np.random.default_rng(seed))
+    expected = simulate_batch(shoes, table)
+    strategy = table_strategy(table)
+    bet = 10
+
+    game = BlackjackGame()
+    game.bankroll = SIMULATION_BANKROLL
+    mismatches = 0
+    for shoe, batch_net in zip(shoes, expected):
+        # Deck.draw pops from the end, so the first card drawn goes last
+        game.deck.cards = [CARDS[index] for index in reversed(shoe)]
+        net = play_round(game, strategy, bet)
+        if net * HALF_BETS != batch_net * bet:
+            mismatches += 1
+        game.new_round()
+    return mismatches
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Vectorized batch simulation of blackjack rounds.")
+    parser.add_argument('--rounds', type=int, default=1000000, help="number of rounds to play")
+    parser.add_argument('--batch-size', type=int, default=100000, help="rounds per NumPy batch")
+    parser.add_argument('--seed', type=int, default=None, help="seed for the card shuffles")
+    parser.add_argument('--check', type=int, default=0, metavar='ROUNDS',
+                        help="cross-check this many rounds against BlackjackGame instead")
+    parser.add_argument('--strategy', choices=['basic', 'mimic-dealer'], default='basic',
+                        help="strategy table to play")
+    args = parser.parse_args()
+
+    if args.strategy == 'basic':
+        from strategy import get_basic_strategy
+        table = get_basic_strategy().to_batch_table()
+    else:
+        table = mimic_dealer_table()
+    if args.check:
+        mismatches = cross_check(args.check, table, args.seed)
+        print(f"Cross-checked {args.check:,} rounds against BlackjackGame: {mismatches} mismatches")
+        raise SystemExit(1 if mismatches else 0)
+
+    result = simulate(args.rounds, table, args.seed, args.batch_size)
+    print(result.summary())
+
+
+if __name__ == "__main__":
+    main()
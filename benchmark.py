@@ -0,0 +1,268 @@
+"""
+Micro-benchmarks for the game's hot paths, with stored baselines.
+
+Each benchmark times one operation many times over and keeps every
+sample, so a saved baseline can later be compared sample for sample.
+A benchmark counts as a regression when it is slower by more than the
+tolerance and a one-sided Mann-Whitney U test says the slowdown is
+unlikely to be noise.
+
+Usage:
+    python benchmark.py --save                # record a baseline
+    python benchmark.py --compare             # flag regressions against it
+    python benchmark.py --filter hand --repeat 30
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import timeit
+from typing import Callable, Dict, List, Optional, Tuple
+
+from card import CARDS, Deck, Shoe
+from clock import TurboClock
+from game import BlackjackGame
+from hand import Hand
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+DEFAULT_REPEAT = 20
+SAMPLE_TIME = 0.01        # Seconds each sample should take
+SIGNIFICANCE = 0.01       # p-value below which a slowdown is not noise
+DEFAULT_TOLERANCE = 0.05  # Slowdowns smaller than this fraction are ignored
+
+# A benchmark's setup returns the operation to time
+Benchmark = Callable[[], Callable[[], object]]
+
+
+def _deck_construct():
+    rng = random.Random(1)
+    return lambda: Deck(rng)
+
+
+def _deck_draw_52():
+    deck = Deck(random.Random(1))
+    full = list(deck.cards)
+
+    def draw_all():
+        deck.cards = list(full)
+        for _ in range(52):
+            deck.draw()
+    return draw_all
+
+
+def _deck_shuffle():
+    return Deck(random.Random(1)).shuffle
+
+
+def _shoe_reshuffle():
+    return Shoe(6, rng=random.Random(1)).reshuffle
+
+
+def _hand(values: List[str]) -> Hand:
+    cards = {card.value: card for card in CARDS}
+    hand = Hand()
+    for value in values:
+        hand.add_card(cards[value])
+    return hand
+
+
+def _hand_score_typical():
+    return _hand(['king', '7']).calculate_score
+
+
+def _hand_score_many_cards():
+    return _hand(['ace', 'ace', '2', '2', '3', 'ace', '2', '3']).calculate_score
+
+
+def _headless_round():
+    from simulate import SIMULATION_BANKROLL, STRATEGIES, play_round
+
+    game = BlackjackGame(random.Random(1), clock=TurboClock())
+    game.bankroll = SIMULATION_BANKROLL
+    strategy = STRATEGIES['basic']
+
+    def round_():
+        play_round(game, strategy, 10)
+        game.new_round()
+    return round_
+
+
+def _render_frame():
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    try:
+        from main import BlackjackApp
+    except ImportError:
+        return None
+
+    app = BlackjackApp()
+    app.game.place_bet(10)
+    app.game.deal_initial_cards()
+    app.update()
+
+    def full_frame():
+        # Forget what was drawn so every region is redrawn
+        app._drawn_state = {}
+        app.render()
+    return full_frame
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    'deck_construct': _deck_construct,
+    'deck_draw_52': _deck_draw_52,
+    'deck_shuffle': _deck_shuffle,
+    'shoe_reshuffle': _shoe_reshuffle,
+    'hand_score_typical': _hand_score_typical,
+    'hand_score_many_cards': _hand_score_many_cards,
+    'headless_round': _headless_round,
+    'render_frame': _render_frame,
+}
+
+
+def measure(operation: Callable[[], object], repeat: int = DEFAULT_REPEAT) -> List[float]:
+    """Time an operation, returning `repeat` samples in microseconds per call."""
+    timer = timeit.Timer(operation)
+    # Calibrate the loop count so each sample takes about SAMPLE_TIME
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= SAMPLE_TIME / 10:
+            break
+        number *= 10
+    number = max(1, int(number * SAMPLE_TIME / elapsed))
+
+    return [timer.timeit(number) / number * 1e6 for _ in range(repeat)]
+
+
+def run(names: List[str], repeat: int = DEFAULT_REPEAT) -> Dict[str, List[float]]:
+    """Run benchmarks by name. Ones that cannot run here are left out."""
+    results = {}
+    for name in names:
+        operation = BENCHMARKS[name]()
+        if operation is None:
+            print(f"{name:<24} skipped (pygame is not available)")
+            continue
+        operation()  # Warm up caches before timing
+        gc.collect()
+        results[name] = measure(operation, repeat)
+        print(f"{name:<24} {_describe(results[name])}")
+    return results
+
+
+def _describe(samples: List[float]) -> str:
+    return f"{statistics.median(samples):12.3f} us  (min {min(samples):.3f}, stdev {statistics.stdev(samples):.3f})"
+
+
+def mann_whitney_p(baseline: List[float], current: List[float]) -> float:
+    """One-sided p-value that current samples are not larger than baseline ones.
+
+    Uses the normal approximation to the U statistic with tie correction,
+    which is accurate enough for the sample counts used here.
+    """
+    n1, n2 = len(baseline), len(current)
+    ranked = sorted([(value, 0) for value in baseline] + [(value, 1) for value in current])
+
+    # Average ranks over ties
+    rank_sum = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < len(ranked):
+        j = i
+        while j < len(ranked) and ranked[j][0] == ranked[i][0]:
+            j += 1
+        rank = (i + j + 1) / 2
+        rank_sum += rank * sum(1 for _, group in ranked[i:j] if group == 1)
+        tie_term += (j - i) ** 3 - (j - i)
+        i = j
+
+    u = rank_sum - n2 * (n2 + 1) / 2
+    mean = n1 * n2 / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - mean) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(baseline: Dict[str, List[float]], current: Dict[str, List[float]],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Print a comparison and return the names of significant regressions."""
+    regressions = []
+    print(f"\n{'benchmark':<24} {'baseline':>12} {'current':>12} {'change':>8} {'p':>8}")
+    for name, samples in current.items():
+        if name not in baseline:
+            print(f"{name:<24} {'-':>12} {statistics.median(samples):12.3f}   (no baseline)")
+            continue
+        before = statistics.median(baseline[name])
+        after = statistics.median(samples)
+        change = after / before - 1
+        p = mann_whitney_p(baseline[name], samples)
+        verdict = ""
+        if change > tolerance and p < SIGNIFICANCE:
+            verdict = "  REGRESSION"
+            regressions.append(name)
+        elif change < -tolerance and 1 - p < SIGNIFICANCE:
+            verdict = "  faster"
+        print(f"{name:<24} {before:12.3f} {after:12.3f} {change:+8.1%} {p:8.4f}{verdict}")
+    return regressions
+
+
+def save_baseline(path: str, results: Dict[str, List[float]]) -> None:
+    """Write benchmark samples and the environment they were taken in."""
+    with open(path, 'w') as baseline_file:
+        json.dump({'python': platform.python_version(), 'machine': platform.platform(),
+                   'unit': 'us', 'benchmarks': results}, baseline_file, indent=1)
+
+
+def load_baseline(path: str) -> Tuple[Dict[str, List[float]], Optional[str]]:
+    """Read a baseline, returning its samples and a warning if it came from another environment."""
+    with open(path) as baseline_file:
+        data = json.load(baseline_file)
+    warning = None
+    if data.get('python') != platform.python_version() or data.get('machine') != platform.platform():
+        warning = (f"Baseline was recorded on Python {data.get('python')} ({data.get('machine')}); "
+                   f"timings may not be comparable")
+    return data['benchmarks'], warning
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths.")
+    parser.add_argument('--save', nargs='?', const=DEFAULT_BASELINE, default=None, metavar='PATH',
+                        help=f"save the results as a baseline (default {DEFAULT_BASELINE})")
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, default=None, metavar='PATH',
+                        help="compare against a saved baseline and exit 1 on a regression")
+    parser.add_argument('--filter', default='', help="only run benchmarks whose name contains this")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="samples per benchmark")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="ignore slowdowns smaller than this fraction")
+    args = parser.parse_args()
+
+    if args.repeat < 2:
+        parser.error("--repeat must be at least 2")
+    names = [name for name in BENCHMARKS if args.filter in name]
+    if not names:
+        parser.error(f"No benchmark matches {args.filter!r}")
+
+    baseline = None
+    if args.compare:
+        baseline, warning = load_baseline(args.compare)
+        if warning:
+            print(warning)
+
+    results = run(names, args.repeat)
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"\nSaved baseline to {args.save}")
+    if baseline is not None and compare(baseline, results, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
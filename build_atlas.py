@@ -0,0 +1,39 @@
+"""
+Build the pre-scaled card atlas used for fast startup.
+
+Packs all 52 card faces, scaled to the configured card size, into one
+raw-pixel file next to the PNGs. Rerun after changing the card images
+or CARD_WIDTH/CARD_HEIGHT; until then the game falls back to the PNGs.
+
+Usage:
+    python build_atlas.py
+    python build_atlas.py --size 100x145
+"""
+
+import argparse
+
+import pygame
+
+from card_images import build_atlas
+from constants import CARD_WIDTH, CARD_HEIGHT
+
+
+def parse_size(text: str):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Build the pre-scaled card atlas.")
+    parser.add_argument('--size', type=parse_size, default=(CARD_WIDTH, CARD_HEIGHT),
+                        help="card size as WIDTHxHEIGHT (default: %(default)s)")
+    args = parser.parse_args()
+
+    pygame.init()
+    path = build_atlas(args.size)
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,45 @@
 """
 Card and Deck classes for the blackjack game.
+
+This module is pure Python so the rules can run without a display;
+card images are looked up separately by the UI (see card_images.py).
 """
 
-import os
 import random
-from typing import List
-import pygame
+from array import array
+from typing import List, Optional
 
-from constants import CARD_WIDTH, CARD_HEIGHT, SUITS, VALUES, FACE_CARDS
+from constants import SUITS, VALUES, FACE_CARDS, SHOE_DECKS, SHOE_PENETRATION
 
 
 class Card:
     """Represents a playing card."""
+
+    __slots__ = ('suit', 'value', 'index', 'points', 'is_ace')
     
-    def __init__(self, suit: str, value: str, image_path: str):
+    def __init__(self, suit: str, value: str):
         self.suit = suit
         self.value = value
-        self.image = self._load_image(image_path)
+        # Position in the standard 52-card order (see CARDS)
+        self.index = SUITS.index(suit) * len(VALUES) + VALUES.index(value)
+        self.is_ace = value == 'ace'
+        if value in FACE_CARDS:
+            self.points = 10
+        elif self.is_ace:
+            self.points = 11
+        else:
+            self.points = int(value)
+
+    def __copy__(self) -> 'Card':
+        # Cards never change, so copies of a game can share them
+        return self
 
-    def _load_image(self, image_path: str) -> pygame.Surface:
-        """Load and scale the card image."""
-        image = pygame.image.load(image_path)
-        return pygame.transform.scale(image, (CARD_WIDTH, CARD_HEIGHT))
+    def __deepcopy__(self, memo) -> 'Card':
+        return self
 
     def get_numeric_value(self) -> int:
         """Get the numeric value of the card for blackjack scoring."""
-        if self.value in FACE_CARDS:
-            return 10
-        elif self.value == 'ace':
-            return 11
-        else:
-            return int(self.value)
+        return self.points
 
     def __str__(self) -> str:
         return f"{self.value.title()} of {self.suit.title()}"
@@ -39,37 +48,76 @@ class Card:
         return f"Card('{self.suit}', '{self.value}')"
 
 
+# One shared instance of every card. Cards are immutable, so decks and
+# shoes hand these out instead of creating new objects.
+CARDS: List[Card] = [Card(suit, value) for suit in SUITS for value in VALUES]
+
+
+def _save_rng(rng) -> Optional[tuple]:
+    """State of a deck's RNG, or None for the shared random module."""
+    return rng.getstate() if isinstance(rng, random.Random) else None
+
+
+def _load_rng(state: tuple) -> random.Random:
+    """A new RNG in a saved state."""
+    rng = random.Random()
+    rng.setstate(state)
+    return rng
+
+
 class Deck:
     """Represents a deck of playing cards."""
     
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None):
+        # Shuffling uses the global random module unless an RNG is supplied
+        self.rng = rng if rng is not None else random
+        self.num_decks = 1
+        # Optional CardCounter (see counting.py) told about every card drawn
+        self.counter = None
         self.cards = []
+        # RNG state as of the last shuffle, saved or loaded lazily by snapshots
+        self._rng_state = None
+        self._rng_pending = False
         self._create_deck()
         self.shuffle()
 
     def _create_deck(self) -> None:
         """Create a full deck of 52 cards."""
-        for suit in SUITS:
-            for value in VALUES:
-                image_path = self._get_image_path(suit, value)
-                self.cards.append(Card(suit, value, image_path))
-
-    def _get_image_path(self, suit: str, value: str) -> str:
-        """Get the image path for a card."""
-        if value in FACE_CARDS:
-            return os.path.join('cards', f'{value}_of_{suit}2.png')
-        else:
-            return os.path.join('cards', f'{value}_of_{suit}.png')
+        self.cards = list(CARDS)
 
     def shuffle(self) -> None:
         """Shuffle the deck."""
-        random.shuffle(self.cards)
+        if self._rng_pending:
+            self.rng = _load_rng(self._rng_state)
+            self._rng_pending = False
+        self.rng.shuffle(self.cards)
+        self._rng_state = None
+
+    def reshuffle(self) -> None:
+        """Gather all 52 cards back into the deck and shuffle."""
+        self._create_deck()
+        self.shuffle()
+        if self.counter is not None:
+            self.counter.reset()
 
-    def draw(self) -> Card:
-        """Draw a card from the deck."""
+    def reshuffle_discards(self, in_play: List[Card]) -> None:
+        """Gather and shuffle every card except those still on the table."""
+        self.reshuffle()
+        on_table = {card.index for card in in_play}
+        self.cards = [card for card in self.cards if card.index not in on_table]
+
+    def draw(self, face_up: bool = True) -> Card:
+        """Draw a card from the deck. A face-down card is left for the caller to count when it is shown."""
         if not self.cards:
             raise ValueError("Cannot draw from empty deck")
-        return self.cards.pop()
+        card = self.cards.pop()
+        if face_up and self.counter is not None:
+            self.counter.observe(card)
+        return card
+
+    def remaining_cards(self) -> List[Card]:
+        """Get the cards still in the deck."""
+        return list(self.cards)
 
     def cards_remaining(self) -> int:
         """Get the number of cards remaining in the deck."""
@@ -77,4 +125,134 @@ class Deck:
 
     def is_low(self, threshold: int = 20) -> bool:
         """Check if the deck is running low on cards."""
-        return len(self.cards) < threshold
\ No newline at end of file
+        return len(self.cards) < threshold
+
+    def snapshot(self) -> tuple:
+        """Capture the cards left and the RNG state as an immutable tuple.
+
+        The RNG state is saved once per shuffle, which assumes the RNG is
+        only used to shuffle this deck.
+        """
+        if self._rng_state is None:
+            self._rng_state = _save_rng(self.rng)
+        return tuple(self.cards), self._rng_state
+
+    def restore(self, state: tuple) -> None:
+        """Return to a state captured by snapshot."""
+        cards, self._rng_state = state
+        self.cards = list(cards)
+        self._rng_pending = self._rng_state is not None
+
+
+class Shoe:
+    """A multi-deck shoe with a cut card.
+
+    Cards are stored as indices into CARDS in a compact byte array that is
+    shuffled in place. Once a snapshot has been taken, forked shoes may
+    share the array, so the next shuffle copies it first.
+    """
+
+    def __init__(self, num_decks: int = SHOE_DECKS, cut_card: Optional[int] = None,
+                 rng: Optional[random.Random] = None):
+        if num_decks < 1:
+            raise ValueError("A shoe needs at least one deck")
+        self.num_decks = num_decks
+        self.rng = rng if rng is not None else random
+        # Optional CardCounter (see counting.py) told about every card drawn
+        self.counter = None
+        self._order = array('B', range(len(CARDS))) * num_decks
+        self._order_bytes = None  # Immutable copy of _order, made when first snapshotted
+        self._order_shared = False  # Whether a forked shoe may hold the same array
+        self._position = 0
+        self._rng_state = None
+        self._rng_pending = False
+        
+        # Number of cards dealt before the cut card comes out
+        if cut_card is None:
+            cut_card = int(len(self._order) * SHOE_PENETRATION)
+        if not 0 < cut_card <= len(self._order):
+            raise ValueError("Cut card must be inside the shoe")
+        self.cut_card = cut_card
+        self.shuffle()
+
+    def shuffle(self) -> None:
+        """Shuffle every card back into the shoe."""
+        if self._rng_pending:
+            self.rng = _load_rng(self._rng_state)
+            self._rng_pending = False
+        if self._order_shared:
+            self._order = array('B', self._order)
+            self._order_shared = False
+        self.rng.shuffle(self._order)
+        self._order_bytes = None
+        self._rng_state = None
+        self._position = 0
+        if self.counter is not None:
+            self.counter.reset()
+
+    def reshuffle(self) -> None:
+        """Gather all cards back into the shoe and shuffle."""
+        self.shuffle()
+
+    def reshuffle_discards(self, in_play: List[Card]) -> None:
+        """Shuffle every card back in except those on the table, which are moved to the dealt end."""
+        self.shuffle()
+        order = self._order
+        for position, card in enumerate(in_play):
+            found = position
+            while order[found] != card.index:
+                found += 1
+            order[position], order[found] = order[found], order[position]
+        self._position = len(in_play)
+
+    def draw(self, face_up: bool = True) -> Card:
+        """Draw a card from the shoe. Like Deck.draw, a face-down card is not counted."""
+        if self._position >= len(self._order):
+            raise ValueError("Cannot draw from empty shoe")
+        card = CARDS[self._order[self._position]]
+        self._position += 1
+        if face_up and self.counter is not None:
+            self.counter.observe(card)
+        return card
+
+    def remaining_cards(self) -> List[Card]:
+        """Get the cards still in the shoe, in the order they will be drawn."""
+        return [CARDS[index] for index in self._order[self._position:]]
+
+    def cards_remaining(self) -> int:
+        """Get the number of cards remaining in the shoe."""
+        return len(self._order) - self._position
+
+    @property
+    def cut_card_reached(self) -> bool:
+        """Whether the cut card has come out of the shoe."""
+        return self._position >= self.cut_card
+
+    def is_low(self, threshold: int = 20) -> bool:
+        """Check if the shoe is due for a reshuffle."""
+        return self.cut_card_reached or self.cards_remaining() < threshold
+
+    def snapshot(self) -> tuple:
+        """Capture the card order, position and RNG state as an immutable tuple.
+
+        Like Deck.snapshot, this assumes the RNG only shuffles this shoe.
+        """
+        if self._order_bytes is None:
+            self._order_bytes = self._order.tobytes()
+        # A fork restored from this snapshot keeps using our array
+        self._order_shared = True
+        if self._rng_state is None:
+            self._rng_state = _save_rng(self.rng)
+        return self._order_bytes, self._position, self._rng_state
+
+    def restore(self, state: tuple) -> None:
+        """Return to a state captured by snapshot."""
+        order_bytes, self._position, self._rng_state = state
+        if order_bytes is not self._order_bytes:
+            self._order = array('B', order_bytes)
+            self._order_bytes = order_bytes
+            self._order_shared = False
+        self._rng_pending = self._rng_state is not None
+
+    def __len__(self) -> int:
+        return len(self._order)
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""
+Card image loading and caching for the blackjack UI.
+
+Faces are read from a pre-scaled atlas file when one matching the card
+size and the current PNGs exists (see build_atlas.py), and decoded from
+the individual PNGs otherwise.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, Optional, Tuple
+import pygame
+
+from card import CARDS, Card
+from constants import CARD_WIDTH, CARD_HEIGHT, FACE_CARDS, SUITS, VALUES
+
+# Atlas layout: one row per suit, one column per value
+ATLAS_MAGIC = b'BJATLAS1'
+ATLAS_HEADER = struct.Struct('<8sHHHH20s')  # magic, card width/height, columns, rows, source fingerprint
+
+
+def get_image_path(suit: str, value: str) -> str:
+    """Get the image path for a card."""
+    if value in FACE_CARDS:
+        return os.path.join('cards', f'{value}_of_{suit}2.png')
+    else:
+        return os.path.join('cards', f'{value}_of_{suit}.png')
+
+
+def atlas_path(size: Tuple[int, int]) -> str:
+    """Get the atlas file path for a card size."""
+    return os.path.join('cards', f'atlas_{size[0]}x{size[1]}.atlas')
+
+
+def source_fingerprint() -> bytes:
+    """Fingerprint of the card PNGs (names, sizes and modification times) without reading them."""
+    digest = hashlib.sha1()
+    for card in CARDS:
+        path = get_image_path(card.suit, card.value)
+        stat = os.stat(path)
+        digest.update(f'{path}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+    return digest.digest()
+
+
+def build_atlas(size: Tuple[int, int] = (CARD_WIDTH, CARD_HEIGHT), path: Optional[str] = None) -> str:
+    """Pack every card face, scaled to size, into one raw RGBA atlas file. Returns its path."""
+    path = path or atlas_path(size)
+    width, height = size
+    atlas = pygame.Surface((width * len(VALUES), height * len(SUITS)), pygame.SRCALPHA)
+    for card in CARDS:
+        image = pygame.transform.scale(pygame.image.load(get_image_path(card.suit, card.value)), size)
+        atlas.blit(image, (VALUES.index(card.value) * width, SUITS.index(card.suit) * height))
+    
+    header = ATLAS_HEADER.pack(ATLAS_MAGIC, width, height, len(VALUES), len(SUITS), source_fingerprint())
+    with open(path, 'wb') as atlas_file:
+        atlas_file.write(header)
+        atlas_file.write(pygame.image.tostring(atlas, 'RGBA'))
+    return path
+
+
+def _atlas_matches(pixels: mmap.mmap, size: Tuple[int, int]) -> bool:
+    """Whether a mapped atlas file holds every face at this size, built from the current PNGs."""
+    width, height = size
+    columns, rows = len(VALUES), len(SUITS)
+    if len(pixels) != ATLAS_HEADER.size + width * columns * height * rows * 4:
+        return False
+    magic, card_width, card_height, atlas_columns, atlas_rows, fingerprint = ATLAS_HEADER.unpack_from(pixels)
+    return (magic == ATLAS_MAGIC and (card_width, card_height) == size
+            and (atlas_columns, atlas_rows) == (columns, rows) and fingerprint == source_fingerprint())
+
+
+class CardImageCache:
+    """Process-wide registry of decoded and scaled card faces.
+
+    Each (suit, value, size) face is loaded from disk once and the same
+    surface is handed out to every draw call that asks for it.
+    """
+
+    def __init__(self):
+        self._surfaces: Dict[Tuple[str, str, Tuple[int, int]], pygame.Surface] = {}
+        self._atlases: Dict[Tuple[int, int], tuple] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, suit: str, value: str, size: Tuple[int, int] = (CARD_WIDTH, CARD_HEIGHT)) -> pygame.Surface:
+        """Get the face for a card, loading it on first use."""
+        key = (suit, value, size)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            surface = self._load(suit, value, size)
+            self._surfaces[key] = surface
+        else:
+            self.hits += 1
+        return surface
+
+    def get_card(self, card: Card, size: Tuple[int, int] = (CARD_WIDTH, CARD_HEIGHT)) -> pygame.Surface:
+        """Get the face for a Card instance."""
+        return self.get(card.suit, card.value, size)
+
+    def _load(self, suit: str, value: str, size: Tuple[int, int]) -> pygame.Surface:
+        """Decode, scale and convert a single card face."""
+        image = pygame.transform.scale(pygame.image.load(get_image_path(suit, value)), size)
+        # Converting to the display format makes later blits much cheaper,
+        # but is only possible once a display mode has been set
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        return image
+
+    def preload(self, size: Tuple[int, int] = (CARD_WIDTH, CARD_HEIGHT), use_atlas: bool = True) -> bool:
+        """Load every face for a size up front. Returns True if the atlas was used."""
+        if use_atlas and self.load_atlas(size):
+            return True
+        for card in CARDS:
+            self.get(card.suit, card.value, size)
+        return False
+
+    def load_atlas(self, size: Tuple[int, int] = (CARD_WIDTH, CARD_HEIGHT)) -> bool:
+        """Fill the cache for a size from its atlas file.
+
+        The file is memory-mapped and every face becomes a subsurface of it,
+        so nothing is decoded. Returns False, leaving the PNGs to be loaded
+        on demand, if there is no atlas or it no longer matches the PNGs.
+        """
+        path = atlas_path(size)
+        try:
+            with open(path, 'rb') as atlas_file:
+                pixels = mmap.mmap(atlas_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        
+        matches = False
+        try:
+            matches = _atlas_matches(pixels, size)
+        finally:
+            if not matches:
+                pixels.close()
+        if not matches:
+            return False
+        
+        width, height = size
+        columns, rows = len(VALUES), len(SUITS)
+        atlas = pygame.image.frombuffer(memoryview(pixels)[ATLAS_HEADER.size:],
+                                        (width * columns, height * rows), 'RGBA')
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            # One conversion for the whole sheet instead of one per card
+            atlas = atlas.convert_alpha()
+        
+        # Keep the mapping alive for as long as the subsurfaces use it
+        self._atlases[size] = (pixels, atlas)
+        for card in CARDS:
+            rect = (VALUES.index(card.value) * width, SUITS.index(card.suit) * height, width, height)
+            self._surfaces[(card.suit, card.value, size)] = atlas.subsurface(rect)
+        return True
+
+    def evict_unused_sizes(self, sizes_in_use: Iterable[Tuple[int, int]]) -> int:
+        """Drop every cached face whose size is not in use. Returns the number evicted."""
+        keep = set(sizes_in_use)
+        stale = [key for key in self._surfaces if key[2] not in keep]
+        for key in stale:
+            del self._surfaces[key]
+        for size in [size for size in self._atlases if size not in keep]:
+            del self._atlases[size]
+        self.evictions += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Remove all cached faces and reset the counters."""
+        self._surfaces.clear()
+        self._atlases.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+
+card_images = CardImageCache()
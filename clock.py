@@ -0,0 +1,65 @@
+"""
+Clocks that pace the dealer's play.
+
+BlackjackGame asks its clock for the current time and for how long each
+configured delay should really last, so tests and automated runs can
+swap the wall clock for a manually advanced or zero-delay one.
+"""
+
+import abc
+import time
+
+
+class Clock(abc.ABC):
+    """Source of time for game pacing."""
+
+    @abc.abstractmethod
+    def now(self) -> float:
+        """Current time in seconds."""
+
+    def delay(self, seconds: float) -> float:
+        """How long a configured delay should last on this clock."""
+        return seconds
+
+
+class SystemClock(Clock):
+    """Wall-clock time, for the interactive game."""
+
+    def now(self) -> float:
+        return time.time()
+
+
+class ManualClock(Clock):
+    """Virtual time that only moves when advanced."""
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+
+    def now(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        """Move time forward."""
+        if seconds < 0:
+            raise ValueError("Cannot move a clock backwards")
+        self._now += seconds
+
+
+class TurboClock(Clock):
+    """Zero-delay clock: every delay has already passed, so the dealer plays instantly."""
+
+    def now(self) -> float:
+        return 0.0
+
+    def delay(self, seconds: float) -> float:
+        return 0.0
+
+
+class LoopClock(Clock):
+    """Time from an asyncio event loop, so dealer delays can be scheduled as loop timers."""
+
+    def __init__(self, loop):
+        self.loop = loop
+
+    def now(self) -> float:
+        return self.loop.time()
@@ -19,7 +19,10 @@ BUTTON_HEIGHT = 50
 DEALER_PLAY_DELAY = 1.0  # Seconds between dealer actions
 STARTING_BANKROLL = 1000
 MAX_SPLIT_HANDS = 4
+MAX_SEATS = 7  # Player seats at one table
 DECK_RESHUFFLE_THRESHOLD = 20
+SHOE_DECKS = 6  # Decks in a multi-deck shoe
+SHOE_PENETRATION = 0.75  # Fraction of a shoe dealt before the cut card
 
 # Colors (RGB tuples)
 GREEN = (34, 139, 34)
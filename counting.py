@@ -0,0 +1,91 @@
+"""
+Card counting systems and an incremental counter for the deck or shoe.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+from card import Card
+
+CARDS_PER_DECK = 52
+
+
+class CountingSystem:
+    """A card counting tag system."""
+
+    def __init__(self, name: str, tags: Dict[int, int], balanced: bool = True,
+                 pivot_per_deck: int = 0):
+        self.name = name
+        # Tag for each card point value (2-11), indexable by Card.points
+        self.tags: List[int] = [0, 0] + [tags[points] for points in range(2, 12)]
+        self.balanced = balanced
+        # Unbalanced systems start below zero so the key count is the same for any deck count
+        self.pivot_per_deck = pivot_per_deck
+
+    def initial_count(self, num_decks: int) -> int:
+        """Running count at the start of a fresh deck or shoe."""
+        return self.pivot_per_deck - self.pivot_per_deck * num_decks
+
+    def __repr__(self) -> str:
+        return f"CountingSystem('{self.name}')"
+
+
+HI_LO = CountingSystem("Hi-Lo", {2: 1, 3: 1, 4: 1, 5: 1, 6: 1, 7: 0, 8: 0, 9: 0, 10: -1, 11: -1})
+KO = CountingSystem("KO", {2: 1, 3: 1, 4: 1, 5: 1, 6: 1, 7: 1, 8: 0, 9: 0, 10: -1, 11: -1},
+                    balanced=False, pivot_per_deck=4)
+OMEGA_II = CountingSystem("Omega II", {2: 1, 3: 1, 4: 2, 5: 2, 6: 2, 7: 1, 8: 0, 9: -1, 10: -2, 11: 0})
+
+COUNTING_SYSTEMS = (HI_LO, KO, OMEGA_II)
+
+
+class CardCounter:
+    """Tracks running and true counts for several systems as cards are drawn.
+
+    Each draw only bumps a per-point-value tally, so the cost of a draw does
+    not depend on how many systems are tracked. Counts are the dot product
+    of that tally with each system's tags, worked out when asked for.
+    Cards count as soon as they are seen: most when they are drawn, the
+    dealer's face-down hole card only once it is revealed.
+    """
+
+    def __init__(self, systems: Iterable[CountingSystem] = COUNTING_SYSTEMS, num_decks: int = 1):
+        self.systems = tuple(systems)
+        self.num_decks = num_decks
+        self._seen = [0] * 12
+
+    def observe(self, card: Card) -> None:
+        """Count a card that has left the deck."""
+        self._seen[card.points] += 1
+
+    def reset(self) -> None:
+        """Start counting a freshly shuffled deck or shoe."""
+        self._seen = [0] * 12
+
+    def snapshot(self) -> Tuple[int, ...]:
+        """Capture the cards seen so far as an immutable tuple."""
+        return tuple(self._seen)
+
+    def restore(self, state: Tuple[int, ...]) -> None:
+        """Return to a state captured by snapshot."""
+        self._seen = list(state)
+
+    @property
+    def cards_seen(self) -> int:
+        return sum(self._seen)
+
+    def running_count(self, system: CountingSystem) -> int:
+        """Get the running count for a system."""
+        count = system.initial_count(self.num_decks)
+        for tag, seen in zip(system.tags, self._seen):
+            count += tag * seen
+        return count
+
+    def true_count(self, system: CountingSystem, cards_remaining: int) -> float:
+        """Get the running count per deck remaining."""
+        if cards_remaining <= 0:
+            return 0.0
+        return self.running_count(system) / (cards_remaining / CARDS_PER_DECK)
+
+    def counts(self, cards_remaining: int) -> Dict[str, Tuple[int, float]]:
+        """Get {system name: (running count, true count)} for every tracked system."""
+        return {system.name: (self.running_count(system), self.true_count(system, cards_remaining))
+                for system in self.systems}
@@ -0,0 +1,217 @@
+"""
+Composition-dependent expected values for blackjack decisions.
+
+Expected values are computed by recursion over the cards actually left
+in the deck or shoe rather than by simulation. Compositions are packed
+into a single integer key, which makes removing a card a subtraction,
+and intermediate results are kept in bounded LRU caches. The
+player-independent dealer outcomes are shared between every question
+asked about the same shoe.
+
+By default the dealer's outcomes follow only the player's first
+DEALER_EXACT_DRAWS draws exactly (the exact_draws argument of
+expected_values); later player cards are not removed from the dealer's
+composition. That bounds the number of compositions the dealer is
+played out from, so a whole query fits in the dealer cache. On a single
+deck, where removals matter most, this moves EVs by under 0.3% of a bet.
+
+Splits are approximated: each split hand is valued as an independent
+one-card hand drawn from the same composition. A hand dealt another
+card of its pair may be split again while the table allows more hands,
+with the splits left shared between the two new hands.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+from card import Card
+from constants import MAX_SPLIT_HANDS
+from hand import Hand
+from strategy import Action, _add_card, _score
+
+# Composition keys hold one count per point value (2-11), 9 bits each
+_BITS = 9
+_MASK = (1 << _BITS) - 1
+POINT_VALUES = tuple(range(2, 12))
+_UNIT = {points: 1 << (_BITS * (points - 2)) for points in POINT_VALUES}
+
+# The costliest query (a pair of aces against a 2 from eight decks) fills
+# about 140,000 dealer and 20,000 player entries, so no query evicts its own
+DEALER_CACHE_SIZE = 1 << 18
+PLAYER_CACHE_SIZE = 1 << 16
+DEALER_EXACT_DRAWS = 2
+
+# Index of each final dealer total in an outcome tuple
+_OUTCOMES = (17, 18, 19, 20, 21, 22)  # 22 means bust
+_NO_OUTCOME = (0.0,) * len(_OUTCOMES)
+_OUTCOMES_BUST = tuple(1.0 if total == 22 else 0.0 for total in _OUTCOMES)
+_OUTCOME_AT = {score: tuple(1.0 if total == score else 0.0 for total in _OUTCOMES)
+               for score in range(17, 22)}
+
+
+def composition_key(cards: Iterable[Card]) -> int:
+    """Pack the point values of some cards into a composition key."""
+    key = 0
+    for card in cards:
+        key += _UNIT[card.points]
+    return key
+
+
+def composition_counts(key: int) -> Dict[int, int]:
+    """Unpack a composition key into {point value: count}."""
+    return {points: (key >> (_BITS * (points - 2))) & _MASK for points in POINT_VALUES}
+
+
+def _draws(key: int):
+    """(points, probability, remaining key) for every card that can be drawn."""
+    counts = composition_counts(key)
+    total = sum(counts.values())
+    if total == 0:
+        raise ValueError("No cards left to draw")
+    return [(points, count / total, key - _UNIT[points])
+            for points, count in counts.items() if count]
+
+
+@lru_cache(maxsize=DEALER_CACHE_SIZE)
+def dealer_outcomes(key: int, hard: int, has_ace: bool, hits_soft_17: bool = False) -> Tuple[float, ...]:
+    """Probabilities of the dealer finishing on 17-21 or busting, from a dealer hand state."""
+    score = _score(hard, has_ace)
+    if score > 21:
+        return _OUTCOMES_BUST
+    if score > 17 or (score == 17 and not (hits_soft_17 and has_ace and hard <= 11)):
+        return _OUTCOME_AT[score]
+
+    result = list(_NO_OUTCOME)
+    for points, probability, remaining in _draws(key):
+        outcome = dealer_outcomes(remaining, *_add_card(hard, has_ace, points), hits_soft_17)
+        for index, value in enumerate(outcome):
+            result[index] += probability * value
+    return tuple(result)
+
+
+def _stand(score: int, key: int, up: int, hits_soft_17: bool) -> float:
+    """EV of standing on a score. The dealer's hole card is still in the composition."""
+    if score > 21:
+        return -1.0
+    ev = 0.0
+    for total, probability in zip(_OUTCOMES, dealer_outcomes(key, *_add_card(0, False, up), hits_soft_17)):
+        if total > 21 or total < score:
+            ev += probability
+        elif total > score:
+            ev -= probability
+    return ev
+
+
+def _remove(dealer_key: int, exact: int, points: int) -> Tuple[int, int]:
+    """The dealer's composition after the player draws a card, and how many more draws it follows."""
+    if exact:
+        return dealer_key - _UNIT[points], exact - 1
+    return dealer_key, 0
+
+
+@lru_cache(maxsize=PLAYER_CACHE_SIZE)
+def _hit(key: int, dealer_key: int, exact: int, hard: int, has_ace: bool, up: int, hits_soft_17: bool) -> float:
+    """EV of hitting and then playing on optimally (hit or stand)."""
+    ev = 0.0
+    for points, probability, remaining in _draws(key):
+        dealer_remaining, left = _remove(dealer_key, exact, points)
+        new_hard, new_ace = _add_card(hard, has_ace, points)
+        score = _score(new_hard, new_ace)
+        if score > 21:
+            value = -1.0
+        elif score == 21:
+            # The game finishes a hand as soon as it reaches 21
+            value = _stand(score, dealer_remaining, up, hits_soft_17)
+        else:
+            value = max(_stand(score, dealer_remaining, up, hits_soft_17),
+                        _hit(remaining, dealer_remaining, left, new_hard, new_ace, up, hits_soft_17))
+        ev += probability * value
+    return ev
+
+
+def _double(key: int, dealer_key: int, exact: int, hard: int, has_ace: bool, up: int, hits_soft_17: bool) -> float:
+    """EV of doubling: twice the bet and exactly one more card."""
+    ev = 0.0
+    for points, probability, _ in _draws(key):
+        dealer_remaining, _ = _remove(dealer_key, exact, points)
+        ev += probability * _stand(_score(*_add_card(hard, has_ace, points)), dealer_remaining, up, hits_soft_17)
+    return 2 * ev
+
+
+def _best_two_card(key: int, dealer_key: int, exact: int, hard: int, has_ace: bool, up: int,
+                   hits_soft_17: bool, can_double: bool) -> float:
+    score = _score(hard, has_ace)
+    if score == 21:
+        return _stand(score, dealer_key, up, hits_soft_17)
+    best = max(_stand(score, dealer_key, up, hits_soft_17),
+               _hit(key, dealer_key, exact, hard, has_ace, up, hits_soft_17))
+    if can_double:
+        best = max(best, _double(key, dealer_key, exact, hard, has_ace, up, hits_soft_17))
+    return best
+
+
+def _split_hand(key: int, dealer_key: int, exact: int, points: int, up: int, hits_soft_17: bool,
+                double_after_split: bool, splits: int) -> float:
+    """EV of one hand started from a split card, which may be split again `splits` more times."""
+    ev = 0.0
+    for drawn, probability, remaining in _draws(key):
+        dealer_remaining, left = _remove(dealer_key, exact, drawn)
+        hard, has_ace = _add_card(*_add_card(0, False, points), drawn)
+        value = _best_two_card(remaining, dealer_remaining, left, hard, has_ace, up,
+                               hits_soft_17, double_after_split)
+        if drawn == points and splits:
+            value = max(value, _split(remaining, dealer_remaining, left, points, up, hits_soft_17,
+                                      double_after_split, splits - 1))
+        ev += probability * value
+    return ev
+
+
+def _split(key: int, dealer_key: int, exact: int, points: int, up: int, hits_soft_17: bool,
+           double_after_split: bool, splits: int) -> float:
+    """EV of splitting a pair into two hands that share `splits` further splits."""
+    first = splits // 2
+    return (_split_hand(key, dealer_key, exact, points, up, hits_soft_17, double_after_split, first) +
+            _split_hand(key, dealer_key, exact, points, up, hits_soft_17, double_after_split, splits - first))
+
+
+def expected_values(hand: Hand, dealer_up_card: Card, key: int, can_double: bool = True,
+                    can_split: bool = False, hits_soft_17: bool = False, double_after_split: bool = True,
+                    split_hands: int = MAX_SPLIT_HANDS,
+                    exact_draws: Optional[int] = DEALER_EXACT_DRAWS) -> Dict[Action, float]:
+    """EVs (per unit of the hand's current bet) of each legal action for a hand.
+
+    key is the composition of every card the player cannot see, including
+    the dealer's hole card. split_hands is the most hands a pair may still
+    be split into.
+
+    The values are approximate: cards the player draws after the first
+    exact_draws are not removed from the dealer's composition. None
+    follows every draw exactly, which is much slower and can outgrow the
+    caches on a multi-deck shoe.
+    """
+    hard = hand.calculate_score() - (10 if hand.is_soft() else 0)
+    has_ace = any(card.is_ace for card in hand.cards)
+    up = dealer_up_card.points
+    score = hand.calculate_score()
+
+    exact = exact_draws if exact_draws is not None else sum(composition_counts(key).values())
+    values = {Action.STAND: _stand(score, key, up, hits_soft_17)}
+    if score < 21:
+        values[Action.HIT] = _hit(key, key, exact, hard, has_ace, up, hits_soft_17)
+        if can_double:
+            values[Action.DOUBLE] = _double(key, key, exact, hard, has_ace, up, hits_soft_17)
+    if can_split:
+        values[Action.SPLIT] = _split(key, key, exact, hand.cards[0].points, up, hits_soft_17,
+                                      double_after_split, max(0, split_hands - 2))
+    return values
+
+
+def cache_info() -> Dict[str, object]:
+    """Hit/miss statistics for the dealer and player caches."""
+    return {'dealer': dealer_outcomes.cache_info(), 'player': _hit.cache_info()}
+
+
+def clear_caches() -> None:
+    """Empty the dealer and player caches."""
+    dealer_outcomes.cache_clear()
+    _hit.cache_clear()
@@ -0,0 +1,80 @@
+"""
+Shared fonts and a cache of rendered text surfaces for the UI.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import pygame
+
+TEXT_CACHE_SIZE = 256
+
+
+class FontRegistry:
+    """Hands out one shared Font per (name, size)."""
+
+    def __init__(self):
+        self._fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+
+    def get(self, size: int, name: Optional[str] = None) -> pygame.font.Font:
+        """Get the font for a size, loading it on first use. None means pygame's default font."""
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self._fonts[key] = font
+        return font
+
+
+class TextCache:
+    """Bounded least-recently-used cache of rendered text surfaces.
+
+    Keyed by (font, text, color), so a label that does not change is only
+    rasterized once. Misses count the times text actually had to be rendered.
+    """
+
+    def __init__(self, max_entries: int = TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._surfaces: 'OrderedDict[tuple, pygame.Surface]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        """Get the antialiased surface for some text, rendering it on first use."""
+        key = (font, text, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+        
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def reset_stats(self) -> None:
+        """Zero the hit, miss and eviction counters."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def clear(self) -> None:
+        """Drop every cached surface."""
+        self._surfaces.clear()
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+
+fonts = FontRegistry()
+text_cache = TextCache()
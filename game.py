@@ -2,13 +2,21 @@
 Main game logic for the blackjack game.
 """
 
-import time
-from typing import List, Optional
+import random
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 from enum import Enum
 
-from card import Card, Deck
+from card import Card, Deck, Shoe
+from clock import Clock, SystemClock
 from hand import Hand
-from constants import STARTING_BANKROLL, DEALER_PLAY_DELAY, MAX_SPLIT_HANDS, DECK_RESHUFFLE_THRESHOLD
+from seat import Seat
+from strategy import Action, BasicStrategy, get_basic_strategy
+from ev import DEALER_EXACT_DRAWS, composition_key, expected_values
+from counting import COUNTING_SYSTEMS, CardCounter, CountingSystem
+import hand_history
+from hand_history import HandHistoryWriter
+from constants import DEALER_PLAY_DELAY, MAX_SEATS
+from rules import DEFAULT_RULES, Rules
 
 
 class GameState(Enum):
@@ -20,14 +28,46 @@ class GameState(Enum):
     GAME_OVER = "game_over"
 
 
+def _shallow_copy(obj):
+    """Like copy.copy for a plain object, without the pickle protocol overhead."""
+    clone = obj.__class__.__new__(obj.__class__)
+    clone.__dict__.update(obj.__dict__)
+    return clone
+
+
+class GameSnapshot(NamedTuple):
+    """Immutable copy of everything that changes as a game is played (see BlackjackGame.snapshot)."""
+    deck: tuple
+    counts: Optional[Tuple[int, ...]]
+    seats: Tuple[tuple, ...]
+    current_seat_index: int
+    dealer_hand: tuple
+    state: GameState
+    message: str
+    last_dealer_action_time: float
+    dealer_card_revealed: bool
+
+
 class BlackjackGame:
-    """Main game logic for blackjack."""
+    """Main game logic for blackjack.
+    
+    A table has one or more seats sharing the dealer and the deck. The
+    bankroll, bet and hand attributes refer to the seat whose turn it is,
+    so a one-seat game reads exactly like a single player.
+    """
     
-    def __init__(self):
-        self.deck = Deck()
-        self.player_hands: List[Hand] = []
+    def __init__(self, rng: Optional[random.Random] = None, deck: Optional[Union[Deck, Shoe]] = None,
+                 clock: Optional[Clock] = None, num_seats: int = 1, rules: Rules = DEFAULT_RULES):
+        if not 1 <= num_seats <= MAX_SEATS:
+            raise ValueError(f"A table has between 1 and {MAX_SEATS} seats")
+        self.rules = rules
+        self._strategy: Tuple[Optional[Rules], Optional[BasicStrategy]] = (None, None)
+        self.clock = clock if clock is not None else SystemClock()
+        # rng only shuffles the deck made here; the deck keeps it
+        self.deck = deck if deck is not None else rules.make_deck(rng)
+        self.seats = [Seat() for _ in range(num_seats)]
+        self.current_seat_index = 0
         self.dealer_hand = Hand()
-        self.current_hand_index = 0
         
         # Game state
         self.state = GameState.BETTING
@@ -37,70 +77,260 @@ class BlackjackGame:
         self.last_dealer_action_time = 0
         self.dealer_card_revealed = False
         
-        # Betting system
-        self.bankroll = STARTING_BANKROLL
-        self.current_bet = 0
-        self.split_count = 0
+        # Hand history logging, off unless record_history is called
+        self.history: Optional[HandHistoryWriter] = None
+        self.round_events: Optional[bytearray] = None  # (event code, card index) byte pairs
+
+    def record_history(self, writer: Optional[HandHistoryWriter]) -> None:
+        """Log every completed round to a hand history writer, or stop logging with None."""
+        self.history = writer
+        self.round_events = bytearray() if writer is not None else None
+
+    def _log(self, event: int) -> None:
+        """Add a player or dealer action to the current round's history, if it is being recorded."""
+        if self.round_events is not None:
+            self.round_events += bytes((event, hand_history.NO_CARD))
+
+    def _draw(self, event: int, face_up: bool = True) -> Card:
+        """Draw a card from the deck and log it."""
+        try:
+            card = self.deck.draw(face_up)
+        except ValueError:
+            # A full table can run a single deck dry mid-round
+            self._reshuffle_discards()
+            card = self.deck.draw(face_up)
+        if self.round_events is not None:
+            self.round_events.append(event)
+            self.round_events.append(card.index)
+        return card
+
+    def _reshuffle_discards(self) -> None:
+        """Reshuffle mid-round without putting the cards on the table back in the deck."""
+        in_play = self.dealer_hand.cards + [card for seat in self.seats for hand in seat.hands for card in hand.cards]
+        self.deck.reshuffle_discards(in_play)
+        if self.deck.counter is not None:
+            # The table's cards are already out of the new deck; a hidden hole card is counted when revealed
+            hidden = 1 if self.dealer_hand.cards and not self.dealer_card_revealed else 0
+            for card in in_play[hidden:]:
+                self.deck.counter.observe(card)
+
+    def _write_history(self) -> None:
+        """Append the finished round to the hand history."""
+        if self.history is None:
+            return
+        # Table totals, with every seat's hands in seat order
+        hands = [(hand.bet, payout) for seat in self.seats for hand, payout in zip(seat.hands, seat.hand_payouts)]
+        self.history.write_round(sum(seat.current_bet for seat in self.seats),
+                                 sum(seat.bankroll for seat in self.seats), hands, self.round_events)
+
+    def snapshot(self) -> GameSnapshot:
+        """Capture the game's state in a compact immutable form.
+
+        Cards are shared rather than copied, and a shoe's card order is
+        shared by every snapshot taken between two shuffles.
+        """
+        counter = self.deck.counter
+        return GameSnapshot(
+            self.deck.snapshot(), counter.snapshot() if counter is not None else None,
+            tuple(seat.snapshot() for seat in self.seats), self.current_seat_index,
+            self.dealer_hand.snapshot(), self.state, self.message, self.last_dealer_action_time,
+            self.dealer_card_revealed)
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        """Return the game to a state captured by snapshot."""
+        self.deck.restore(snapshot.deck)
+        counter = self.deck.counter
+        if counter is not None:
+            # A snapshot taken before counting began restores to an empty tally
+            if snapshot.counts is not None:
+                counter.restore(snapshot.counts)
+            else:
+                counter.reset()
+        self.seats = [Seat.from_snapshot(seat) for seat in snapshot.seats]
+        self.current_seat_index = snapshot.current_seat_index
+        self.dealer_hand = Hand.from_snapshot(snapshot.dealer_hand)
+        self.state = snapshot.state
+        self.message = snapshot.message
+        self.last_dealer_action_time = snapshot.last_dealer_action_time
+        self.dealer_card_revealed = snapshot.dealer_card_revealed
+
+    def fork(self, snapshot: Optional[GameSnapshot] = None) -> 'BlackjackGame':
+        """Create an independent game in this game's state, or in a snapshot's state.
+
+        The fork shares the clock and counting systems but does not write
+        to the hand history. Playing either game on never affects the other.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot()
+        game = _shallow_copy(self)
+        game.deck = _shallow_copy(self.deck)
+        if self.deck.counter is not None:
+            # Its own tally, so counting in one game never shows up in the other
+            game.deck.counter = _shallow_copy(self.deck.counter)
+            game.deck.counter.restore(self.deck.counter.snapshot())
+        game.history = None
+        game.round_events = None
+        game.restore(snapshot)
+        return game
+
+    # The seat whose turn it is, and its state
+    @property
+    def seat(self) -> Seat:
+        return self.seats[self.current_seat_index]
+
+    @property
+    def bankroll(self) -> int:
+        return self.seats[self.current_seat_index].bankroll
+
+    @bankroll.setter
+    def bankroll(self, value: int) -> None:
+        self.seats[self.current_seat_index].bankroll = value
 
-    def place_bet(self, amount: int) -> bool:
-        """Place a bet. Returns True if successful."""
-        if self.state != GameState.BETTING or amount > self.bankroll:
+    @property
+    def current_bet(self) -> int:
+        return self.seats[self.current_seat_index].current_bet
+
+    @current_bet.setter
+    def current_bet(self, value: int) -> None:
+        self.seats[self.current_seat_index].current_bet = value
+
+    @property
+    def player_hands(self) -> List[Hand]:
+        return self.seats[self.current_seat_index].hands
+
+    @player_hands.setter
+    def player_hands(self, hands: List[Hand]) -> None:
+        self.seats[self.current_seat_index].hands = hands
+
+    @property
+    def current_hand_index(self) -> int:
+        return self.seats[self.current_seat_index].current_hand_index
+
+    @current_hand_index.setter
+    def current_hand_index(self, value: int) -> None:
+        self.seats[self.current_seat_index].current_hand_index = value
+
+    @property
+    def split_count(self) -> int:
+        return self.seats[self.current_seat_index].split_count
+
+    @split_count.setter
+    def split_count(self, value: int) -> None:
+        self.seats[self.current_seat_index].split_count = value
+
+    @property
+    def hand_payouts(self) -> List[int]:
+        return self.seats[self.current_seat_index].hand_payouts
+
+    @hand_payouts.setter
+    def hand_payouts(self, payouts: List[int]) -> None:
+        self.seats[self.current_seat_index].hand_payouts = payouts
+
+    def enable_counting(self, systems: Iterable[CountingSystem] = COUNTING_SYSTEMS) -> CardCounter:
+        """Start tracking card counts from the next card drawn."""
+        counter = CardCounter(systems, self.deck.num_decks)
+        self.deck.counter = counter
+        return counter
+
+    def get_counts(self) -> Dict[str, Tuple[int, float]]:
+        """Get {system name: (running count, true count)}, or {} if counting is off."""
+        if self.deck.counter is None:
+            return {}
+        return self.deck.counter.counts(self.deck.cards_remaining())
+
+    def place_bet(self, amount: int, seat_index: Optional[int] = None) -> bool:
+        """Place a bet for a seat, by default the current one. Returns True if successful."""
+        seat = self.seat if seat_index is None else self.seats[seat_index]
+        if self.state != GameState.BETTING or amount > seat.bankroll:
             return False
         
-        self.current_bet += amount
-        self.bankroll -= amount
+        seat.current_bet += amount
+        seat.bankroll -= amount
         return True
 
     def can_deal(self) -> bool:
-        """Check if cards can be dealt."""
-        return self.state == GameState.BETTING and self.current_bet > 0
+        """Check if cards can be dealt: at least one seat has bet."""
+        return self.state == GameState.BETTING and any(seat.current_bet > 0 for seat in self.seats)
 
     def deal_initial_cards(self) -> None:
         """Deal the initial cards to start a round."""
         if not self.can_deal():
             return
         
-        # Create initial player hand
-        player_hand = Hand(bet=self.current_bet)
-        player_hand.add_card(self.deck.draw())
-        player_hand.add_card(self.deck.draw())
-        self.player_hands = [player_hand]
+        if self.round_events is not None:
+            self.round_events.clear()
+        
+        # Seats without a bet sit the round out
+        playing = [seat for seat in self.seats if seat.current_bet > 0]
         
-        # Deal dealer cards
+        # Deal in table order: a card to each seat, then the dealer's
+        # face-down card, then a second card to each seat and the dealer's up card
+        for seat in playing:
+            hand = Hand(bet=seat.current_bet)
+            hand.add_card(self._draw(hand_history.PLAYER_CARD))
+            seat.hands = [hand]
+            seat.current_hand_index = 0
+            seat.split_count = 0
+            seat.hand_payouts = []
         self.dealer_hand = Hand()
-        self.dealer_hand.add_card(self.deck.draw())
-        self.dealer_hand.add_card(self.deck.draw())
+        # The hole card is counted when it is revealed, not while it is face down
+        self.dealer_hand.add_card(self._draw(hand_history.DEALER_CARD, face_up=False))
+        for seat in playing:
+            seat.hands[0].add_card(self._draw(hand_history.PLAYER_CARD))
+        self.dealer_hand.add_card(self._draw(hand_history.DEALER_CARD))
         
         # Reset state
-        self.current_hand_index = 0
         self.state = GameState.PLAYING
         self.message = ""
         self.dealer_card_revealed = False
-        self.split_count = 0
         
-        # Check for blackjack
-        if player_hand.is_blackjack():
-            self._handle_player_blackjack()
-
-    def _handle_player_blackjack(self) -> None:
-        """Handle when player gets blackjack on initial deal."""
-        player_hand = self.player_hands[0]
-        self.dealer_card_revealed = True
+        # Naturals have nothing left to play
+        first_to_play = None
+        for seat in playing:
+            hand = seat.hands[0]
+            if hand.is_blackjack():
+                hand.blackjack = True
+                hand.finished = True
+            elif first_to_play is None:
+                first_to_play = seat
         
-        if self.dealer_hand.is_blackjack():
-            self.message = "Push! Both have blackjack!"
-            self.bankroll += self.current_bet  # Return bet
+        if first_to_play is None:
+            self._settle_naturals(playing)
         else:
-            self.message = "Blackjack! You win!"
-            self.bankroll += int(self.current_bet * 2.5)  # 3:2 payout
+            self.current_seat_index = self.seats.index(first_to_play)
+
+    def _settle_naturals(self, playing: List[Seat]) -> None:
+        """End the round at once when every seat was dealt blackjack."""
+        self._reveal_hole_card()
+        dealer_blackjack = self.dealer_hand.is_blackjack()
         
-        player_hand.blackjack = True
+        seat_messages = []
+        for seat in playing:
+            if dealer_blackjack:
+                message = "Push! Both have blackjack!"
+                payout = seat.current_bet  # Return bet
+            else:
+                message = "Blackjack! You win!"
+                payout = self.rules.blackjack_winnings(seat.current_bet)
+            seat.bankroll += payout
+            seat.hand_payouts = [payout]
+            seat_messages.append((self.seats.index(seat), message))
+        
+        self.message = self._table_message(seat_messages)
         self.state = GameState.ROUND_COMPLETE
+        self._write_history()
+
+    def _table_message(self, seat_messages: List[Tuple[int, str]]) -> str:
+        """Combine (seat index, result) messages, naming the seats at a multi-seat table."""
+        if len(self.seats) == 1:
+            return seat_messages[0][1]
+        return " | ".join(f"Seat {index + 1}: {message}" for index, message in seat_messages)
 
     def get_current_hand(self) -> Optional[Hand]:
         """Get the currently active hand."""
-        if self.current_hand_index < len(self.player_hands):
-            return self.player_hands[self.current_hand_index]
+        seat = self.seats[self.current_seat_index]
+        if seat.current_hand_index < len(seat.hands):
+            return seat.hands[seat.current_hand_index]
         return None
 
     def can_hit(self) -> bool:
@@ -120,19 +350,56 @@ class BlackjackGame:
         if self.state != GameState.PLAYING:
             return False
         
-        current_hand = self.get_current_hand()
+        seat = self.seats[self.current_seat_index]
+        current_hand = seat.get_current_hand()
         return (current_hand is not None and 
-                current_hand.can_double_down(self.bankroll))
+                (seat.split_count == 0 or self.rules.double_after_split) and
+                current_hand.can_double_down(seat.bankroll))
 
     def can_split(self) -> bool:
         """Check if player can split."""
-        if self.state != GameState.PLAYING or self.split_count >= MAX_SPLIT_HANDS - 1:
+        seat = self.seats[self.current_seat_index]
+        if self.state != GameState.PLAYING or seat.split_count >= self.rules.max_split_hands - 1:
             return False
         
-        current_hand = self.get_current_hand()
+        current_hand = seat.get_current_hand()
         return (current_hand is not None and 
                 current_hand.can_split() and 
-                current_hand.bet <= self.bankroll)
+                current_hand.bet <= seat.bankroll)
+
+    def get_advice(self) -> Optional[Action]:
+        """Get the basic strategy play for the current hand, if one is being played."""
+        if not self.can_hit():
+            return None
+        
+        # Look the strategy up once per rules object rather than on every decision
+        rules, strategy = self._strategy
+        if rules is not self.rules:
+            rules = self.rules
+            strategy = get_basic_strategy(rules.dealer_hits_soft_17, rules.max_split_hands,
+                                          float(rules.blackjack_payout), rules.double_after_split)
+            self._strategy = (rules, strategy)
+        return strategy.advise(
+            self.get_current_hand(), self.dealer_up_card, self.can_double_down(), self.can_split())
+
+    def get_expected_values(self, exact_draws: Optional[int] = DEALER_EXACT_DRAWS) -> Optional[Dict[Action, float]]:
+        """Get the EV of each legal play for the current hand, given the cards left.
+        
+        The EVs are composition-dependent but approximate: player cards drawn
+        after the first exact_draws are not removed from the dealer's
+        composition, and splits are valued as independent hands. Pass None
+        to follow every draw (see ev.expected_values).
+        """
+        if not self.can_hit():
+            return None
+        
+        # The dealer's hole card is unseen, so it counts as still in the deck
+        unseen = composition_key(self.deck.remaining_cards()) + composition_key(self.dealer_hand.cards[:1])
+        rules = self.rules
+        return expected_values(self.get_current_hand(), self.dealer_up_card, unseen,
+                               self.can_double_down(), self.can_split(), rules.dealer_hits_soft_17,
+                               rules.double_after_split, rules.max_split_hands - self.seat.split_count,
+                               exact_draws)
 
     def hit(self) -> None:
         """Player hits (takes another card)."""
@@ -140,7 +407,7 @@ class BlackjackGame:
             return
         
         current_hand = self.get_current_hand()
-        current_hand.add_card(self.deck.draw())
+        current_hand.add_card(self._draw(hand_history.HIT))
         
         if current_hand.is_bust():
             current_hand.busted = True
@@ -161,6 +428,7 @@ class BlackjackGame:
         
         current_hand = self.get_current_hand()
         current_hand.finished = True
+        self._log(hand_history.STAND)
         self._next_hand()
 
     def double_down(self) -> None:
@@ -168,9 +436,10 @@ class BlackjackGame:
         if not self.can_double_down():
             return
         
-        current_hand = self.get_current_hand()
-        additional_bet = current_hand.double_down()
-        self.bankroll -= additional_bet
+        seat = self.seat
+        additional_bet = seat.get_current_hand().double_down()
+        seat.bankroll -= additional_bet
+        self._log(hand_history.DOUBLE)
         self.hit()  # Get one card and finish hand
 
     def split_hand(self) -> None:
@@ -178,74 +447,140 @@ class BlackjackGame:
         if not self.can_split():
             return
         
-        current_hand = self.get_current_hand()
+        seat = self.seat
+        current_hand = seat.get_current_hand()
         
         # Create new hand with the split card
         new_hand = current_hand.split()
+        self._log(hand_history.SPLIT)
         
-        # Add new cards to both hands
-        current_hand.add_card(self.deck.draw())
-        new_hand.add_card(self.deck.draw())
+        # Insert new hand after current hand, so its card counts as on the table
+        seat.hands.insert(seat.current_hand_index + 1, new_hand)
         
-        # Insert new hand after current hand
-        self.player_hands.insert(self.current_hand_index + 1, new_hand)
+        # Add new cards to both hands
+        current_hand.add_card(self._draw(hand_history.SPLIT_CARD))
+        new_hand.add_card(self._draw(hand_history.SPLIT_CARD))
         
         # Deduct additional bet
-        self.bankroll -= current_hand.bet
-        self.split_count += 1
+        seat.bankroll -= current_hand.bet
+        seat.split_count += 1
 
     def _next_hand(self) -> None:
-        """Move to the next hand or start dealer's turn."""
-        self.current_hand_index += 1
-        if self.current_hand_index >= len(self.player_hands):
-            # All hands finished, dealer's turn
-            self.state = GameState.DEALER_TURN
-            self.last_dealer_action_time = time.time()
-
-    def update_dealer(self) -> None:
-        """Update dealer's turn (called each frame)."""
-        if self.state != GameState.DEALER_TURN:
+        """Move to the next hand, the next seat's hand, or the dealer's turn."""
+        seat = self.seats[self.current_seat_index]
+        seat.current_hand_index += 1
+        if seat.current_hand_index < len(seat.hands):
             return
         
-        current_time = time.time()
+        for index in range(self.current_seat_index + 1, len(self.seats)):
+            hand = self.seats[index].get_current_hand()
+            if hand is not None and not hand.finished:
+                self.current_seat_index = index
+                return
+        
+        # All hands finished, dealer's turn
+        self.state = GameState.DEALER_TURN
+        self.last_dealer_action_time = self.clock.now()
+
+    def time_until_dealer_action(self) -> Optional[float]:
+        """Seconds until update_dealer has something to do, or None outside the dealer's turn."""
+        if self.state != GameState.DEALER_TURN:
+            return None
+        
+        if self.dealer_card_revealed and not self._dealer_must_hit():
+            return 0.0  # Ready to settle the round
+        due_time = self.last_dealer_action_time + self.clock.delay(DEALER_PLAY_DELAY)
+        return max(0.0, due_time - self.clock.now())
+
+    def update_dealer(self, max_steps: Optional[int] = None) -> int:
+        """Update dealer's turn (called each frame). Returns the number of actions taken.
+        
+        Performs every dealer action that is due, or at most max_steps of
+        them, so with a zero-delay clock the whole dealer hand is resolved
+        in one call.
+        """
+        steps = 0
+        while (self.state == GameState.DEALER_TURN and (max_steps is None or steps < max_steps)
+               and self._dealer_step()):
+            steps += 1
+        return steps
+
+    def _dealer_step(self) -> bool:
+        """Perform the dealer's next action if it is due. Returns True if it acted."""
+        current_time = self.clock.now()
+        delay_passed = current_time - self.last_dealer_action_time >= self.clock.delay(DEALER_PLAY_DELAY)
         
         if not self.dealer_card_revealed:
-            if current_time - self.last_dealer_action_time >= DEALER_PLAY_DELAY:
-                self.dealer_card_revealed = True
-                self.last_dealer_action_time = current_time
+            if not delay_passed:
+                return False
+            self._reveal_hole_card()
+            self._log(hand_history.REVEAL)
+            self.last_dealer_action_time = current_time
         else:
-            dealer_score = self.dealer_hand.calculate_score()
-            if dealer_score < 17:
-                if current_time - self.last_dealer_action_time >= DEALER_PLAY_DELAY:
-                    self.dealer_hand.add_card(self.deck.draw())
-                    self.last_dealer_action_time = current_time
+            if self._dealer_must_hit():
+                if not delay_passed:
+                    return False
+                self.dealer_hand.add_card(self._draw(hand_history.DEALER_CARD))
+                self.last_dealer_action_time = current_time
             else:
                 self._end_round()
+        return True
+
+    def _reveal_hole_card(self) -> None:
+        """Turn the dealer's hole card face up, counting it now that it can be seen."""
+        self.dealer_card_revealed = True
+        if self.deck.counter is not None:
+            self.deck.counter.observe(self.dealer_hand.cards[0])
+
+    def _dealer_must_hit(self) -> bool:
+        """Whether the dealer draws on the current total: below 17, or soft 17 under H17 rules."""
+        score = self.dealer_hand.calculate_score()
+        return score < 17 or (score == 17 and self.rules.dealer_hits_soft_17 and self.dealer_hand.is_soft())
+
+    def play_dealer(self) -> None:
+        """Resolve the dealer's turn immediately, without the display delays."""
+        if self.state != GameState.DEALER_TURN:
+            return
+        
+        self._reveal_hole_card()
+        self._log(hand_history.REVEAL)
+        while self._dealer_must_hit():
+            self.dealer_hand.add_card(self._draw(hand_history.DEALER_CARD))
+        self._end_round()
 
     def _end_round(self) -> None:
         """End the round and calculate results."""
         dealer_score = self.dealer_hand.calculate_score()
         dealer_busted = self.dealer_hand.is_bust()
         
-        total_winnings = 0
-        results = []
-        
-        for i, hand in enumerate(self.player_hands):
-            player_score = hand.calculate_score()
-            hand_result, winnings = self._calculate_hand_result(hand, dealer_score, dealer_busted)
+        seat_messages = []
+        for seat_index, seat in enumerate(self.seats):
+            if not seat.hands:
+                continue
             
-            total_winnings += winnings
-            results.append(f"Hand {i+1}: {hand_result}")
-        
-        self.bankroll += total_winnings
+            total_winnings = 0
+            results = []
+            seat.hand_payouts = []
+            
+            for i, hand in enumerate(seat.hands):
+                hand_result, winnings = self._calculate_hand_result(hand, dealer_score, dealer_busted)
+                
+                total_winnings += winnings
+                seat.hand_payouts.append(winnings)
+                results.append(f"Hand {i+1}: {hand_result}")
+            
+            seat.bankroll += total_winnings
+            
+            if len(seat.hands) == 1:
+                seat_messages.append((seat_index, results[0].replace("Hand 1: ", "")))
+            else:
+                seat_messages.append((seat_index, " | ".join(results)))
         
         # Create message
-        if len(self.player_hands) == 1:
-            self.message = results[0].replace("Hand 1: ", "")
-        else:
-            self.message = " | ".join(results)
+        self.message = self._table_message(seat_messages)
         
         self.state = GameState.ROUND_COMPLETE
+        self._write_history()
 
     def _calculate_hand_result(self, hand: Hand, dealer_score: int, dealer_busted: bool) -> tuple[str, int]:
         """Calculate the result and winnings for a single hand."""
@@ -254,7 +589,7 @@ class BlackjackGame:
         if hand.busted:
             return "Bust", 0
         elif hand.blackjack and not self.dealer_hand.is_blackjack():
-            return "Blackjack!", int(hand.bet * 2.5)  # 3:2 payout
+            return "Blackjack!", self.rules.blackjack_winnings(hand.bet)
         elif dealer_busted:
             return "Win (Dealer Bust)", hand.bet * 2
         elif dealer_score > player_score:
@@ -266,21 +601,22 @@ class BlackjackGame:
 
     def new_round(self) -> None:
         """Start a new round."""
-        if self.deck.is_low(DECK_RESHUFFLE_THRESHOLD):
-            self.deck = Deck()
+        # More seats use up more cards per round
+        if self.deck.is_low(self.rules.reshuffle_threshold * len(self.seats)):
+            self.deck.reshuffle()
         
-        self.player_hands = []
+        for seat in self.seats:
+            seat.clear()
+        self.current_seat_index = 0
         self.dealer_hand = Hand()
-        self.current_hand_index = 0
-        self.current_bet = 0
         self.state = GameState.BETTING
         self.message = ""
         self.dealer_card_revealed = False
-        self.split_count = 0
 
     def is_game_over(self) -> bool:
-        """Check if the game is over (no money left)."""
-        return self.bankroll == 0 and self.current_bet == 0 and self.state == GameState.BETTING
+        """Check if the game is over (no seat has money left)."""
+        return (self.state == GameState.BETTING and
+                all(seat.bankroll == 0 and seat.current_bet == 0 for seat in self.seats))
 
     def get_game_state(self) -> GameState:
         """Get the current game state."""
@@ -305,6 +641,13 @@ class BlackjackGame:
     def is_round_complete(self) -> bool:
         return self.state == GameState.ROUND_COMPLETE
 
+    @property
+    def dealer_up_card(self) -> Optional[Card]:
+        """The dealer's face-up card (the first card is dealt face down)."""
+        if len(self.dealer_hand.cards) < 2:
+            return None
+        return self.dealer_hand.cards[1]
+
     @property
     def hide_dealer_card(self) -> bool:
         """Whether to hide the dealer's first card."""
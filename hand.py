@@ -2,7 +2,7 @@
 Hand class for managing cards and game state.
 """
 
-from typing import List
+from typing import List, Tuple
 from card import Card
 
 
@@ -16,39 +16,45 @@ class Hand:
         self.finished = False
         self.busted = False
         self.blackjack = False
+        
+        # Running totals kept up to date by add_card and split, so scoring
+        # never has to walk the cards
+        self._hard_total = 0  # Every ace counted as 1
+        self._aces = 0
+        for card in self.cards:
+            self._count_card(card)
+
+    def _count_card(self, card: Card) -> None:
+        """Add a card to the running totals."""
+        if card.is_ace:
+            self._aces += 1
+            self._hard_total += 1
+        else:
+            self._hard_total += card.points
 
     def add_card(self, card: Card) -> None:
         """Add a card to the hand."""
         self.cards.append(card)
+        self._count_card(card)
 
     def calculate_score(self) -> int:
         """Calculate the best possible score for the hand."""
-        score = 0
-        aces = 0
-        
-        # Count non-ace cards first
-        for card in self.cards:
-            if card.value == 'ace':
-                aces += 1
-            else:
-                score += card.get_numeric_value()
-        
-        # Add aces, using 11 when possible, 1 otherwise
-        for _ in range(aces):
-            if score + 11 <= 21:
-                score += 11
-            else:
-                score += 1
-                
-        return score
+        # At most one ace can count as 11 without busting
+        if self._aces and self._hard_total <= 11:
+            return self._hard_total + 10
+        return self._hard_total
+
+    def is_soft(self) -> bool:
+        """Check if an ace is currently counted as 11."""
+        return self._aces > 0 and self._hard_total <= 11
 
     def is_bust(self) -> bool:
         """Check if the hand is busted (over 21)."""
-        return self.calculate_score() > 21
+        return self._hard_total > 21
 
     def is_blackjack(self) -> bool:
         """Check if the hand is a natural blackjack."""
-        return len(self.cards) == 2 and self.calculate_score() == 21
+        return len(self.cards) == 2 and self._aces > 0 and self._hard_total == 11
 
     def can_split(self) -> bool:
         """Check if the hand can be split."""
@@ -80,10 +86,29 @@ class Hand:
         
         # Remove the second card and create new hand
         second_card = self.cards.pop()
+        if second_card.is_ace:
+            self._aces -= 1
+            self._hard_total -= 1
+        else:
+            self._hard_total -= second_card.points
         new_hand = Hand([second_card], self.bet)
         
         return new_hand
 
+    def snapshot(self) -> Tuple:
+        """Capture the hand as an immutable tuple. The cards themselves are shared."""
+        return (tuple(self.cards), self.bet, self.doubled, self.finished, self.busted, self.blackjack,
+                self._hard_total, self._aces)
+
+    @classmethod
+    def from_snapshot(cls, state: Tuple) -> 'Hand':
+        """Create a hand from a state captured by snapshot."""
+        hand = cls.__new__(cls)
+        (cards, hand.bet, hand.doubled, hand.finished, hand.busted, hand.blackjack,
+         hand._hard_total, hand._aces) = state
+        hand.cards = list(cards)
+        return hand
+
     def get_status_string(self) -> str:
         """Get a string representation of the hand's status."""
         if self.busted:
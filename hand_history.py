@@ -0,0 +1,141 @@
+"""
+Compact binary hand history log.
+
+Each completed round is appended as one length-prefixed record holding
+the initial bet, every card and action in order, each hand's bet and
+payout, and the bankroll afterwards. Records go through a buffered
+writer, and read_rounds streams them back one at a time. At a
+multi-seat table the bet and bankroll are table totals and the hands
+are listed in seat order.
+
+Record layout (little-endian):
+    u16  payload length
+    u32  round number (counted from 0 each time a writer opens the log)
+    u32  initial bet
+    i64  bankroll after the round
+    u8   number of hands, u16 number of events
+    hands  x (u32 bet, u32 payout)
+    events x (u8 event code, u8 card index or NO_CARD)
+"""
+
+import struct
+from typing import BinaryIO, Iterator, List, NamedTuple, Tuple
+
+from card import CARDS, Card
+
+FILE_MAGIC = b'BJHH\x02'
+
+# Event codes
+PLAYER_CARD = 1   # Initial deal to the player
+DEALER_CARD = 2   # Initial deal or draw by the dealer
+HIT = 3
+STAND = 4
+DOUBLE = 5
+SPLIT = 6
+SPLIT_CARD = 7    # Card dealt to one of the hands after a split
+REVEAL = 8        # Dealer turns over the hole card
+
+EVENT_NAMES = {
+    PLAYER_CARD: "player card", DEALER_CARD: "dealer card", HIT: "hit", STAND: "stand",
+    DOUBLE: "double", SPLIT: "split", SPLIT_CARD: "split card", REVEAL: "reveal",
+}
+
+NO_CARD = 0xFF
+
+_LENGTH = struct.Struct('<H')
+_HEADER = struct.Struct('<IIqBH')
+_PREFIXED_HEADER = struct.Struct('<HIIqBH')
+_HAND = struct.Struct('<II')
+
+
+class RoundRecord(NamedTuple):
+    """One round read back from a hand history log."""
+    round_number: int
+    initial_bet: int
+    bankroll: int
+    hands: Tuple[Tuple[int, int], ...]   # (bet, payout) per hand
+    events: Tuple[Tuple[int, int], ...]  # (event code, card index or NO_CARD)
+
+    @property
+    def net(self) -> int:
+        """Money won or lost over the round."""
+        return sum(payout - bet for bet, payout in self.hands)
+
+    def cards(self) -> List[Card]:
+        """Every card dealt in the round, in order."""
+        return [CARDS[card] for _, card in self.events if card != NO_CARD]
+
+    def describe(self) -> str:
+        """Get a readable one-line summary of the round."""
+        events = ", ".join(EVENT_NAMES[code] + (f" {CARDS[card]}" if card != NO_CARD else "")
+                           for code, card in self.events)
+        return f"Round {self.round_number}: bet ${self.initial_bet} | {events} | net {self.net:+d} | bankroll ${self.bankroll}"
+
+
+class HandHistoryWriter:
+    """Appends completed rounds to a hand history log through a buffered file."""
+
+    def __init__(self, path: str, buffer_size: int = 1 << 16):
+        self.file: BinaryIO = open(path, 'ab', buffering=buffer_size)
+        if self.file.tell() == 0:
+            self.file.write(FILE_MAGIC)
+        else:
+            # Never append records to a log written in another format
+            with open(path, 'rb') as existing:
+                if existing.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                    self.file.close()
+                    raise ValueError(f"{path} is not a hand history log in this format")
+        self.rounds_written = 0
+
+    def write_round(self, initial_bet: int, bankroll: int, hands: List[Tuple[int, int]],
+                    events: bytes) -> None:
+        """Append one completed round.
+
+        events holds the round's (event code, card index) byte pairs back to
+        back, the way BlackjackGame collects them.
+        """
+        length = _HEADER.size + _HAND.size * len(hands) + len(events)
+        self.file.write(_PREFIXED_HEADER.pack(length, self.rounds_written, initial_bet, bankroll,
+                                              len(hands), len(events) // 2))
+        for bet, payout in hands:
+            self.file.write(_HAND.pack(bet, payout))
+        self.file.write(events)
+        self.rounds_written += 1
+
+    def flush(self) -> None:
+        """Push buffered rounds to disk."""
+        self.file.flush()
+
+    def close(self) -> None:
+        """Flush and close the log."""
+        self.file.close()
+
+    def __enter__(self) -> 'HandHistoryWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_rounds(path: str) -> Iterator[RoundRecord]:
+    """Stream every round from a hand history log without loading the whole file."""
+    with open(path, 'rb') as history_file:
+        if history_file.read(len(FILE_MAGIC)) != FILE_MAGIC:
+            raise ValueError(f"{path} is not a hand history log")
+
+        while True:
+            length_bytes = history_file.read(_LENGTH.size)
+            if not length_bytes:
+                return
+            length = _LENGTH.unpack(length_bytes)[0]
+            payload = history_file.read(length)
+            if len(payload) < length:
+                return  # Last record was cut off mid-write
+
+            round_number, initial_bet, bankroll, hand_count, event_count = _HEADER.unpack_from(payload)
+            offset = _HEADER.size
+            hands = tuple(_HAND.iter_unpack(payload[offset:offset + hand_count * _HAND.size]))
+            offset += hand_count * _HAND.size
+            events = tuple(zip(payload[offset:offset + 2 * event_count:2],
+                               payload[offset + 1:offset + 2 * event_count:2]))
+            yield RoundRecord(round_number, initial_bet, bankroll, hands, events)
@@ -2,19 +2,37 @@
 Main entry point for the blackjack game.
 """
 
+import time
+
+# Taken before the heavier imports so startup timing covers them
+LAUNCH_TIME = time.perf_counter()
+
+import argparse
+import math
 import pygame
+import random
 import sys
-from typing import Tuple
+from typing import Dict, List, Optional, Tuple
 
 from constants import WINDOW_WIDTH, WINDOW_HEIGHT, FPS
 from game import BlackjackGame, GameState
+from hand_history import HandHistoryWriter
+from profiler import FrameProfiler
+from replay import BET, DEAL, DOUBLE, HIT, NEW_ROUND, SPLIT, STAND, Session, Step, apply_step, is_legal
 from ui import GameUI
 
+# Seconds between refreshes of the on-screen profiler readout
+PROFILE_OVERLAY_INTERVAL = 0.5
+# Timer event that wakes an idle loop to refresh the profiler readout
+PROFILE_REFRESH_EVENT = pygame.USEREVENT
+
 
 class BlackjackApp:
     """Main application class that handles the game loop and events."""
     
-    def __init__(self):
+    def __init__(self, use_atlas: bool = True, report_startup: bool = False,
+                 history_path: Optional[str] = None, record_path: Optional[str] = None,
+                 profile_path: Optional[str] = None):
         pygame.init()
         
         # Set up display
@@ -22,19 +40,78 @@ class BlackjackApp:
         pygame.display.set_caption("Blackjack")
         self.clock = pygame.time.Clock()
         
+        # Only wake the main loop for events that can change the table
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN,
+                                  pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, PROFILE_REFRESH_EVENT])
+        
         # Initialize game components
-        self.game = BlackjackGame()
-        self.ui = GameUI(self.screen)
+        # A recorded session needs a seeded game so it can be replayed exactly
+        self.record_path = record_path
+        self.session = Session(random.SystemRandom().randrange(2 ** 32)) if record_path else None
+        self.game = BlackjackGame(random.Random(self.session.seed)) if self.session else BlackjackGame()
+        self.history = HandHistoryWriter(history_path) if history_path else None
+        self.game.record_history(self.history)
+        self.ui = GameUI(self.screen, use_atlas)
+        self.report_startup = report_startup
         
         self.running = True
+        self.show_hint = False
+        self.show_counts = False
+        self.game.enable_counting()
+        
+        # Frame profiling, only when asked for
+        self.profile_path = profile_path
+        self.profiler = FrameProfiler() if profile_path else None
+        self.show_profile = False
+        self.profile_lines: Tuple[str, ...] = ()
+        self._profile_refresh_due = False
+        
+        # What each screen region showed when it was last drawn
+        self._drawn_state: Dict[str, tuple] = {}
 
     def handle_events(self) -> None:
-        """Handle all pygame events."""
+        """Handle all pending pygame events."""
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                self._handle_mouse_click(pygame.mouse.get_pos())
+            self._handle_event(event)
+
+    def _handle_event(self, event: pygame.event.Event) -> None:
+        """Handle a single pygame event."""
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            # The window contents were lost, so redraw everything
+            self._drawn_state = {}
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            self._handle_mouse_click(event.pos)
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+            # Toggle the basic strategy hint
+            self.show_hint = not self.show_hint
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_c:
+            # Toggle the card count readout
+            self.show_counts = not self.show_counts
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_p and self.profiler is not None:
+            # Toggle the frame profiler readout, refreshed on a timer while it is shown
+            self.show_profile = not self.show_profile
+            self._profile_refresh_due = self.show_profile
+            pygame.time.set_timer(PROFILE_REFRESH_EVENT,
+                                  int(PROFILE_OVERLAY_INTERVAL * 1000) if self.show_profile else 0)
+        elif event.type == PROFILE_REFRESH_EVENT:
+            self._profile_refresh_due = self.show_profile
+
+    def _wait_for_event(self) -> None:
+        """Sleep until there is input or the dealer's next action is due."""
+        timeout = self.game.time_until_dealer_action()
+        if timeout is None:
+            # Nothing happens until the player does something
+            event = pygame.event.wait()
+        elif timeout > 0:
+            event = pygame.event.wait(math.ceil(timeout * 1000))
+        else:
+            return
+        
+        if event.type != pygame.NOEVENT:
+            self._handle_event(event)
 
     def _handle_mouse_click(self, mouse_pos: Tuple[int, int]) -> None:
         """Handle mouse click events based on current game state."""
@@ -50,37 +127,45 @@ class BlackjackApp:
         ui = self.ui
         
         if ui.bet_5_button.is_clicked(mouse_pos):
-            self.game.place_bet(5)
+            self._play((BET, 5))
         elif ui.bet_10_button.is_clicked(mouse_pos):
-            self.game.place_bet(10)
+            self._play((BET, 10))
         elif ui.bet_25_button.is_clicked(mouse_pos):
-            self.game.place_bet(25)
+            self._play((BET, 25))
         elif ui.bet_50_button.is_clicked(mouse_pos):
-            self.game.place_bet(50)
+            self._play((BET, 50))
         elif ui.bet_100_button.is_clicked(mouse_pos):
-            self.game.place_bet(100)
-        elif ui.deal_button.is_clicked(mouse_pos) and self.game.can_deal():
-            self.game.deal_initial_cards()
+            self._play((BET, 100))
+        elif ui.deal_button.is_clicked(mouse_pos):
+            self._play((DEAL,))
 
     def _handle_action_clicks(self, mouse_pos: Tuple[int, int]) -> None:
         """Handle clicks during playing phase."""
         ui = self.ui
         
         if ui.hit_button.is_clicked(mouse_pos):
-            self.game.hit()
+            self._play((HIT,))
         elif ui.stand_button.is_clicked(mouse_pos):
-            self.game.stand()
+            self._play((STAND,))
         elif ui.double_button.is_clicked(mouse_pos):
-            self.game.double_down()
+            self._play((DOUBLE,))
         elif ui.split_button.is_clicked(mouse_pos):
-            self.game.split_hand()
+            self._play((SPLIT,))
 
     def _handle_round_complete_clicks(self, mouse_pos: Tuple[int, int]) -> None:
         """Handle clicks when round is complete."""
         ui = self.ui
         
         if ui.play_again_button.is_clicked(mouse_pos):
-            self.game.new_round()
+            self._play((NEW_ROUND,))
+
+    def _play(self, step: Step) -> None:
+        """Take a player action if it is legal, recording it when a session is being recorded."""
+        if not is_legal(self.game, step):
+            return
+        apply_step(self.game, step)
+        if self.session is not None:
+            self.session.record(*step)
 
     def update(self) -> None:
         """Update game state."""
@@ -105,7 +190,55 @@ class BlackjackApp:
         ui.split_button.set_enabled(self.game.can_split())
 
     def render(self) -> None:
-        """Render the game."""
+        """Redraw the regions of the table whose contents changed since the last frame."""
+        dirty = self._draw_changed_regions()
+        if dirty:
+            pygame.display.update(dirty)
+
+    def _draw_changed_regions(self) -> List[pygame.Rect]:
+        """Draw the regions whose contents changed to the screen surface and return them."""
+        state = self._region_state()
+        dirty = [self.ui.regions[name] for name, region_state in state.items()
+                 if self._drawn_state.get(name) != region_state]
+        if not dirty:
+            return dirty
+        
+        # Draw the whole scene clipped to each dirty region; blits outside
+        # the clip rectangle are rejected without touching any pixels
+        for rect in dirty:
+            self.screen.set_clip(rect)
+            self._draw_scene()
+        self.screen.set_clip(None)
+        
+        self._drawn_state = state
+        return dirty
+
+    def _region_state(self) -> Dict[str, tuple]:
+        """Everything that can change what is drawn in each screen region."""
+        game = self.game
+        ui = self.ui
+        phase = game.get_game_state()
+        
+        dealer_cards = tuple(card.index for card in game.dealer_hand.cards)
+        hands = tuple((tuple(card.index for card in hand.cards), hand.bet, hand.get_status_string(),
+                       hand.finished) for hand in game.player_hands)
+        indicator = game.current_hand_index if len(game.player_hands) > 1 and not game.is_dealer_turn else None
+        bet_buttons = tuple(button.enabled for button in (ui.bet_5_button, ui.bet_10_button, ui.bet_25_button,
+                                                          ui.bet_50_button, ui.bet_100_button))
+        action_buttons = tuple(button.enabled for button in (ui.hit_button, ui.stand_button,
+                                                             ui.double_button, ui.split_button))
+        hint = game.get_advice() if self.show_hint and game.is_playing_phase else None
+        counts = tuple(game.get_counts().items()) if self.show_counts else None
+        
+        return {
+            'top': (phase, game.bankroll, game.current_bet, dealer_cards, game.dealer_card_revealed, indicator),
+            'middle': (phase, game.message, game.current_bet == 0, self.show_profile and self.profile_lines),
+            'hands': (phase, hands, game.current_hand_index, bet_buttons, hint, game.current_bet > 0),
+            'bottom': (phase, action_buttons, counts, game.current_bet > 0),
+        }
+
+    def _draw_scene(self) -> None:
+        """Draw the full table."""
         ui = self.ui
         game = self.game
         
@@ -126,8 +259,11 @@ class BlackjackApp:
         # Draw message
         ui.draw_message(game.message)
         
-        # Update display
-        pygame.display.flip()
+        if self.show_counts:
+            ui.draw_counts(game.get_counts())
+        
+        if self.show_profile:
+            ui.draw_profile(self.profile_lines)
 
     def _render_betting_phase(self) -> None:
         """Render the betting phase."""
@@ -163,25 +299,103 @@ class BlackjackApp:
         # Draw appropriate buttons
         if game.is_playing_phase:
             ui.draw_action_buttons()
+            if self.show_hint:
+                ui.draw_hint(game.get_advice())
         elif game.is_round_complete:
             ui.play_again_button.draw(ui.screen)
 
-    def run(self) -> None:
-        """Main game loop."""
+    def _report_startup_time(self) -> None:
+        """Print the time from launch to the first frame on screen."""
+        elapsed = (time.perf_counter() - LAUNCH_TIME) * 1000
+        source = "card atlas" if self.ui.used_atlas else "card PNGs"
+        print(f"First frame after {elapsed:.1f} ms ({source})")
+        self.report_startup = False
+
+    def _end_frame(self) -> None:
+        """Finish a frame and sleep until the next one is needed."""
+        if self.report_startup:
+            self._report_startup_time()
+        # Caps the frame rate while events arrive in quick succession
+        self.clock.tick(FPS)
+        if self.running:
+            self._wait_for_event()
+
+    def _run_profiled(self) -> None:
+        """The main loop with each phase of every frame timed.
+        
+        Kept separate from the plain loop so that running without the
+        profiler costs nothing at all.
+        """
+        profiler = self.profiler
+        now = time.perf_counter
         while self.running:
+            if self._profile_refresh_due:
+                # Outside the timed phases, and drawn by this frame
+                self.profile_lines = tuple(profiler.overlay_lines())
+                self._profile_refresh_due = False
+            start = now()
             self.handle_events()
-            self.update()
-            self.render()
-            self.clock.tick(FPS)
+            events_done = now()
+            self.game.update_dealer()
+            dealer_done = now()
+            self._update_ui()
+            ui_done = now()
+            dirty = self._draw_changed_regions()
+            render_done = now()
+            if dirty:
+                pygame.display.update(dirty)
+            present_done = now()
+            
+            profiler.record((events_done - start, dealer_done - events_done, ui_done - dealer_done,
+                             render_done - ui_done, present_done - render_done))
+            self._end_frame()
+
+    def run(self) -> None:
+        """Main game loop.
         
+        Instead of spinning at a fixed frame rate, the loop sleeps until an
+        input event arrives or the dealer's next action is due.
+        """
+        if self.profiler is not None:
+            self._run_profiled()
+        else:
+            while self.running:
+                self.handle_events()
+                self.update()
+                self.render()
+                self._end_frame()
+        
+        if self.profiler is not None:
+            self.profiler.dump(self.profile_path)
+            print(f"Frame profile written to {self.profile_path}")
+        if self.history is not None:
+            self.history.close()
+        if self.session is not None:
+            self.session.save(self.record_path)
         pygame.quit()
         sys.exit()
 
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Play blackjack.")
+    parser.add_argument('--startup-time', action='store_true',
+                        help="print the time from launch to the first frame")
+    parser.add_argument('--no-atlas', action='store_true',
+                        help="load card faces from the PNGs even if an atlas is available")
+    parser.add_argument('--history', default=None, metavar='PATH',
+                        help="append every round played to a hand history log")
+    parser.add_argument('--record', default=None, metavar='PATH',
+                        help="save the seed and every action taken, for replay.py")
+    parser.add_argument('--profile', nargs='?', const='frame_profile.json', default=None, metavar='PATH',
+                        help="time each phase of every frame and write percentiles to PATH on exit "
+                             "(press P for an on-screen readout)")
+    args = parser.parse_args()
+    
     try:
-        app = BlackjackApp()
+        app = BlackjackApp(use_atlas=not args.no_atlas, report_startup=args.startup_time,
+                           history_path=args.history, record_path=args.record,
+                           profile_path=args.profile)
         app.run()
     except Exception as e:
         print(f"Error running game: {e}")
@@ -0,0 +1,127 @@
+"""
+Multi-core runner for headless blackjack simulations.
+
+Rounds are split into fixed-size chunks. Chunk i always uses its own RNG
+derived from (master seed, i), so the merged totals depend only on the
+master seed and the number of chunks played, never on how many worker
+processes played them.
+
+Usage:
+    python parallel_sim.py --rounds 10000000 --seed 1
+    python parallel_sim.py --seconds 60 --workers 8 --seed 1
+"""
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Optional
+
+from simulate import STRATEGIES, SimulationResult, simulate
+
+DEFAULT_CHUNK_SIZE = 20000
+
+
+def chunk_rng(master_seed: int, chunk_index: int) -> random.Random:
+    """Independent, reproducible RNG stream for one chunk of rounds."""
+    # String seeds are hashed with SHA-512, so neighbouring chunks get unrelated streams
+    return random.Random(f"{master_seed}:{chunk_index}")
+
+
+def run_chunk(master_seed: int, chunk_index: int, rounds: int, strategy_name: str,
+              bet: int, num_decks: Optional[int] = None, num_seats: int = 1) -> SimulationResult:
+    """Play one chunk of rounds. Runs inside a worker process."""
+    return simulate(rounds, STRATEGIES[strategy_name], bet, chunk_rng(master_seed, chunk_index), num_decks,
+                    num_seats=num_seats)
+
+
+class ParallelRunner:
+    """Spreads simulation chunks across a pool of worker processes."""
+
+    def __init__(self, master_seed: int, strategy_name: str = 'mimic-dealer', bet: int = 10,
+                 workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 num_decks: Optional[int] = None, num_seats: int = 1):
+        if strategy_name not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy_name}")
+        self.master_seed = master_seed
+        self.strategy_name = strategy_name
+        self.bet = bet
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.num_decks = num_decks
+        self.num_seats = num_seats
+        self.chunks_played = 0
+
+    def run(self, rounds: Optional[int] = None, seconds: Optional[float] = None) -> SimulationResult:
+        """Play until the round budget is used up or the time budget runs out.
+
+        With a time budget, new chunks stop being started at the deadline and
+        the chunks already running are finished, so the result always covers
+        chunks 0..n-1 and can be reproduced with rounds=n*chunk_size.
+        """
+        if rounds is None and seconds is None:
+            raise ValueError("A round or time budget is required")
+
+        deadline = time.perf_counter() + seconds if seconds is not None else None
+        total = SimulationResult(self.bet)
+        start_time = time.perf_counter()
+        next_chunk = 0
+        rounds_started = 0
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = set()
+            while True:
+                # Keep every worker busy with one chunk queued behind it
+                while len(pending) < self.workers * 2:
+                    if rounds is not None and rounds_started >= rounds:
+                        break
+                    if deadline is not None and time.perf_counter() >= deadline:
+                        break
+                    chunk_rounds = self.chunk_size
+                    if rounds is not None:
+                        chunk_rounds = min(chunk_rounds, rounds - rounds_started)
+                    pending.add(pool.submit(run_chunk, self.master_seed, next_chunk,
+                                            chunk_rounds, self.strategy_name, self.bet, self.num_decks,
+                                            self.num_seats))
+                    next_chunk += 1
+                    rounds_started += chunk_rounds
+
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    total.merge(future.result())
+
+        self.chunks_played = next_chunk
+        total.elapsed = time.perf_counter() - start_time
+        return total
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Run blackjack simulations on all cores.")
+    parser.add_argument('--rounds', type=int, default=None, help="round budget")
+    parser.add_argument('--seconds', type=float, default=None, help="time budget")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="rounds per work unit")
+    parser.add_argument('--bet', type=int, default=10, help="initial bet per round (even, so 3:2 pays exactly)")
+    parser.add_argument('--seed', type=int, default=None, help="master seed (random if omitted)")
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='mimic-dealer',
+                        help="player strategy")
+    parser.add_argument('--decks', type=int, default=None, help="deal from a shoe of this many decks")
+    parser.add_argument('--seats', type=int, default=1, help="players at each table")
+    args = parser.parse_args()
+
+    if args.rounds is None and args.seconds is None:
+        args.rounds = 1000000
+    seed = args.seed if args.seed is not None else random.SystemRandom().randrange(2 ** 32)
+
+    runner = ParallelRunner(seed, args.strategy, args.bet, args.workers, args.chunk_size, args.decks, args.seats)
+    result = runner.run(args.rounds, args.seconds)
+    print(f"Master seed:   {seed} ({runner.chunks_played} chunks on {runner.workers} workers)")
+    print(result.summary())
+
+
+if __name__ == "__main__":
+    main()
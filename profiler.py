@@ -0,0 +1,78 @@
+"""
+Frame-time and phase profiler for the game loop.
+
+Each frame records how long every phase of the loop took into a
+fixed-size ring buffer per phase, so memory stays constant however long
+the game runs. Percentiles over the last few hundred frames are only
+worked out when asked for, which keeps recording down to a handful of
+perf_counter calls and array stores per frame.
+"""
+
+import json
+from array import array
+from typing import Dict, List, Sequence
+
+PHASES = ('handle_events', 'update_dealer', 'update_ui', 'render', 'present')
+PERCENTILES = (50, 95, 99)
+DEFAULT_CAPACITY = 512
+
+
+def nearest_rank(ordered: Sequence[float], percentile: int) -> float:
+    """Nearest-rank percentile of sorted samples."""
+    return ordered[min(len(ordered) - 1, max(0, -(-percentile * len(ordered) // 100) - 1))]
+
+
+class FrameProfiler:
+    """Rolling per-phase frame timings."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        # One ring buffer per phase plus the whole frame, in seconds
+        self._samples = {phase: array('d', bytes(8 * capacity)) for phase in PHASES + ('frame',)}
+        self._buffers = [self._samples[phase] for phase in PHASES]
+        self._frame_buffer = self._samples['frame']
+        self._next = 0
+        self.frames = 0  # Frames recorded since the start, including overwritten ones
+
+    def record(self, durations: Sequence[float]) -> None:
+        """Record one frame's phase durations, in the order of PHASES."""
+        index = self._next
+        total = 0.0
+        for buffer, duration in zip(self._buffers, durations):
+            buffer[index] = duration
+            total += duration
+        self._frame_buffer[index] = total
+        self._next = (index + 1) % self.capacity
+        self.frames += 1
+
+    def percentiles(self, phase: str) -> Dict[int, float]:
+        """{percentile: milliseconds} for a phase over the frames still in the buffer."""
+        count = min(self.frames, self.capacity)
+        if count == 0:
+            return {percentile: 0.0 for percentile in PERCENTILES}
+        ordered = sorted(self._samples[phase][:count])
+        return {percentile: nearest_rank(ordered, percentile) * 1000 for percentile in PERCENTILES}
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Percentiles and maximum in milliseconds for every phase and the whole frame."""
+        count = min(self.frames, self.capacity)
+        report = {}
+        for phase in PHASES + ('frame',):
+            stats = {f"p{percentile}": value for percentile, value in self.percentiles(phase).items()}
+            stats['max'] = max(self._samples[phase][:count], default=0.0) * 1000
+            report[phase] = stats
+        return report
+
+    def overlay_lines(self) -> List[str]:
+        """Short lines of text for an on-screen readout."""
+        lines = [f"{'phase':<14} p50    p95    p99  (ms)"]
+        for phase in PHASES + ('frame',):
+            values = self.percentiles(phase)
+            lines.append(f"{phase:<14}" + "".join(f"{values[percentile]:6.2f} " for percentile in PERCENTILES))
+        return lines
+
+    def dump(self, path: str) -> None:
+        """Write the current report to a JSON file."""
+        with open(path, 'w') as profile_file:
+            json.dump({'frames': self.frames, 'window': min(self.frames, self.capacity),
+                       'unit': 'ms', 'phases': self.report()}, profile_file, indent=1)
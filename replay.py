@@ -0,0 +1,243 @@
+"""
+Deterministic replay of blackjack sessions.
+
+A session is fully described by the seed of the game's RNG and the ordered
+list of player actions taken. Replaying those actions against a fresh
+BlackjackGame seeded the same way rebuilds the exact deck order, hands,
+splits, doubles and bankroll at every step. The dealer plays out
+instantly, so thousands of rounds replay per second without the UI.
+
+ReplayEngine keeps a snapshot of the game every few rounds, so seeking
+to round N only replays the rounds since the nearest checkpoint.
+
+Usage:
+    python main.py --record session.json
+    python replay.py session.json --round 120
+    python replay.py --generate 10000 --seed 1 session.json
+"""
+
+import argparse
+import bisect
+import json
+import random
+import time
+from typing import List, Optional, Tuple
+
+from clock import TurboClock
+from game import BlackjackGame, GameSnapshot
+from simulate import DOUBLE, HIT, SPLIT, STAND, STRATEGIES
+
+# Session actions. A hand is played with the strategy actions from
+# simulate.py, so recorded strategy sessions replay them unchanged.
+BET = 'bet'
+DEAL = 'deal'
+NEW_ROUND = 'new_round'
+
+# A step is (action,) or (BET, amount)
+Step = Tuple
+
+DEFAULT_CHECKPOINT_INTERVAL = 100
+
+
+class Session:
+    """An RNG seed plus every action taken in a game, in order."""
+
+    def __init__(self, seed: int, steps: Optional[List[Step]] = None):
+        self.seed = seed
+        self.steps: List[Step] = steps if steps is not None else []
+
+    def new_game(self) -> BlackjackGame:
+        """A game in the state the session started from."""
+        return BlackjackGame(random.Random(self.seed), clock=TurboClock())
+
+    def record(self, action: str, amount: Optional[int] = None) -> None:
+        """Append an action that was just taken."""
+        self.steps.append((action,) if amount is None else (action, amount))
+
+    def save(self, path: str) -> None:
+        """Write the session to a JSON file."""
+        with open(path, 'w') as session_file:
+            json.dump({'seed': self.seed, 'steps': self.steps}, session_file)
+
+    @classmethod
+    def load(cls, path: str) -> 'Session':
+        """Read a session written by save."""
+        with open(path) as session_file:
+            data = json.load(session_file)
+        return cls(data['seed'], [tuple(step) for step in data['steps']])
+
+
+def is_legal(game: BlackjackGame, step: Step) -> bool:
+    """Check whether a step can be taken in the game's current state."""
+    action = step[0]
+    if action == BET:
+        return game.is_betting_phase and 0 < step[1] <= game.bankroll
+    if action == DEAL:
+        return game.can_deal()
+    if action in (HIT, STAND):
+        return game.can_hit()
+    if action == DOUBLE:
+        return game.can_double_down()
+    if action == SPLIT:
+        return game.can_split()
+    if action == NEW_ROUND:
+        return game.is_round_complete
+    raise ValueError(f"Unknown session action: {action!r}")
+
+
+def apply_step(game: BlackjackGame, step: Step) -> None:
+    """Take one step in a game. Raises ValueError if it is not legal right now."""
+    if not is_legal(game, step):
+        raise ValueError(f"Illegal session step {step!r} in state {game.state.value}")
+
+    action = step[0]
+    if action == BET:
+        game.place_bet(step[1])
+    elif action == DEAL:
+        game.deal_initial_cards()
+    elif action == HIT:
+        game.hit()
+    elif action == STAND:
+        game.stand()
+    elif action == DOUBLE:
+        game.double_down()
+    elif action == SPLIT:
+        game.split_hand()
+    elif action == NEW_ROUND:
+        game.new_round()
+
+
+class ReplayEngine:
+    """Rebuilds the state of a session at any step, using periodic checkpoints."""
+
+    def __init__(self, session: Session, checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL):
+        self.session = session
+        self.checkpoint_interval = checkpoint_interval
+        self.round_starts: List[int] = []  # Step index at which each round starts
+        self._checkpoint_steps: List[int] = []
+        self._checkpoints: List[GameSnapshot] = []
+        self.final_state = self._index()
+
+    def _index(self) -> BlackjackGame:
+        """Replay the whole session once, noting round starts and taking checkpoints."""
+        game = self.session.new_game()
+        # Every game handed out is forked from this one in a checkpoint's state
+        self._template = game.fork()
+        for index, step in enumerate(self.session.steps):
+            if index == 0 or self.session.steps[index - 1][0] == NEW_ROUND:
+                self._round_started(index, game)
+            self._advance(game, index, step)
+        if not self.session.steps or self.session.steps[-1][0] == NEW_ROUND:
+            self._round_started(len(self.session.steps), game)
+        return game
+
+    def _round_started(self, index: int, game: BlackjackGame) -> None:
+        if len(self.round_starts) % self.checkpoint_interval == 0:
+            self._checkpoint_steps.append(index)
+            self._checkpoints.append(game.snapshot())
+        self.round_starts.append(index)
+
+    @staticmethod
+    def _advance(game: BlackjackGame, index: int, step: Step) -> None:
+        try:
+            apply_step(game, step)
+        except ValueError as e:
+            raise ValueError(f"Session step {index}: {e}") from None
+        if game.is_dealer_turn:
+            game.play_dealer()
+
+    @property
+    def rounds(self) -> int:
+        """Number of rounds started in the session."""
+        return len(self.round_starts)
+
+    def state_at(self, step: int) -> BlackjackGame:
+        """A new game in the state after the first `step` steps of the session."""
+        if not 0 <= step <= len(self.session.steps):
+            raise IndexError(f"Step {step} is outside the session")
+
+        checkpoint = bisect.bisect_right(self._checkpoint_steps, step) - 1
+        game = self._template.fork(self._checkpoints[checkpoint])
+        for index in range(self._checkpoint_steps[checkpoint], step):
+            self._advance(game, index, self.session.steps[index])
+        return game
+
+    def seek_round(self, round_number: int) -> BlackjackGame:
+        """A new game at the start of a round (0-based), before its bets are placed."""
+        if not 0 <= round_number < self.rounds:
+            raise IndexError(f"Round {round_number} is outside the session")
+        return self.state_at(self.round_starts[round_number])
+
+
+def record_strategy_session(seed: int, rounds: int, strategy_name: str = 'basic', bet: int = 10) -> Session:
+    """Play rounds headlessly with a simulate.py strategy and record them as a session."""
+    strategy = STRATEGIES[strategy_name]
+    session = Session(seed)
+    game = session.new_game()
+    for _ in range(rounds):
+        if game.bankroll < bet:
+            break
+        for step in ((BET, bet), (DEAL,)):
+            apply_step(game, step)
+            session.record(*step)
+        while game.is_playing_phase:
+            step = (strategy(game, game.get_current_hand()),)
+            apply_step(game, step)
+            session.record(*step)
+        if game.is_dealer_turn:
+            game.play_dealer()
+        apply_step(game, (NEW_ROUND,))
+        session.record(NEW_ROUND)
+    return session
+
+
+def describe(game: BlackjackGame) -> str:
+    """Get a readable summary of a game's state."""
+    lines = [f"State:    {game.state.value}",
+             f"Bankroll: ${game.bankroll} (bet ${game.current_bet})"]
+    if game.dealer_hand.cards:
+        lines.append(f"Dealer:   {game.dealer_hand} ({game.dealer_hand.calculate_score()})")
+    for number, hand in enumerate(game.player_hands, 1):
+        lines.append(f"Hand {number}:   {hand} ({hand.calculate_score()}, bet ${hand.bet})")
+    if game.message:
+        lines.append(f"Result:   {game.message}")
+    return "\n".join(lines)
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Replay a recorded blackjack session.")
+    parser.add_argument('session', help="session file recorded with main.py --record")
+    parser.add_argument('--round', type=int, default=None, help="show the start of this round (0-based)")
+    parser.add_argument('--step', type=int, default=None, help="show the state after this many steps")
+    parser.add_argument('--checkpoint-interval', type=int, default=DEFAULT_CHECKPOINT_INTERVAL,
+                        help="rounds between checkpoints")
+    parser.add_argument('--generate', type=int, default=None, metavar='ROUNDS',
+                        help="record a basic strategy session of this many rounds to the file first")
+    parser.add_argument('--seed', type=int, default=1, help="seed for --generate")
+    args = parser.parse_args()
+
+    if args.generate is not None:
+        record_strategy_session(args.seed, args.generate).save(args.session)
+
+    session = Session.load(args.session)
+    start_time = time.perf_counter()
+    engine = ReplayEngine(session, args.checkpoint_interval)
+    elapsed = time.perf_counter() - start_time
+    print(f"Replayed {len(session.steps):,} steps, {engine.rounds:,} rounds in {elapsed:.3f}s "
+          f"({engine.rounds / max(elapsed, 1e-9):,.0f} rounds/s)")
+
+    try:
+        if args.round is not None:
+            game = engine.seek_round(args.round)
+        elif args.step is not None:
+            game = engine.state_at(args.step)
+        else:
+            game = engine.final_state
+    except IndexError as e:
+        parser.error(str(e))
+    print(describe(game))
+
+
+if __name__ == "__main__":
+    main()
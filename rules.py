@@ -0,0 +1,64 @@
+"""
+Table rules configuration for the blackjack game.
+
+A Rules value gathers every house rule that changes the odds, so a game,
+a simulation or a rule sweep can be set up from a single object. Rules
+are immutable and hashable, so they can key caches and be sent to worker
+processes.
+"""
+
+import random
+from fractions import Fraction
+from typing import NamedTuple, Optional, Union
+
+from card import Deck, Shoe
+from constants import DECK_RESHUFFLE_THRESHOLD, MAX_SPLIT_HANDS, SHOE_PENETRATION
+
+THREE_TO_TWO = Fraction(3, 2)
+SIX_TO_FIVE = Fraction(6, 5)
+
+
+def parse_payout(text: str) -> Fraction:
+    """Read a blackjack payout written like '3:2' or '1'. Raises ValueError or ZeroDivisionError."""
+    numerator, _, denominator = text.partition(':')
+    return Fraction(int(numerator), int(denominator or 1))
+
+
+class Rules(NamedTuple):
+    """House rules for a table. The defaults are the game's own rules."""
+    dealer_hits_soft_17: bool = False
+    blackjack_payout: Fraction = THREE_TO_TWO  # Winnings per unit bet on a natural
+    double_after_split: bool = True
+    max_split_hands: int = MAX_SPLIT_HANDS
+    decks: int = 1
+    # Fraction of the cards dealt before a reshuffle. None means the
+    # game's usual rule: a single deck reshuffles when fewer than
+    # reshuffle_threshold cards are left, a shoe at SHOE_PENETRATION.
+    penetration: Optional[float] = None
+    reshuffle_threshold: int = DECK_RESHUFFLE_THRESHOLD
+
+    def make_deck(self, rng: Optional[random.Random] = None) -> Union[Deck, Shoe]:
+        """A new deck or shoe dealt under these rules."""
+        if self.decks == 1 and self.penetration is None:
+            return Deck(rng)
+        penetration = self.penetration if self.penetration is not None else SHOE_PENETRATION
+        return Shoe(self.decks, max(1, int(self.decks * 52 * penetration)), rng)
+
+    def blackjack_winnings(self, bet: int) -> int:
+        """Amount returned for a winning natural, including the bet. Fractions of a chip are kept by the house."""
+        return bet + int(bet * self.blackjack_payout)
+
+    def describe(self) -> str:
+        """Short summary, e.g. 'S17 3:2 DAS 4 hands 1 deck'."""
+        payout = self.blackjack_payout
+        parts = ["H17" if self.dealer_hits_soft_17 else "S17",
+                 f"{payout.numerator}:{payout.denominator}",
+                 "DAS" if self.double_after_split else "NDAS",
+                 f"{self.max_split_hands} hands",
+                 f"{self.decks} deck{'s' if self.decks > 1 else ''}"]
+        if self.penetration is not None:
+            parts.append(f"{self.penetration:.0%}")
+        return " ".join(parts)
+
+
+DEFAULT_RULES = Rules()
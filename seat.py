@@ -0,0 +1,58 @@
+"""
+Seat class for one player's place at a blackjack table.
+"""
+
+from typing import List, Optional, Tuple
+
+from constants import STARTING_BANKROLL
+from hand import Hand
+
+
+class Seat:
+    """A player's bankroll, bet and hands at one position at the table.
+
+    Slotted so that full tables stay small and quick to simulate.
+    """
+
+    __slots__ = ('bankroll', 'current_bet', 'hands', 'current_hand_index', 'split_count', 'hand_payouts')
+
+    def __init__(self, bankroll: int = STARTING_BANKROLL):
+        self.bankroll = bankroll
+        self.current_bet = 0
+        self.hands: List[Hand] = []
+        self.current_hand_index = 0
+        self.split_count = 0
+        self.hand_payouts: List[int] = []
+
+    @property
+    def is_playing(self) -> bool:
+        """Whether the seat has a bet in the current round."""
+        return self.current_bet > 0
+
+    def get_current_hand(self) -> Optional[Hand]:
+        """Get the seat's hand being played, if any."""
+        if self.current_hand_index < len(self.hands):
+            return self.hands[self.current_hand_index]
+        return None
+
+    def clear(self) -> None:
+        """Clear the bet and hands for a new round."""
+        self.current_bet = 0
+        self.hands = []
+        self.current_hand_index = 0
+        self.split_count = 0
+        self.hand_payouts = []
+
+    def snapshot(self) -> Tuple:
+        """Capture the seat as an immutable tuple."""
+        return (self.bankroll, self.current_bet, tuple(hand.snapshot() for hand in self.hands),
+                self.current_hand_index, self.split_count, tuple(self.hand_payouts))
+
+    @classmethod
+    def from_snapshot(cls, state: Tuple) -> 'Seat':
+        """Create a seat from a state captured by snapshot."""
+        seat = cls.__new__(cls)
+        seat.bankroll, seat.current_bet, hands, seat.current_hand_index, seat.split_count, payouts = state
+        seat.hands = [Hand.from_snapshot(hand) for hand in hands]
+        seat.hand_payouts = list(payouts)
+        return seat
@@ -0,0 +1,291 @@
+"""
+Headless asyncio server hosting many blackjack tables at once.
+
+Every connection gets its own BlackjackGame table, and all tables share
+one event loop. Clients speak a line protocol over TCP or a Unix socket:
+
+    BET <amount> | DEAL | HIT | STAND | DOUBLE | SPLIT | NEW | STATE | QUIT
+
+Each command is answered with one line, either `OK <state>` or
+`ERR <reason>`, where the state is a JSON object. The dealer plays on
+loop timers set from time_until_dealer_action rather than by polling,
+so an idle table costs nothing. Each dealer action is pushed to the
+client as an unsolicited `EVENT <state>` line.
+
+Usage:
+    python server.py --port 8765
+    python server.py --unix /tmp/blackjack.sock
+    python server.py --load-test --clients 200 --rounds 50
+    python server.py --load-test --clients 2000 --rounds 2 --paced
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import random
+import time
+from typing import Dict, List, Optional
+
+from clock import LoopClock, TurboClock
+from game import BlackjackGame
+from profiler import nearest_rank
+from replay import BET, DEAL, DOUBLE, HIT, NEW_ROUND, SPLIT, STAND, apply_step
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# Pending connections the listener queues, so bursts of clients are not dropped and retried
+LISTEN_BACKLOG = 4096
+
+# Protocol commands that map directly onto session steps
+COMMANDS = {
+    'DEAL': DEAL,
+    'HIT': HIT,
+    'STAND': STAND,
+    'DOUBLE': DOUBLE,
+    'SPLIT': SPLIT,
+    'NEW': NEW_ROUND,
+}
+
+
+class Table:
+    """One connection's game and its pending dealer timer."""
+
+    __slots__ = ('table_id', 'game', 'writer', 'timer')
+
+    def __init__(self, table_id: int, game: BlackjackGame, writer: asyncio.StreamWriter):
+        self.table_id = table_id
+        self.game = game
+        self.writer = writer
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+def table_state(table: Table) -> Dict:
+    """The client's view of a table, with the dealer's hole card hidden."""
+    game = table.game
+    dealer_cards = [str(card) for card in game.dealer_hand.cards]
+    if game.hide_dealer_card and dealer_cards:
+        dealer_cards[0] = '?'
+    state = {
+        'table': table.table_id,
+        'state': game.state.value,
+        'bankroll': game.bankroll,
+        'bet': game.current_bet,
+        'hands': [{'cards': [str(card) for card in hand.cards], 'score': hand.calculate_score(),
+                   'bet': hand.bet, 'finished': hand.finished} for hand in game.player_hands],
+        'current_hand': game.current_hand_index,
+        'dealer': dealer_cards,
+    }
+    if not game.hide_dealer_card:
+        state['dealer_score'] = game.dealer_hand.calculate_score()
+    if game.message:
+        state['message'] = game.message
+    return state
+
+
+class TableServer:
+    """Runs a table per connection and paces every dealer with loop timers."""
+
+    def __init__(self, turbo: bool = False, seed: Optional[int] = None):
+        self.turbo = turbo
+        self.seed = seed
+        self.tables: Dict[int, Table] = {}
+        self._next_table_id = 0
+
+    def open_table(self, writer: asyncio.StreamWriter) -> Table:
+        """Create a table for a new connection."""
+        table_id = self._next_table_id
+        self._next_table_id += 1
+        rng = random.Random(self.seed + table_id) if self.seed is not None else None
+        clock = TurboClock() if self.turbo else LoopClock(asyncio.get_running_loop())
+        table = Table(table_id, BlackjackGame(rng, clock=clock), writer)
+        self.tables[table_id] = table
+        return table
+
+    def close_table(self, table: Table) -> None:
+        """Forget a table and cancel its dealer timer."""
+        if table.timer is not None:
+            table.timer.cancel()
+            table.timer = None
+        self.tables.pop(table.table_id, None)
+
+    def handle_command(self, table: Table, line: str) -> str:
+        """Run one protocol command and return the reply line."""
+        words = line.split()
+        if not words:
+            return "ERR empty command"
+        command = words[0].upper()
+
+        if command == 'BET':
+            if len(words) != 2 or not words[1].isdigit():
+                return "ERR usage: BET <amount>"
+            step = (BET, int(words[1]))
+        elif command in COMMANDS:
+            step = (COMMANDS[command],)
+        elif command == 'STATE':
+            step = None
+        else:
+            return f"ERR unknown command {words[0]}"
+
+        if step is not None:
+            try:
+                apply_step(table.game, step)
+            except ValueError:
+                return f"ERR cannot {command} while {table.game.state.value}"
+            self._schedule_dealer(table)
+        return "OK " + json.dumps(table_state(table), separators=(',', ':'))
+
+    def _schedule_dealer(self, table: Table) -> None:
+        """Set a timer for the dealer's next action, if it is the dealer's turn."""
+        if table.timer is not None:
+            return
+        delay = table.game.time_until_dealer_action()
+        if delay is not None:
+            table.timer = asyncio.get_running_loop().call_later(delay, self._dealer_due, table)
+
+    def _dealer_due(self, table: Table) -> None:
+        """Timer callback: take the dealer's due action and tell the client."""
+        table.timer = None
+        # Paced tables take one action per timer so the client sees every card
+        acted = table.game.update_dealer(None if self.turbo else 1)
+        if acted and not table.writer.is_closing():
+            table.writer.write(b"EVENT " + json.dumps(table_state(table), separators=(',', ':')).encode() + b"\n")
+        self._schedule_dealer(table)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one connection until it quits or disconnects."""
+        table = self.open_table(writer)
+        try:
+            async for raw_line in reader:
+                line = raw_line.decode(errors='replace').strip()
+                if line.upper() == 'QUIT':
+                    writer.write(b"OK bye\n")
+                    break
+                writer.write(self.handle_command(table, line).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.close_table(table)
+            writer.close()
+
+
+async def start(server: TableServer, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                unix_path: Optional[str] = None) -> asyncio.AbstractServer:
+    """Start listening on a TCP port, or on a Unix socket if a path is given."""
+    if unix_path is not None:
+        return await asyncio.start_unix_server(server.handle_client, path=unix_path, backlog=LISTEN_BACKLOG)
+    return await asyncio.start_server(server.handle_client, host, port, backlog=LISTEN_BACKLOG)
+
+
+async def _play_client(connect, rounds: int, bet: int, latencies: List[float]) -> int:
+    """Play rounds over one connection like the dealer would, timing every request.
+
+    Returns the number of rounds completed.
+    """
+    reader, writer = await connect()
+
+    async def request(command: str) -> Dict:
+        start_time = time.perf_counter()
+        writer.write(command.encode() + b"\n")
+        while True:
+            line = await reader.readline()
+            if not line.startswith(b"EVENT"):
+                break
+        latencies.append(time.perf_counter() - start_time)
+        if not line.startswith(b"OK"):
+            raise RuntimeError(f"{command} failed: {line.decode().strip()}")
+        return json.loads(line[3:])
+
+    async def wait_for_dealer(state: Dict) -> Dict:
+        while state['state'] == 'dealer_turn':
+            line = await reader.readline()
+            if line.startswith(b"EVENT"):
+                state = json.loads(line[6:])
+        return state
+
+    played = 0
+    try:
+        for _ in range(rounds):
+            state = await request("STATE")
+            if state['bankroll'] < bet:
+                break
+            await request(f"BET {bet}")
+            state = await request("DEAL")
+            while state['state'] == 'playing':
+                hand = state['hands'][state['current_hand']]
+                state = await request("HIT" if hand['score'] < 17 else "STAND")
+            await wait_for_dealer(state)
+            await request("NEW")
+            played += 1
+        writer.write(b"QUIT\n")
+        await reader.readline()
+    finally:
+        writer.close()
+    return played
+
+
+async def load_test(clients: int, rounds: int, bet: int = 10, turbo: bool = True,
+                    seed: Optional[int] = None, unix_path: Optional[str] = None) -> None:
+    """Serve tables and drive them with local client coroutines, printing request latencies."""
+    table_server = TableServer(turbo=turbo, seed=seed)
+    listener = await start(table_server, DEFAULT_HOST, 0, unix_path)
+    if unix_path is not None:
+        connect = functools.partial(asyncio.open_unix_connection, unix_path)
+    else:
+        port = listener.sockets[0].getsockname()[1]
+        connect = functools.partial(asyncio.open_connection, DEFAULT_HOST, port)
+
+    latencies: List[float] = []
+    start_time = time.perf_counter()
+    async with listener:
+        played = await asyncio.gather(*(_play_client(connect, rounds, bet, latencies) for _ in range(clients)))
+    elapsed = time.perf_counter() - start_time
+
+    ordered = sorted(latencies)
+    print(f"Clients:   {clients:,} ({sum(played):,} rounds)")
+    print(f"Requests:  {len(ordered):,} in {elapsed:.2f}s ({len(ordered) / elapsed:,.0f} requests/s)")
+    if ordered:
+        print("Latency:   " + "  ".join(f"p{percentile} {nearest_rank(ordered, percentile) * 1000:.2f} ms"
+                                        for percentile in (50, 95, 99))
+              + f"  max {ordered[-1] * 1000:.2f} ms")
+
+
+async def serve(host: str, port: int, unix_path: Optional[str], turbo: bool, seed: Optional[int]) -> None:
+    """Serve tables until interrupted."""
+    listener = await start(TableServer(turbo=turbo, seed=seed), host, port, unix_path)
+    where = unix_path if unix_path is not None else f"{host}:{port}"
+    print(f"Serving blackjack tables on {where}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Serve blackjack tables over a line protocol.")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="address to listen on")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="TCP port to listen on")
+    parser.add_argument('--unix', default=None, metavar='PATH', help="listen on a Unix socket instead of TCP")
+    parser.add_argument('--turbo', action='store_true', help="dealer plays instantly instead of at display pace")
+    parser.add_argument('--seed', type=int, default=None, help="seed table N's deck with SEED + N")
+    parser.add_argument('--load-test', action='store_true',
+                        help="run local clients against an in-process server and report latencies")
+    parser.add_argument('--clients', type=int, default=200, help="concurrent clients for --load-test")
+    parser.add_argument('--rounds', type=int, default=50, help="rounds per client for --load-test")
+    parser.add_argument('--paced', action='store_true', help="pace the dealer at display speed in --load-test")
+    args = parser.parse_args()
+
+    try:
+        if args.load_test:
+            if args.clients < 1 or args.rounds < 1:
+                parser.error("--clients and --rounds must be positive")
+            asyncio.run(load_test(args.clients, args.rounds, turbo=not args.paced, seed=args.seed,
+                                  unix_path=args.unix))
+        else:
+            asyncio.run(serve(args.host, args.port, args.unix, args.turbo, args.seed))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
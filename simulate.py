@@ -0,0 +1,216 @@
+"""
+Headless Monte Carlo simulation of the blackjack rules.
+
+Plays rounds through BlackjackGame without rendering or dealer delays,
+choosing each player action with a pluggable strategy function.
+
+Usage:
+    python simulate.py --rounds 1000000 --strategy mimic-dealer --seed 1
+    python simulate.py --rounds 100000 --history rounds.bjh
+"""
+
+import argparse
+import math
+import random
+import time
+from typing import Callable, Dict, Optional
+
+from card import Shoe
+from game import BlackjackGame
+from hand import Hand
+from hand_history import HandHistoryWriter
+
+# Strategy actions
+HIT = 'hit'
+STAND = 'stand'
+DOUBLE = 'double'
+SPLIT = 'split'
+
+# A strategy picks an action for the current hand of a game in the playing phase
+Strategy = Callable[[BlackjackGame, Hand], str]
+
+# Bankroll given to simulated players so a bet, double or split is never refused
+SIMULATION_BANKROLL = 10 ** 12
+
+
+def mimic_dealer_strategy(game: BlackjackGame, hand: Hand) -> str:
+    """Play like the dealer: hit below 17, never double or split."""
+    return HIT if hand.calculate_score() < 17 else STAND
+
+
+def never_bust_strategy(game: BlackjackGame, hand: Hand) -> str:
+    """Stand on any total that could bust with one more card."""
+    return HIT if hand.calculate_score() < 12 else STAND
+
+
+def basic_strategy(game: BlackjackGame, hand: Hand) -> str:
+    """Follow the precomputed basic strategy table."""
+    return game.get_advice().value
+
+
+STRATEGIES: Dict[str, Strategy] = {
+    'basic': basic_strategy,
+    'mimic-dealer': mimic_dealer_strategy,
+    'never-bust': never_bust_strategy,
+}
+
+
+class SimulationResult:
+    """Accumulated outcome of a batch of simulated rounds."""
+
+    def __init__(self, bet: int):
+        self.bet = bet
+        self.rounds = 0
+        self.hands = 0
+        self.wins = 0
+        self.losses = 0
+        self.pushes = 0
+        self.net = 0      # Total money won or lost
+        self.net_sq = 0   # Sum of squared per-round results, for the variance
+        self.elapsed = 0.0
+
+    def add_round(self, net: int, payouts, bets) -> None:
+        """Record the result of a single round."""
+        self.rounds += 1
+        self.net += net
+        self.net_sq += net * net
+        for payout, hand_bet in zip(payouts, bets):
+            self.hands += 1
+            if payout > hand_bet:
+                self.wins += 1
+            elif payout < hand_bet:
+                self.losses += 1
+            else:
+                self.pushes += 1
+
+    def merge(self, other: 'SimulationResult') -> None:
+        """Add another result for the same bet into this one. All counts merge exactly."""
+        if other.bet != self.bet:
+            raise ValueError("Cannot merge results for different bets")
+        self.rounds += other.rounds
+        self.hands += other.hands
+        self.wins += other.wins
+        self.losses += other.losses
+        self.pushes += other.pushes
+        self.net += other.net
+        self.net_sq += other.net_sq
+        self.elapsed += other.elapsed
+
+    @property
+    def ev(self) -> float:
+        """Expected value per round, in units of the initial bet."""
+        if self.rounds == 0:
+            return 0.0
+        return self.net / self.rounds / self.bet
+
+    @property
+    def variance(self) -> float:
+        """Variance of a single round's result, in squared units of the initial bet."""
+        if self.rounds < 2:
+            return 0.0
+        mean = self.net / self.rounds
+        return (self.net_sq - self.rounds * mean * mean) / (self.rounds - 1) / (self.bet * self.bet)
+
+    @property
+    def standard_error(self) -> float:
+        """Standard error of the EV estimate, in units of the initial bet."""
+        if self.rounds < 2:
+            return 0.0
+        return math.sqrt(self.variance / self.rounds)
+
+    @property
+    def rounds_per_second(self) -> float:
+        return self.rounds / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """Get a printable report of the results."""
+        hands = max(self.hands, 1)
+        return "\n".join([
+            f"Rounds:        {self.rounds:,} ({self.rounds_per_second:,.0f} rounds/s)",
+            f"Hands:         {self.hands:,}",
+            f"Win/Loss/Push: {self.wins / hands:.2%} / {self.losses / hands:.2%} / {self.pushes / hands:.2%}",
+            f"EV per round:  {self.ev:+.4%} of the initial bet (SE {self.standard_error:.4%})",
+            f"EV per hand:   {self.net / hands / self.bet:+.4%} of the initial bet",
+        ])
+
+
+def play_round(game: BlackjackGame, strategy: Strategy, bet: int) -> int:
+    """Play one full round with the given strategy at every seat. Returns the net result."""
+    start_bankroll = sum(seat.bankroll for seat in game.seats)
+    for seat_index in range(len(game.seats)):
+        game.place_bet(bet, seat_index)
+    game.deal_initial_cards()
+
+    while game.is_playing_phase:
+        hand = game.get_current_hand()
+        action = strategy(game, hand)
+        if action == HIT and game.can_hit():
+            game.hit()
+        elif action == STAND and game.can_stand():
+            game.stand()
+        elif action == DOUBLE and game.can_double_down():
+            game.double_down()
+        elif action == SPLIT and game.can_split():
+            game.split_hand()
+        else:
+            raise ValueError(f"Strategy chose an illegal action: {action!r}")
+
+    game.play_dealer()
+    return sum(seat.bankroll for seat in game.seats) - start_bankroll
+
+
+def simulate(rounds: int, strategy: Strategy, bet: int = 10,
+             rng: Optional[random.Random] = None, num_decks: Optional[int] = None,
+             history: Optional[HandHistoryWriter] = None, num_seats: int = 1) -> SimulationResult:
+    """Play a number of rounds headlessly and collect the results.
+
+    Uses a single deck like the game does, or a Shoe when num_decks is given.
+    With several seats every seat plays the strategy, and each seat's
+    result counts as one round. Every round is also logged to history if
+    a writer is given.
+    """
+    rng = rng if rng is not None else random.Random()
+    game = BlackjackGame(rng, Shoe(num_decks, rng=rng) if num_decks else None, num_seats=num_seats)
+    for seat in game.seats:
+        seat.bankroll = SIMULATION_BANKROLL
+    game.record_history(history)
+    result = SimulationResult(bet)
+
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        play_round(game, strategy, bet)
+        for seat in game.seats:
+            result.add_round(seat.bankroll - SIMULATION_BANKROLL, seat.hand_payouts,
+                             [hand.bet for hand in seat.hands])
+            seat.bankroll = SIMULATION_BANKROLL
+        game.new_round()
+    result.elapsed = time.perf_counter() - start_time
+
+    return result
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Simulate blackjack rounds without the UI.")
+    parser.add_argument('--rounds', type=int, default=100000, help="number of rounds to play")
+    parser.add_argument('--bet', type=int, default=10, help="initial bet per round (even, so 3:2 pays exactly)")
+    parser.add_argument('--seed', type=int, default=None, help="seed for the card shuffles")
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='mimic-dealer',
+                        help="player strategy")
+    parser.add_argument('--decks', type=int, default=None, help="deal from a shoe of this many decks")
+    parser.add_argument('--seats', type=int, default=1, help="players at the table, all playing the strategy")
+    parser.add_argument('--history', default=None, metavar='PATH', help="append every round to this hand history log")
+    args = parser.parse_args()
+
+    history = HandHistoryWriter(args.history) if args.history else None
+    try:
+        result = simulate(args.rounds, STRATEGIES[args.strategy], args.bet, random.Random(args.seed),
+                          args.decks, history, args.seats)
+    finally:
+        if history is not None:
+            history.close()
+    print(result.summary())
+
+
+if __name__ == "__main__":
+    main()
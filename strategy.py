@@ -0,0 +1,237 @@
+"""
+Basic strategy lookup tables for the blackjack game.
+
+A table is generated once per rules configuration from infinite-deck
+expected values. The dealer has no hole-card peek here, so a dealer
+blackjack only counts as 21 against the player's decisions. After that,
+advice is a couple of list lookups.
+"""
+
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from card import Card
+from constants import MAX_SPLIT_HANDS
+from hand import Hand
+
+
+class Action(Enum):
+    """A player decision. Values match the simulate.py strategy actions."""
+    HIT = "hit"
+    STAND = "stand"
+    DOUBLE = "double"
+    SPLIT = "split"
+
+
+# Probability of each card point value (2-11) with an infinite deck
+CARD_PROBABILITIES: Dict[int, float] = {points: 1 / 13 for points in range(2, 12)}
+CARD_PROBABILITIES[10] = 4 / 13
+
+DEALER_UP_CARDS = range(2, 12)
+MAX_TOTAL = 21
+
+
+def _cell(total: int, up: int) -> int:
+    """Flat table index for a (total, dealer up-card) cell."""
+    return total * 12 + up
+
+
+def _add_card(hard: int, has_ace: bool, points: int) -> Tuple[int, bool]:
+    """Add a card to a (hard total, has ace) hand state."""
+    if points == 11:
+        return hard + 1, True
+    return hard + points, has_ace
+
+
+def _score(hard: int, has_ace: bool) -> int:
+    return hard + 10 if has_ace and hard <= 11 else hard
+
+
+class _ExpectedValues:
+    """Infinite-deck expected values for every decision against one dealer up-card."""
+
+    def __init__(self, up: int, dealer_hits_soft_17: bool, max_split_hands: int, double_after_split: bool = True):
+        self.up = up
+        self.dealer_hits_soft_17 = dealer_hits_soft_17
+        self.max_split_hands = max_split_hands
+        self.double_after_split = double_after_split
+        self.dealer = self._dealer_outcomes()
+        self._hit_cache: Dict[Tuple[int, bool], float] = {}
+
+    def _dealer_outcomes(self) -> Dict[int, float]:
+        """Probabilities of the dealer's final total (22 means bust)."""
+        outcomes: Dict[int, float] = {}
+
+        def play(hard: int, has_ace: bool, probability: float) -> None:
+            score = _score(hard, has_ace)
+            soft = has_ace and hard <= 11
+            if score > MAX_TOTAL:
+                outcomes[22] = outcomes.get(22, 0.0) + probability
+            elif score > 17 or (score == 17 and not (soft and self.dealer_hits_soft_17)):
+                outcomes[score] = outcomes.get(score, 0.0) + probability
+            else:
+                for points, card_probability in CARD_PROBABILITIES.items():
+                    play(*_add_card(hard, has_ace, points), probability * card_probability)
+
+        play(*_add_card(0, False, self.up), 1.0)
+        return outcomes
+
+    def stand(self, score: int) -> float:
+        """EV of standing on a score."""
+        if score > MAX_TOTAL:
+            return -1.0
+        ev = 0.0
+        for dealer_score, probability in self.dealer.items():
+            if dealer_score > MAX_TOTAL or dealer_score < score:
+                ev += probability
+            elif dealer_score > score:
+                ev -= probability
+        return ev
+
+    def hit(self, hard: int, has_ace: bool) -> float:
+        """EV of hitting, then playing on with the better of hit and stand."""
+        key = (hard, has_ace)
+        if key not in self._hit_cache:
+            ev = 0.0
+            for points, probability in CARD_PROBABILITIES.items():
+                ev += probability * self._after_card(*_add_card(hard, has_ace, points))
+            self._hit_cache[key] = ev
+        return self._hit_cache[key]
+
+    def _after_card(self, hard: int, has_ace: bool) -> float:
+        score = _score(hard, has_ace)
+        if score > MAX_TOTAL:
+            return -1.0
+        if score == MAX_TOTAL:
+            # The game finishes a hand as soon as it reaches 21
+            return self.stand(score)
+        return max(self.stand(score), self.hit(hard, has_ace))
+
+    def double(self, hard: int, has_ace: bool) -> float:
+        """EV of doubling: twice the bet and exactly one more card."""
+        ev = 0.0
+        for points, probability in CARD_PROBABILITIES.items():
+            ev += probability * self.stand(_score(*_add_card(hard, has_ace, points)))
+        return 2 * ev
+
+    def best(self, hard: int, has_ace: bool, can_double: bool) -> Tuple[Action, float]:
+        """Best non-split action and its EV."""
+        score = _score(hard, has_ace)
+        choices = [(Action.STAND, self.stand(score))]
+        if score < MAX_TOTAL:
+            choices.append((Action.HIT, self.hit(hard, has_ace)))
+            if can_double:
+                choices.append((Action.DOUBLE, self.double(hard, has_ace)))
+        return max(choices, key=lambda choice: choice[1])
+
+    def split(self, points: int) -> float:
+        """EV of splitting a pair, approximating resplits independently per hand."""
+        def one_hand(resplits_left: int) -> float:
+            ev = 0.0
+            for drawn, probability in CARD_PROBABILITIES.items():
+                hard, has_ace = _add_card(*_add_card(0, False, points), drawn)
+                value = self.best(hard, has_ace, self.double_after_split)[1]
+                if drawn == points and resplits_left > 0:
+                    value = max(value, 2 * one_hand(resplits_left - 1))
+                ev += probability * value
+            return ev
+
+        return 2 * one_hand(self.max_split_hands - 2)
+
+
+class BasicStrategy:
+    """Precomputed basic strategy for one rules configuration."""
+
+    def __init__(self, dealer_hits_soft_17: bool = False, max_split_hands: int = MAX_SPLIT_HANDS,
+                 blackjack_payout: float = 1.5, double_after_split: bool = True):
+        self.dealer_hits_soft_17 = dealer_hits_soft_17
+        self.max_split_hands = max_split_hands
+        self.double_after_split = double_after_split
+        # Naturals are settled before any decision, so the payout only
+        # identifies the configuration and does not change the table
+        self.blackjack_payout = blackjack_payout
+
+        # Each cell holds (action without double, action with double)
+        size = _cell(MAX_TOTAL, 11) + 1
+        self._hard: List[Optional[Tuple[Action, Action]]] = [None] * size
+        self._soft: List[Optional[Tuple[Action, Action]]] = [None] * size
+        self._split: List[bool] = [False] * size
+        self._build()
+
+    def _build(self) -> None:
+        for up in DEALER_UP_CARDS:
+            ev = _ExpectedValues(up, self.dealer_hits_soft_17, self.max_split_hands, self.double_after_split)
+            for total in range(4, MAX_TOTAL + 1):
+                self._hard[_cell(total, up)] = (ev.best(total, False, False)[0],
+                                                ev.best(total, False, True)[0])
+            for total in range(12, MAX_TOTAL + 1):
+                self._soft[_cell(total, up)] = (ev.best(total - 10, True, False)[0],
+                                                ev.best(total - 10, True, True)[0])
+            if self.max_split_hands > 1:
+                for points in range(2, 12):
+                    hard, has_ace = _add_card(*_add_card(0, False, points), points)
+                    self._split[_cell(points, up)] = (
+                        ev.split(points) > ev.best(hard, has_ace, can_double=True)[1])
+
+    def lookup(self, total: int, soft: bool, dealer_up: int, can_double: bool = True,
+               can_split: bool = False, pair_points: int = 0) -> Action:
+        """Get the correct play for a total against a dealer up-card value (2-11)."""
+        if can_split and self._split[_cell(pair_points, dealer_up)]:
+            return Action.SPLIT
+        table = self._soft if soft else self._hard
+        return table[_cell(total, dealer_up)][can_double]
+
+    def advise(self, hand: Hand, dealer_up_card: Card, can_double: bool, can_split: bool) -> Action:
+        """Get the correct play for a hand."""
+        return self.lookup(hand.calculate_score(), hand.is_soft(), dealer_up_card.points,
+                           can_double, can_split, hand.cards[0].points)
+
+    def to_batch_table(self):
+        """Export as a batch_sim strategy table (requires NumPy). Pairs are played as totals."""
+        from batch_sim import (ACTION_DOUBLE, ACTION_DOUBLE_OR_STAND, ACTION_HIT, ACTION_STAND,
+                               make_strategy_table)
+
+        def choose(total: int, soft: bool, up: int) -> int:
+            cell = (self._soft if soft else self._hard)[_cell(total, up)]
+            if cell is None:
+                # Soft totals below 12 cannot occur
+                return ACTION_STAND
+            without_double, with_double = cell
+            if with_double == Action.DOUBLE:
+                return ACTION_DOUBLE_OR_STAND if without_double == Action.STAND else ACTION_DOUBLE
+            return ACTION_HIT if without_double == Action.HIT else ACTION_STAND
+
+        return make_strategy_table(choose)
+
+    def format_table(self) -> str:
+        """Get a printable chart of the strategy."""
+        codes = {Action.HIT: 'H', Action.STAND: 'S', Action.DOUBLE: 'D', Action.SPLIT: 'P'}
+        lines = ["       " + " ".join(f"{'A' if up == 11 else up:>2}" for up in DEALER_UP_CARDS)]
+        for label, table, totals in (("Hard", self._hard, range(5, 21)),
+                                     ("Soft", self._soft, range(13, 21))):
+            for total in totals:
+                cells = []
+                for up in DEALER_UP_CARDS:
+                    without_double, with_double = table[_cell(total, up)]
+                    code = codes[with_double]
+                    if with_double == Action.DOUBLE and without_double == Action.STAND:
+                        code = 'Ds'
+                    cells.append(f"{code:>2}")
+                lines.append(f"{label} {total:>2} " + " ".join(cells))
+        for points in range(2, 12):
+            name = 'A' if points == 11 else str(points)
+            cells = ['P' if self._split[_cell(points, up)] else '-' for up in DEALER_UP_CARDS]
+            lines.append(f"Pair {name:>2} " + " ".join(f"{cell:>2}" for cell in cells))
+        return "\n".join(lines)
+
+
+@lru_cache(maxsize=None)
+def get_basic_strategy(dealer_hits_soft_17: bool = False, max_split_hands: int = MAX_SPLIT_HANDS,
+                       blackjack_payout: float = 1.5, double_after_split: bool = True) -> BasicStrategy:
+    """Get the basic strategy for a rules configuration, generating it on first use."""
+    return BasicStrategy(dealer_hits_soft_17, max_split_hands, blackjack_payout, double_after_split)
+
+
+if __name__ == "__main__":
+    print(get_basic_strategy().format_table())
@@ -0,0 +1,175 @@
+"""
+House edge of basic strategy across combinations of table rules.
+
+Every combination of the chosen rule values is simulated on all cores,
+in fixed-size chunks seeded like parallel_sim.py. Chunk i of every
+variant uses the same RNG stream, so the variants are compared on the
+same shuffles as far as their rules allow.
+
+The blackjack payout never changes how a round is played, only what a
+winning natural pays. So each variant is simulated once at 3:2 and
+re-priced for every other payout from a count of the rounds won with a
+natural. The totals and the sum of squares are adjusted exactly, so the
+confidence intervals stay correct.
+
+Usage:
+    python sweep.py --rounds 200000 --seed 1
+    python sweep.py --h17 both --payouts 3:2,6:5 --das both --splits 2,4 --decks 1,2,6 --penetration 0.5,0.75
+"""
+
+import argparse
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from typing import Dict, List, Optional, Sequence
+
+from game import BlackjackGame
+from parallel_sim import DEFAULT_CHUNK_SIZE, chunk_rng
+from rules import THREE_TO_TWO, Rules, parse_payout
+from simulate import SIMULATION_BANKROLL, STRATEGIES, SimulationResult, play_round
+
+CONFIDENCE_Z = 1.96  # 95% confidence intervals
+
+
+class SweepResult(SimulationResult):
+    """Simulation totals that can be re-priced for another blackjack payout."""
+
+    def __init__(self, bet: int):
+        super().__init__(bet)
+        self.naturals = 0     # Rounds won with a natural
+        self.natural_net = 0  # Sum of the net results of those rounds
+
+    def add_natural(self, net: int) -> None:
+        """Note that the round just added was won with a natural."""
+        self.naturals += 1
+        self.natural_net += net
+
+    def merge(self, other: 'SweepResult') -> None:
+        super().merge(other)
+        self.naturals += other.naturals
+        self.natural_net += other.natural_net
+
+    def repriced(self, played: Rules, payout: Fraction) -> SimulationResult:
+        """The result the same rounds would have had with naturals paying `payout`."""
+        difference = (played._replace(blackjack_payout=payout).blackjack_winnings(self.bet)
+                      - played.blackjack_winnings(self.bet))
+        result = SimulationResult(self.bet)
+        for name in ('rounds', 'hands', 'wins', 'losses', 'pushes', 'elapsed'):
+            setattr(result, name, getattr(self, name))
+        # Each natural round's net moves by the same difference: (x + d)^2 = x^2 + 2dx + d^2
+        result.net = self.net + self.naturals * difference
+        result.net_sq = self.net_sq + 2 * difference * self.natural_net + difference * difference * self.naturals
+        return result
+
+
+def run_variant_chunk(rules: Rules, master_seed: int, chunk_index: int, rounds: int, bet: int) -> SweepResult:
+    """Play one chunk of basic strategy rounds under a rule set. Runs inside a worker process."""
+    rng = chunk_rng(master_seed, chunk_index)
+    game = BlackjackGame(rng, rules.make_deck(rng), rules=rules)
+    seat = game.seat
+    seat.bankroll = SIMULATION_BANKROLL
+    strategy = STRATEGIES['basic']
+    result = SweepResult(bet)
+
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        play_round(game, strategy, bet)
+        net = seat.bankroll - SIMULATION_BANKROLL
+        result.add_round(net, seat.hand_payouts, [hand.bet for hand in seat.hands])
+        if seat.hands[0].blackjack and not game.dealer_hand.is_blackjack():
+            result.add_natural(net)
+        seat.bankroll = SIMULATION_BANKROLL
+        game.new_round()
+    result.elapsed = time.perf_counter() - start_time
+    return result
+
+
+def sweep(variants: Sequence[Rules], rounds: int, master_seed: int, bet: int = 10,
+          workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[Rules, SimulationResult]:
+    """Simulate every rule variant, playing variants that differ only in payout just once."""
+    played: Dict[Rules, SweepResult] = {}
+    for rules in variants:
+        played.setdefault(rules._replace(blackjack_payout=THREE_TO_TWO), SweepResult(bet))
+
+    chunk_sizes = [min(chunk_size, rounds - start) for start in range(0, rounds, chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = [(rules, pool.submit(run_variant_chunk, rules, master_seed, chunk_index, size, bet))
+                   for rules in played for chunk_index, size in enumerate(chunk_sizes)]
+        for rules, future in futures:
+            played[rules].merge(future.result())
+
+    return {rules: played[rules._replace(blackjack_payout=THREE_TO_TWO)].repriced(
+                rules._replace(blackjack_payout=THREE_TO_TWO), rules.blackjack_payout)
+            for rules in variants}
+
+
+def format_table(results: Dict[Rules, SimulationResult]) -> str:
+    """One line per variant with its house edge and 95% confidence interval."""
+    lines = [f"{'Soft 17':<8} {'Payout':<7} {'DAS':<4} {'Splits':>6} {'Decks':>5} {'Pen.':>5} "
+             f"{'House edge':>11} {'95% CI':>9} {'Rounds':>11}"]
+    for rules, result in results.items():
+        payout = rules.blackjack_payout
+        penetration = f"{rules.penetration:.0%}" if rules.penetration is not None else "-"
+        lines.append(f"{'hits' if rules.dealer_hits_soft_17 else 'stands':<8} "
+                     f"{f'{payout.numerator}:{payout.denominator}':<7} "
+                     f"{'yes' if rules.double_after_split else 'no':<4} "
+                     f"{rules.max_split_hands:>6} {rules.decks:>5} {penetration:>5} "
+                     f"{-result.ev:>+11.3%} {'±' + format(CONFIDENCE_Z * result.standard_error, '.3%'):>9} "
+                     f"{result.rounds:>11,}")
+    return "\n".join(lines)
+
+
+def _flags(choice: str) -> List[bool]:
+    return {'no': [False], 'yes': [True], 'both': [False, True]}[choice]
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Compare the house edge of rule variants on all cores.")
+    parser.add_argument('--rounds', type=int, default=100000, help="rounds per variant")
+    parser.add_argument('--seed', type=int, default=None, help="master seed (random if omitted)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="rounds per work unit")
+    parser.add_argument('--bet', type=int, default=10, help="initial bet (a multiple of 10 pays 3:2 and 6:5 exactly)")
+    parser.add_argument('--h17', choices=('no', 'yes', 'both'), default='both', help="dealer hits soft 17")
+    parser.add_argument('--payouts', default='3:2,6:5', help="comma-separated blackjack payouts")
+    parser.add_argument('--das', choices=('no', 'yes', 'both'), default='both', help="double after split")
+    parser.add_argument('--splits', default='4', help="comma-separated maximum hands after splitting")
+    parser.add_argument('--decks', default='1,6', help="comma-separated deck counts")
+    parser.add_argument('--penetration', default=None,
+                        help="comma-separated fractions dealt before reshuffling (default: the game's rule)")
+    args = parser.parse_args()
+
+    try:
+        payouts = [parse_payout(text) for text in args.payouts.split(',')]
+        splits = [int(text) for text in args.splits.split(',')]
+        decks = [int(text) for text in args.decks.split(',')]
+        penetrations = ([float(text) for text in args.penetration.split(',')]
+                        if args.penetration else [None])
+    except (ValueError, ZeroDivisionError) as e:
+        parser.error(f"Bad rule value: {e}")
+    if args.rounds < 2:
+        parser.error("--rounds must be at least 2")
+    if any(count < 1 for count in decks) or any(hands < 1 for hands in splits):
+        parser.error("--decks and --splits must be positive")
+    if any(not 0 < penetration <= 1 for penetration in penetrations if penetration is not None):
+        parser.error("--penetration values must be between 0 and 1")
+
+    variants = [Rules(h17, payout, das, hands, count, penetration)
+                for h17, payout, das, hands, count, penetration in itertools.product(
+                    _flags(args.h17), payouts, _flags(args.das), splits, decks, penetrations)]
+    seed = args.seed if args.seed is not None else random.SystemRandom().randrange(2 ** 32)
+
+    start_time = time.perf_counter()
+    results = sweep(variants, args.rounds, seed, args.bet, args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - start_time
+    played = len({rules._replace(blackjack_payout=THREE_TO_TWO) for rules in variants})
+    print(f"Master seed: {seed} ({len(variants)} variants, {played} simulated, {elapsed:.1f}s)")
+    print(format_table(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Timer-heap scheduler for running many tables from one loop.
+
+Calling update_dealer on every game every tick costs O(tables) even
+though almost no table is in the dealer's turn at any moment. The
+TableManager instead keeps a heap of (due time, sequence, table id,
+version) entries, one per table with something pending: the dealer's
+reveal or next draw, or a round timeout for an idle player. A tick pops
+only the entries that are due, so its cost scales with the number of
+events rather than with the number of tables.
+
+Entries are never removed from the middle of the heap. Rescheduling a
+table bumps its version and pushes a new entry, and stale entries are
+skipped when they surface.
+
+Usage:
+    python table_manager.py --tables 10000 --frames 600
+"""
+
+import argparse
+import heapq
+import itertools
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from clock import Clock, ManualClock, SystemClock
+from game import BlackjackGame, GameState
+
+# Events passed to the notify hook
+DEALER = 'dealer'
+TIMEOUT = 'timeout'
+
+# Called with (table id, game, event) after the manager acts on a table
+Notify = Callable[[int, BlackjackGame, str], None]
+
+
+class _Table:
+    """A managed game, its schedule version and when its player last acted."""
+
+    __slots__ = ('game', 'version', 'last_action')
+
+    def __init__(self, game: BlackjackGame, now: float):
+        self.game = game
+        self.version = 0
+        self.last_action = now
+
+
+class TableManager:
+    """Advances many games, doing work only for tables whose next action is due."""
+
+    def __init__(self, clock: Optional[Clock] = None, round_timeout: Optional[float] = None,
+                 notify: Optional[Notify] = None):
+        self.clock = clock if clock is not None else SystemClock()
+        self.round_timeout = round_timeout
+        self.notify = notify
+        self.tables: Dict[int, _Table] = {}
+        self._heap: List[Tuple[float, int, int, int]] = []
+        self._sequence = itertools.count()  # Breaks ties so equal due times pop in order
+        self._next_table_id = 0
+
+    def add_table(self, game: Optional[BlackjackGame] = None, rng: Optional[random.Random] = None) -> int:
+        """Manage a game, creating one on the manager's clock if none is given. Returns its table id."""
+        if game is None:
+            game = BlackjackGame(rng, clock=self.clock)
+        table_id = self._next_table_id
+        self._next_table_id += 1
+        self.tables[table_id] = _Table(game, self.clock.now())
+        self._schedule(table_id)
+        return table_id
+
+    def remove_table(self, table_id: int) -> BlackjackGame:
+        """Stop managing a table. Its heap entries become stale."""
+        return self.tables.pop(table_id).game
+
+    def game(self, table_id: int) -> BlackjackGame:
+        """The game at a table."""
+        return self.tables[table_id].game
+
+    def touch(self, table_id: int) -> None:
+        """Reschedule a table after its player acted on the game directly."""
+        self.tables[table_id].last_action = self.clock.now()
+        self._schedule(table_id)
+
+    def _next_due(self, table: _Table) -> Optional[float]:
+        """When the table next needs attention, or None if it is waiting on its player indefinitely."""
+        delay = table.game.time_until_dealer_action()
+        if delay is not None:
+            return self.clock.now() + delay
+        if self.round_timeout is not None and table.game.state in (GameState.PLAYING, GameState.ROUND_COMPLETE):
+            return table.last_action + self.round_timeout
+        return None
+
+    def _schedule(self, table_id: int) -> None:
+        table = self.tables[table_id]
+        table.version += 1
+        due = self._next_due(table)
+        if due is not None:
+            heapq.heappush(self._heap, (due, next(self._sequence), table_id, table.version))
+            # Drop stale entries once they outnumber live ones, so the heap stays O(tables)
+            if len(self._heap) > 2 * len(self.tables) + 64:
+                self._compact()
+
+    def _compact(self) -> None:
+        tables = self.tables
+        self._heap = [entry for entry in self._heap
+                      if entry[2] in tables and tables[entry[2]].version == entry[3]]
+        heapq.heapify(self._heap)
+
+    def next_due_time(self) -> Optional[float]:
+        """Time of the earliest pending action, or None if nothing is scheduled."""
+        heap = self._heap
+        tables = self.tables
+        while heap:
+            _, _, table_id, version = heap[0]
+            table = tables.get(table_id)
+            if table is not None and table.version == version:
+                return heap[0][0]
+            heapq.heappop(heap)
+        return None
+
+    def tick(self) -> int:
+        """Run every action that is due. Returns the number of tables acted on."""
+        now = self.clock.now()
+        heap = self._heap
+        tables = self.tables
+        due = []
+        while heap and heap[0][0] <= now:
+            _, _, table_id, version = heapq.heappop(heap)
+            table = tables.get(table_id)
+            if table is not None and table.version == version:
+                due.append((table_id, table))
+            # Otherwise the table was rescheduled or removed since this entry was pushed
+        # Run after popping, so an action rescheduled for now waits for the next tick
+        for table_id, table in due:
+            self._run(table_id, table, now)
+        return len(due)
+
+    def _run(self, table_id: int, table: _Table, now: float) -> None:
+        """Take a table's due action, then schedule its next one."""
+        game = table.game
+        if game.state == GameState.DEALER_TURN:
+            game.update_dealer()
+            event = DEALER
+        elif game.state in (GameState.PLAYING, GameState.ROUND_COMPLETE):
+            # The player let the round time out: stand the hand, or clear a finished round
+            if game.state == GameState.PLAYING:
+                game.stand()
+            else:
+                game.new_round()
+            table.last_action = now
+            event = TIMEOUT
+        else:
+            event = None  # A table waiting for a bet never times out
+        self._schedule(table_id)
+        if event is not None and self.notify is not None:
+            self.notify(table_id, game, event)
+
+
+def _play_turn(game: BlackjackGame, bet: int) -> None:
+    """A bot's whole turn: start a round if needed and play it like the dealer."""
+    if game.is_round_complete:
+        game.new_round()
+    if game.is_betting_phase:
+        if game.bankroll < bet:
+            game.bankroll += 1000  # Keep the benchmark tables playing
+        game.place_bet(bet)
+        game.deal_initial_cards()
+    while game.is_playing_phase:
+        if game.get_current_hand().calculate_score() < 17:
+            game.hit()
+        else:
+            game.stand()
+
+
+def benchmark(tables: int, frames: int, turns_per_frame: int, seed: int = 1) -> None:
+    """Compare polling every table each frame with the timer heap, on identical play."""
+    frame_time = 1 / 60
+    results = {}
+    for mode in ('polling', 'heap'):
+        clock = ManualClock()
+        manager = TableManager(clock)
+        table_ids = [manager.add_table(rng=random.Random(seed + number)) for number in range(tables)]
+        games = [manager.game(table_id) for table_id in table_ids]
+        chooser = random.Random(seed)
+
+        tick_time = 0.0
+        for _ in range(frames):
+            clock.advance(frame_time)
+            for table_id in chooser.sample(table_ids, turns_per_frame):
+                game = games[table_id]
+                if not game.is_dealer_turn:
+                    _play_turn(game, 10)
+                    manager.touch(table_id)
+            start_time = time.perf_counter()
+            if mode == 'polling':
+                for game in games:
+                    game.update_dealer()
+            else:
+                manager.tick()
+            tick_time += time.perf_counter() - start_time
+        results[mode] = (tick_time, sum(game.bankroll for game in games))
+        print(f"{mode:<8} {tick_time / frames * 1e6:10.1f} us per tick")
+
+    if results['polling'][1] != results['heap'][1]:
+        print("Warning: the two modes ended with different bankrolls")
+    print(f"Speedup: {results['polling'][0] / max(results['heap'][0], 1e-9):.1f}x")
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Compare the timer-heap table manager with per-frame polling.")
+    parser.add_argument('--tables', type=int, default=10000, help="number of tables")
+    parser.add_argument('--frames', type=int, default=600, help="60 Hz frames to simulate")
+    parser.add_argument('--turns', type=int, default=20, help="tables whose player acts each frame")
+    parser.add_argument('--seed', type=int, default=1, help="random seed")
+    args = parser.parse_args()
+
+    if args.tables < 1 or args.frames < 1:
+        parser.error("--tables and --frames must be positive")
+    if not 0 <= args.turns <= args.tables:
+        parser.error("--turns must be between 0 and --tables")
+    benchmark(args.tables, args.frames, args.turns, args.seed)
+
+
+if __name__ == "__main__":
+    main()
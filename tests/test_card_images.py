@@ -0,0 +1,100 @@
+"""
+The shared card face cache: hit and miss accounting, and loading the atlas.
+"""
+
+import os
+
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+import card_images
+from card_images import CardImageCache
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    # Card image paths are relative to the repository root
+    monkeypatch.chdir(REPO_ROOT)
+    return CardImageCache()
+
+
+def test_first_lookup_misses_then_hits(cache):
+    face = cache.get('hearts', 'ace', (50, 72))
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    assert cache.get('hearts', 'ace', (50, 72)) is face
+    assert cache.get('hearts', 'ace', (50, 72)) is face
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert len(cache) == 1
+
+
+def test_each_size_is_cached_separately(cache):
+    small = cache.get('spades', 'king', (50, 72))
+    large = cache.get('spades', 'king', (100, 145))
+    assert small is not large
+    assert small.get_size() == (50, 72) and large.get_size() == (100, 145)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_preload_without_atlas_misses_once_per_card(cache):
+    assert not cache.preload((20, 29), use_atlas=False)
+    assert (cache.hits, cache.misses) == (0, 52)
+    cache.preload((20, 29), use_atlas=False)
+    assert (cache.hits, cache.misses) == (52, 52)
+
+
+def test_evict_and_clear_reset_the_counters(cache):
+    cache.get('clubs', '2', (50, 72))
+    cache.get('clubs', '3', (60, 87))
+    assert cache.evict_unused_sizes([(60, 87)]) == 1
+    assert cache.evictions == 1
+    assert len(cache) == 1
+
+    # An evicted face is loaded again on its next use
+    cache.get('clubs', '2', (50, 72))
+    assert cache.misses == 3
+
+    cache.clear()
+    assert (cache.hits, cache.misses, cache.evictions, len(cache)) == (0, 0, 0, 0)
+
+
+@pytest.mark.parametrize('contents', [
+    b'too short',
+    # The right length, but the wrong magic
+    b'BJATLAS0' + bytes(card_images.ATLAS_HEADER.size - 8 + 50 * 72 * 52 * 4),
+])
+def test_rejected_atlas_is_unmapped(tmp_path, monkeypatch, contents):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'cards').mkdir()
+    (tmp_path / card_images.atlas_path((50, 72))).write_bytes(contents)
+    mapped = []
+    real_mmap = card_images.mmap.mmap
+
+    def recording_mmap(*args, **kwargs):
+        mapped.append(real_mmap(*args, **kwargs))
+        return mapped[-1]
+
+    monkeypatch.setattr(card_images.mmap, 'mmap', recording_mmap)
+    assert not CardImageCache().load_atlas((50, 72))
+    assert len(mapped) == 1 and mapped[0].closed
+
+
+def test_game_ui_evicts_faces_of_other_sizes(monkeypatch):
+    monkeypatch.chdir(REPO_ROOT)
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+    from constants import CARD_HEIGHT, CARD_WIDTH
+    from ui import GameUI
+
+    pygame.init()
+    try:
+        screen = pygame.display.set_mode((200, 200))
+        card_images.card_images.get('hearts', 'ace', (20, 29))
+        GameUI(screen, use_atlas=False)
+        assert len(card_images.card_images) == 52
+        assert card_images.card_images.get('hearts', 'ace').get_size() == (CARD_WIDTH, CARD_HEIGHT)
+    finally:
+        card_images.card_images.clear()
+        pygame.quit()
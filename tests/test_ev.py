@@ -0,0 +1,64 @@
+"""
+Composition-dependent expected values and the caches behind them.
+"""
+
+import pytest
+
+import ev
+from card import CARDS, Card
+from hand import Hand
+from strategy import Action
+
+
+def unseen(hand: Hand, up: Card, decks: int = 1) -> int:
+    """Composition key of a fresh deck or shoe without the hand and up card."""
+    cards = list(CARDS) * decks
+    for card in hand.cards + [up]:
+        cards.remove(CARDS[card.index])
+    return ev.composition_key(cards)
+
+
+def query(values, up_value, decks=1, **options):
+    """EVs for a hand of the named values, each card of a different suit, against an up card."""
+    hand = Hand([Card(suit, value) for suit, value in zip(('hearts', 'clubs'), values)])
+    up = Card('spades', up_value)
+    return ev.expected_values(hand, up, unseen(hand, up, decks), **options)
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    ev.clear_caches()
+    yield
+    ev.clear_caches()
+
+
+def test_a_query_never_evicts_its_own_entries():
+    query(('2', '3'), 'ace', decks=6)
+    info = ev.cache_info()
+    for cache in info.values():
+        # Every miss is still cached, so nothing was worked out twice
+        assert cache.currsize == cache.misses < cache.maxsize
+
+
+def test_standing_on_twenty_against_a_six_wins():
+    values = query(('king', 'queen'), '6', can_double=False)
+    assert values[Action.STAND] > 0.6
+    assert values[Action.HIT] < -0.8
+    assert Action.DOUBLE not in values and Action.SPLIT not in values
+
+
+def test_split_follows_the_table_rules():
+    das = query(('8', '8'), '6', can_split=True)[Action.SPLIT]
+    no_das = query(('8', '8'), '6', can_split=True, double_after_split=False)[Action.SPLIT]
+    no_resplit = query(('8', '8'), '6', can_split=True, split_hands=2)[Action.SPLIT]
+    assert no_das < das
+    assert no_resplit < das
+    assert query(('8', '8'), '6', can_split=True, split_hands=2, double_after_split=False)[Action.SPLIT] < no_resplit
+
+
+def test_exact_draws_sets_how_far_the_dealer_follows_the_player():
+    exact = query(('2', '3'), '6', exact_draws=None)
+    default = query(('2', '3'), '6')
+    none = query(('2', '3'), '6', exact_draws=0)
+    assert exact[Action.STAND] == default[Action.STAND] == none[Action.STAND]
+    assert abs(default[Action.HIT] - exact[Action.HIT]) < abs(none[Action.HIT] - exact[Action.HIT]) < 0.05
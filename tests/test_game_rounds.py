@@ -0,0 +1,129 @@
+"""
+Full rounds played through BlackjackGame on zero-delay and manual clocks.
+"""
+
+import random
+
+import pytest
+
+from clock import ManualClock, TurboClock
+from constants import DEALER_PLAY_DELAY
+from game import BlackjackGame, GameState
+
+ROUNDS = 5000
+BANKROLL = 10 ** 9
+
+
+def play_random_round(game: BlackjackGame, chooser: random.Random, bet: int = 10) -> bool:
+    """Bet, deal and pick random legal actions until the player's turn is over.
+
+    Returns True if the dealer has a turn, False if a natural settled the round at the deal.
+    """
+    start = game.bankroll
+    assert game.place_bet(bet)
+    game.deal_initial_cards()
+    assert game.state in (GameState.PLAYING, GameState.ROUND_COMPLETE)
+    if game.is_round_complete:
+        assert game.player_hands[0].blackjack
+        return False
+
+    while game.is_playing_phase:
+        hand = game.get_current_hand()
+        assert hand is not None and not hand.finished
+        # Money is only ever moved between the bankroll and the bets on the table
+        assert game.bankroll + sum(hand.bet for hand in game.player_hands) == start
+
+        actions = [game.hit, game.stand]
+        if game.can_double_down():
+            actions.append(game.double_down)
+        if game.can_split():
+            actions.append(game.split_hand)
+        chooser.choice(actions)()
+
+    assert game.state == GameState.DEALER_TURN
+    assert all(hand.finished or hand.busted for hand in game.player_hands)
+    return True
+
+
+def test_turbo_rounds_conserve_money():
+    game = BlackjackGame(random.Random(1), clock=TurboClock())
+    game.bankroll = BANKROLL
+    chooser = random.Random(2)
+
+    for _ in range(ROUNDS):
+        start = game.bankroll
+        dealer_played = play_random_round(game, chooser)
+        # The zero-delay clock lets the dealer finish in one update
+        game.update_dealer()
+        assert game.state == GameState.ROUND_COMPLETE
+        assert not game.hide_dealer_card
+
+        if dealer_played:
+            assert game.dealer_hand.calculate_score() >= 17
+        assert len(game.hand_payouts) == len(game.player_hands)
+        for hand, payout in zip(game.player_hands, game.hand_payouts):
+            assert payout in (0, hand.bet, 2 * hand.bet, hand.bet * 5 // 2)
+        assert game.bankroll == start - sum(hand.bet for hand in game.player_hands) + sum(game.hand_payouts)
+
+        # A single deck never deals the same card twice in a round
+        cards = game.dealer_hand.cards + [card for hand in game.player_hands for card in hand.cards]
+        assert len(set(map(id, cards))) == len(cards)
+
+        game.new_round()
+        assert game.state == GameState.BETTING
+        assert game.current_bet == 0 and not game.player_hands
+
+
+def test_manual_clock_paces_the_dealer():
+    clock = ManualClock()
+    game = BlackjackGame(random.Random(5), clock=clock)
+    chooser = random.Random(6)
+
+    for _ in range(200):
+        if not play_random_round(game, chooser):
+            game.new_round()
+            continue
+
+        # Nothing happens until the delay has passed
+        assert game.time_until_dealer_action() == pytest.approx(DEALER_PLAY_DELAY)
+        game.update_dealer()
+        assert game.hide_dealer_card
+
+        steps = 0
+        while game.is_dealer_turn:
+            clock.advance(game.time_until_dealer_action())
+            game.update_dealer()
+            steps += 1
+            assert steps <= 12
+        assert not game.hide_dealer_card
+        assert game.time_until_dealer_action() is None
+        game.new_round()
+
+
+def test_game_over_when_broke():
+    game = BlackjackGame(random.Random(7), clock=TurboClock())
+    chooser = random.Random(8)
+    rounds = 0
+    while not game.is_game_over():
+        play_random_round(game, chooser, bet=min(100, game.bankroll))
+        game.update_dealer()
+        game.new_round()
+        rounds += 1
+        assert rounds < ROUNDS
+    assert game.bankroll == 0
+    assert not game.place_bet(10)
+
+
+def test_update_dealer_can_take_one_step_at_a_time():
+    game = BlackjackGame(random.Random(9), clock=TurboClock())
+    chooser = random.Random(10)
+    for _ in range(200):
+        if play_random_round(game, chooser):
+            steps = 0
+            while game.is_dealer_turn:
+                assert game.update_dealer(max_steps=1) == 1
+                steps += 1
+            # Reveal, one step per card drawn, then settle
+            assert steps == len(game.dealer_hand.cards)
+        assert game.update_dealer(max_steps=1) == 0
+        game.new_round()
@@ -0,0 +1,75 @@
+"""
+Hand scoring, and agreement between the batch simulator and the object model.
+"""
+
+import pytest
+
+from card import Card
+from hand import Hand
+
+
+def make_hand(*values, bet=0):
+    return Hand([Card('hearts', value) for value in values], bet)
+
+
+@pytest.mark.parametrize('values, score, soft', [
+    (('2', '3'), 5, False),
+    (('king', 'queen'), 20, False),
+    (('ace', '6'), 17, True),
+    (('ace', 'ace'), 12, True),
+    (('ace', 'ace', 'king'), 12, False),
+    (('ace', 'ace', '9'), 21, True),
+    (('ace', '5', 'king'), 16, False),
+    (('ace', 'ace', 'ace', 'ace', '7'), 21, True),
+    (('king', 'queen', '2'), 22, False),
+])
+def test_score(values, score, soft):
+    hand = make_hand(*values)
+    assert hand.calculate_score() == score
+    assert hand.is_soft() == soft
+    assert hand.is_bust() == (score > 21)
+
+
+def test_score_is_kept_up_as_cards_are_added():
+    hand = make_hand('ace')
+    for value, score in (('ace', 12), ('king', 12), ('9', 21), ('2', 23)):
+        hand.add_card(Card('spades', value))
+        assert hand.calculate_score() == score
+
+
+def test_blackjack_needs_exactly_two_cards():
+    assert make_hand('ace', 'king').is_blackjack()
+    assert make_hand('10', 'ace').is_blackjack()
+    assert not make_hand('ace', '5', '5').is_blackjack()
+    assert not make_hand('king', 'queen').is_blackjack()
+
+
+def test_split_moves_the_second_card_and_its_points():
+    hand = make_hand('ace', 'ace', bet=10)
+    other = hand.split()
+    assert hand.calculate_score() == other.calculate_score() == 11
+    assert other.bet == 10
+    hand.add_card(Card('clubs', 'king'))
+    assert hand.is_blackjack() and hand.calculate_score() == 21
+
+    with pytest.raises(ValueError):
+        make_hand('ace', 'king').split()
+
+
+def test_snapshot_round_trip():
+    hand = make_hand('ace', '7', bet=20)
+    hand.double_down()
+    copy = Hand.from_snapshot(hand.snapshot())
+    assert copy.cards == hand.cards and copy.cards is not hand.cards
+    assert (copy.bet, copy.doubled, copy.calculate_score(), copy.is_soft()) == (40, True, 18, True)
+
+
+@pytest.mark.parametrize('table', ['basic', 'mimic-dealer'])
+def test_batch_simulator_matches_the_game(table):
+    batch_sim = pytest.importorskip('batch_sim')
+    if table == 'basic':
+        from strategy import get_basic_strategy
+        strategy_table = get_basic_strategy().to_batch_table()
+    else:
+        strategy_table = batch_sim.mimic_dealer_table()
+    assert batch_sim.cross_check(3000, strategy_table, seed=11) == 0
@@ -0,0 +1,47 @@
+"""
+Writing and reading back the binary hand history log.
+"""
+
+import random
+
+import pytest
+
+import hand_history
+from clock import TurboClock
+from game import BlackjackGame
+from hand_history import HandHistoryWriter, read_rounds
+from simulate import STRATEGIES, play_round
+
+
+def test_rounds_read_back_as_written(tmp_path):
+    path = tmp_path / 'history.bjh'
+    game = BlackjackGame(random.Random(1), clock=TurboClock(), num_seats=3)
+    with HandHistoryWriter(str(path)) as writer:
+        game.record_history(writer)
+        nets = []
+        for _ in range(200):
+            nets.append(play_round(game, STRATEGIES['basic'], 10))
+            game.new_round()
+
+    records = list(read_rounds(str(path)))
+    assert [record.round_number for record in records] == list(range(200))
+    assert [record.net for record in records] == nets
+    assert records[-1].bankroll == sum(seat.bankroll for seat in game.seats)
+
+
+def test_a_round_may_hold_more_than_255_events(tmp_path):
+    path = tmp_path / 'history.bjh'
+    events = bytes([hand_history.HIT, 3]) * 300
+    with HandHistoryWriter(str(path)) as writer:
+        writer.write_round(10, 990, [(10, 0)], events)
+
+    (record,) = read_rounds(str(path))
+    assert len(record.events) == 300
+    assert record.events[0] == (hand_history.HIT, 3)
+
+
+def test_refuses_to_append_to_another_format(tmp_path):
+    path = tmp_path / 'history.bjh'
+    path.write_bytes(b'BJHH\x01' + bytes(30))
+    with pytest.raises(ValueError):
+        HandHistoryWriter(str(path))
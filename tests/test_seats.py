@@ -0,0 +1,113 @@
+"""
+Settlement at multi-seat tables, where every seat plays against one dealer and deck.
+"""
+
+import random
+from collections import Counter
+
+from card import CARDS, Shoe
+from clock import TurboClock
+from constants import MAX_SEATS
+from counting import CardCounter
+from game import BlackjackGame, GameState
+from rules import Rules
+
+BANKROLL = 10 ** 9
+
+
+def card(name: str):
+    value, _, suit = name.partition(' of ')
+    return next(card for card in CARDS if card.value == value and card.suit == suit)
+
+
+def stack_deck(game: BlackjackGame, *names: str) -> None:
+    """Arrange for the named cards to be dealt in order. Deck.draw pops from the end."""
+    game.deck.cards = [card(name) for name in reversed(names)]
+
+
+def test_each_seat_is_settled_against_the_dealer():
+    game = BlackjackGame(random.Random(1), clock=TurboClock(), num_seats=5)
+    stack_deck(game,
+               '10 of hearts', 'king of hearts', 'ace of hearts', '10 of spades', '9 of spades',  # First cards
+               'king of diamonds',                                                                # Hole card
+               '9 of hearts', 'jack of hearts', 'king of spades', '6 of hearts', '2 of hearts',   # Second cards
+               'queen of hearts',                                                                 # Up card
+               '8 of hearts', '10 of diamonds')                                                   # Draws
+    for index in range(5):
+        assert game.place_bet(10, index)
+    game.deal_initial_cards()
+
+    # The natural at seat 3 is skipped
+    assert game.current_seat_index == 0
+    game.stand()   # 19
+    game.stand()   # 20
+    assert game.current_seat_index == 3
+    game.hit()     # 16 + 8 busts
+    game.double_down()  # 11 + 10
+    assert game.state == GameState.DEALER_TURN
+
+    game.play_dealer()
+    assert game.dealer_hand.calculate_score() == 20
+    payouts = [seat.hand_payouts for seat in game.seats]
+    assert payouts == [[0], [10], [25], [0], [40]]
+    assert [seat.bankroll - 1000 for seat in game.seats] == [-10, 0, 15, -10, 20]
+
+
+def test_seats_without_a_bet_sit_out():
+    game = BlackjackGame(random.Random(2), clock=TurboClock(), num_seats=3)
+    game.place_bet(10, 1)
+    game.deal_initial_cards()
+    assert game.current_seat_index == 1 or game.is_round_complete
+    assert not game.seats[0].hands and not game.seats[2].hands
+    while game.is_playing_phase:
+        game.stand()
+    game.play_dealer()
+    assert game.seats[0].bankroll == game.seats[2].bankroll == 1000
+    assert len(game.seats[1].hand_payouts) == 1
+
+
+def test_full_table_never_redeals_cards_on_the_table():
+    # Without a reshuffle between rounds a single deck regularly runs dry mid-round
+    game = BlackjackGame(random.Random(3), clock=TurboClock(), num_seats=MAX_SEATS,
+                         rules=Rules(reshuffle_threshold=0))
+    game.deck.counter = CardCounter()
+    chooser = random.Random(4)
+    for seat in game.seats:
+        seat.bankroll = BANKROLL
+
+    for _ in range(2000):
+        for index in range(MAX_SEATS):
+            game.place_bet(10, index)
+        game.deal_initial_cards()
+        while game.is_playing_phase:
+            # Split whenever possible to use up as many cards as a round can
+            if game.can_split():
+                game.split_hand()
+            else:
+                chooser.choice((game.hit, game.stand))()
+        game.play_dealer()
+        assert game.state == GameState.ROUND_COMPLETE
+
+        cards = game.dealer_hand.cards + [card for seat in game.seats for hand in seat.hands for card in hand.cards]
+        assert len({card.index for card in cards}) == len(cards)
+        # Every card out of the deck has been seen and counted exactly once
+        assert sum(game.deck.counter.snapshot()) == 52 - game.deck.cards_remaining()
+
+        for seat in game.seats:
+            bets = sum(hand.bet for hand in seat.hands)
+            assert seat.bankroll == BANKROLL - bets + sum(seat.hand_payouts)
+            seat.bankroll = BANKROLL
+        game.new_round()
+
+
+def test_shoe_reshuffles_only_the_discards():
+    shoe = Shoe(2, 104, random.Random(5))
+    in_play = [shoe.draw() for _ in range(9)]
+    while shoe.cards_remaining():
+        shoe.draw()
+
+    shoe.reshuffle_discards(in_play)
+    assert shoe.cards_remaining() == 104 - len(in_play)
+    remaining = Counter(card.index for card in shoe.remaining_cards())
+    remaining.update(card.index for card in in_play)
+    assert set(remaining.values()) == {2}
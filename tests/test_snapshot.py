@@ -0,0 +1,109 @@
+"""
+Snapshots and forks of BlackjackGame play on exactly like the game they came from.
+"""
+
+import random
+
+import pytest
+
+from card import Shoe
+from clock import TurboClock
+from game import BlackjackGame
+from simulate import STRATEGIES, play_round
+
+ROUNDS = 400
+BANKROLL = 10 ** 9
+
+
+def make_game(deck_factory, seed: int) -> BlackjackGame:
+    rng = random.Random(seed)
+    game = BlackjackGame(rng, deck_factory(rng), clock=TurboClock())
+    game.bankroll = BANKROLL
+    return game
+
+
+def play_rounds(game: BlackjackGame, rounds: int = ROUNDS):
+    """Play basic strategy and record every round's net result and dealer cards."""
+    outcomes = []
+    for _ in range(rounds):
+        net = play_round(game, STRATEGIES['basic'], 10)
+        outcomes.append((net, tuple(card.index for card in game.dealer_hand.cards)))
+        game.new_round()
+    return outcomes
+
+
+DECKS = {
+    'deck': lambda rng: None,
+    'shoe': lambda rng: Shoe(2, 70, rng),
+}
+
+
+@pytest.mark.parametrize('deck', DECKS)
+def test_fork_plays_the_same_rounds_as_its_parent(deck):
+    game = make_game(DECKS[deck], 3)
+    play_rounds(game, 25)
+
+    fork = game.fork()
+    assert fork.deck is not game.deck
+    # Both games reshuffle many times, so this also checks the saved RNG state
+    assert play_rounds(fork) == play_rounds(game)
+
+
+@pytest.mark.parametrize('deck', DECKS)
+def test_restore_replays_from_a_snapshot(deck):
+    game = make_game(DECKS[deck], 4)
+    play_rounds(game, 10)
+    bankroll = game.bankroll
+    snapshot = game.snapshot()
+
+    first = play_rounds(game)
+    game.restore(snapshot)
+    assert game.bankroll == bankroll
+    assert play_rounds(game) == first
+
+
+def test_fork_mid_round_is_independent():
+    game = make_game(DECKS['shoe'], 5)
+    game.place_bet(10)
+    game.deal_initial_cards()
+    while not game.is_playing_phase:
+        game.new_round()
+        game.place_bet(10)
+        game.deal_initial_cards()
+
+    fork = game.fork()
+    remaining = fork.deck.remaining_cards()
+    fork.stand()
+    fork.play_dealer()
+
+    # The parent's round is untouched by the fork, and so is its shoe
+    assert game.is_playing_phase
+    assert game.deck.remaining_cards() == remaining
+    game.deck.shuffle()
+    # The fork has only dealt the dealer's extra cards
+    assert fork.deck.remaining_cards() == remaining[len(fork.dealer_hand.cards) - 2:]
+
+
+def test_shoe_shuffles_in_place_until_snapshotted():
+    shoe = Shoe(2, 70, random.Random(6))
+    order = shoe._order
+    shoe.shuffle()
+    assert shoe._order is order
+
+    shoe.snapshot()
+    shoe.shuffle()
+    assert shoe._order is not order
+
+
+def test_fork_counts_cards_on_its_own():
+    game = make_game(DECKS['deck'], 7)
+    early = game.snapshot()  # Taken before counting was switched on
+    game.enable_counting()
+    play_rounds(game, 3)
+    counts = game.deck.counter.snapshot()
+
+    for fork in (game.fork(), game.fork(early)):
+        fork.place_bet(10)
+        fork.deal_initial_cards()
+        assert game.deck.counter.snapshot() == counts
+    assert sum(game.fork(early).deck.counter.snapshot()) == 0
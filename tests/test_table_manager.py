@@ -0,0 +1,70 @@
+"""
+Timeouts and dealer pacing for many tables on one clock.
+"""
+
+import random
+
+from clock import ManualClock
+from game import GameState
+from table_manager import DEALER, TIMEOUT, TableManager
+
+TIMEOUT_SECONDS = 30.0
+
+
+def make_manager():
+    clock = ManualClock()
+    events = []
+    manager = TableManager(clock, TIMEOUT_SECONDS, lambda table_id, game, event: events.append(event))
+    return clock, manager, events
+
+
+def finish_round(clock, manager, table_id):
+    """Bet, stand on whatever is dealt and let the manager play the dealer out."""
+    game = manager.game(table_id)
+    game.place_bet(10)
+    game.deal_initial_cards()
+    if game.is_playing_phase:
+        game.stand()
+    manager.touch(table_id)
+    while game.is_dealer_turn:
+        clock.advance(manager.next_due_time() - clock.now())
+        manager.tick()
+    assert game.state == GameState.ROUND_COMPLETE
+
+
+def test_timeouts_stand_and_clear_finished_rounds():
+    clock, manager, events = make_manager()
+    table_id = manager.add_table(rng=random.Random(1))
+    game = manager.game(table_id)
+    game.place_bet(10)
+    game.deal_initial_cards()
+    manager.touch(table_id)
+    if game.is_playing_phase:
+        clock.advance(TIMEOUT_SECONDS)
+        manager.tick()
+        assert events[-1] == TIMEOUT and not game.is_playing_phase
+    while not game.is_round_complete:
+        clock.advance(manager.next_due_time() - clock.now())
+        manager.tick()
+        assert events[-1] == DEALER
+
+    clock.advance(TIMEOUT_SECONDS)
+    manager.tick()
+    assert events[-1] == TIMEOUT and game.is_betting_phase
+    assert manager.next_due_time() is None
+
+
+def test_a_table_taking_bets_never_times_out():
+    clock, manager, events = make_manager()
+    table_id = manager.add_table(rng=random.Random(2))
+    finish_round(clock, manager, table_id)
+    game = manager.game(table_id)
+
+    # The player starts the next round without telling the manager
+    game.new_round()
+    game.place_bet(25)
+    events.clear()
+    clock.advance(2 * TIMEOUT_SECONDS)
+    manager.tick()
+    assert game.is_betting_phase and game.current_bet == 25
+    assert events == []
@@ -2,7 +2,7 @@
 User interface components for the blackjack game.
 """
 
-from typing import Tuple, List
+from typing import Dict, Tuple, List, Optional
 import pygame
 
 from constants import (
@@ -10,6 +10,9 @@ from constants import (
     CARD_WIDTH, CARD_HEIGHT, WHITE, BLACK, GRAY, BLUE, GOLD, RED, GREEN
 )
 from hand import Hand
+from card_images import card_images
+from fonts import fonts, text_cache
+from strategy import Action
 
 
 class Button:
@@ -20,7 +23,7 @@ class Button:
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
         self.color = color
-        self.font = pygame.font.Font(None, 32)
+        self.font = fonts.get(32)
         self.enabled = True
 
     def draw(self, surface: pygame.Surface) -> None:
@@ -29,7 +32,7 @@ class Button:
         pygame.draw.rect(surface, color, self.rect)
         pygame.draw.rect(surface, BLACK, self.rect, 2)
         
-        text_surface = self.font.render(self.text, True, BLACK)
+        text_surface = text_cache.render(self.font, self.text, BLACK)
         text_rect = text_surface.get_rect(center=self.rect.center)
         surface.blit(text_surface, text_rect)
 
@@ -45,10 +48,25 @@ class Button:
 class GameUI:
     """Manages the game's user interface."""
     
-    def __init__(self, screen: pygame.Surface):
+    def __init__(self, screen: pygame.Surface, use_atlas: bool = True):
         self.screen = screen
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.font = fonts.get(36)
+        
+        # Load every card face now so dealing never waits on the disk, and
+        # drop faces another size left in the shared cache, since they are never drawn
+        self.used_atlas = card_images.preload((CARD_WIDTH, CARD_HEIGHT), use_atlas)
+        card_images.evict_unused_sizes([(CARD_WIDTH, CARD_HEIGHT)])
+        self.small_font = fonts.get(24)
+        self.mono_font: Optional[pygame.font.Font] = None
+        
+        # Horizontal bands of the table that are redrawn independently.
+        # Each band holds everything drawn within its rows in any phase.
+        self.regions = {
+            'top': pygame.Rect(0, 0, WINDOW_WIDTH, 260),            # Dealer, bankroll, hand indicator
+            'middle': pygame.Rect(0, 260, WINDOW_WIDTH, 178),       # Messages, instructions, play again
+            'hands': pygame.Rect(0, 438, WINDOW_WIDTH, 222),        # Player hands, bet buttons, hint
+            'bottom': pygame.Rect(0, 660, WINDOW_WIDTH, WINDOW_HEIGHT - 660),  # Action buttons, counts
+        }
         
         # Create buttons
         self._create_buttons()
@@ -82,8 +100,8 @@ class GameUI:
 
     def draw_bankroll_info(self, bankroll: int, current_bet: int, is_betting_phase: bool = False) -> None:
         """Draw bankroll and bet information with dynamic positioning."""
-        bankroll_text = self.font.render(f"Bankroll: ${bankroll}", True, WHITE)
-        bet_text = self.font.render(f"Current Bet: ${current_bet}", True, WHITE)
+        bankroll_text = text_cache.render(self.font, f"Bankroll: ${bankroll}", WHITE)
+        bet_text = text_cache.render(self.font, f"Current Bet: ${current_bet}", WHITE)
         
         if is_betting_phase:
             # Center the info during betting phase for better visibility
@@ -98,7 +116,7 @@ class GameUI:
 
     def draw_betting_instructions(self) -> None:
         """Draw betting phase instructions."""
-        instruction_text = self.font.render("Place your bet and click Deal Cards!", True, WHITE)
+        instruction_text = text_cache.render(self.font, "Place your bet and click Deal Cards!", WHITE)
         instruction_rect = instruction_text.get_rect(center=(WINDOW_WIDTH//2, 320))
         self.screen.blit(instruction_text, instruction_rect)
 
@@ -114,7 +132,7 @@ class GameUI:
                 # Add some pattern to make it look like a card back
                 pygame.draw.rect(self.screen, WHITE, (x_pos + 10, y_pos + 10, CARD_WIDTH - 20, CARD_HEIGHT - 20), 2)
             else:
-                self.screen.blit(card.image, (x_pos, y_pos))
+                self.screen.blit(card_images.get_card(card), (x_pos, y_pos))
 
     def draw_player_hands(self, player_hands: List[Hand], current_hand_index: int, 
                          dealer_revealing: bool) -> None:
@@ -139,7 +157,7 @@ class GameUI:
         
         # Draw cards
         for i, card in enumerate(hand.cards):
-            self.screen.blit(card.image, (x_pos + i * (CARD_WIDTH + 10), y_pos))
+            self.screen.blit(card_images.get_card(card), (x_pos + i * (CARD_WIDTH + 10), y_pos))
         
         # Draw hand info
         self._draw_hand_info(hand, x_pos, y_pos, single_hand=True)
@@ -167,7 +185,7 @@ class GameUI:
             for i, card in enumerate(hand.cards):
                 card_x = x_pos + i * card_spacing
                 if card_x + CARD_WIDTH <= x_pos + hand_width - 20:
-                    self.screen.blit(card.image, (card_x, y_pos))
+                    self.screen.blit(card_images.get_card(card), (card_x, y_pos))
             
             # Draw hand info
             self._draw_hand_info(hand, x_pos, y_pos, single_hand=False, hand_index=hand_idx)
@@ -180,15 +198,15 @@ class GameUI:
         status_text = f" ({status})" if status else ""
         
         if single_hand:
-            hand_text = self.small_font.render(f"Score: {hand_score}{status_text} | Bet: ${hand.bet}", 
-                                             True, WHITE)
+            hand_text = text_cache.render(self.small_font, f"Score: {hand_score}{status_text} | Bet: ${hand.bet}", 
+                                          WHITE)
             self.screen.blit(hand_text, (x_pos, y_pos + CARD_HEIGHT + 5))
         else:
             # Shorter text for multiple hands
             short_status = self._get_short_status(status)
-            hand_text = self.small_font.render(f"H{hand_index + 1}: {hand_score}{short_status}", 
-                                             True, WHITE)
-            bet_text = self.small_font.render(f"${hand.bet}", True, WHITE)
+            hand_text = text_cache.render(self.small_font, f"H{hand_index + 1}: {hand_score}{short_status}", 
+                                          WHITE)
+            bet_text = text_cache.render(self.small_font, f"${hand.bet}", WHITE)
             self.screen.blit(hand_text, (x_pos, y_pos + CARD_HEIGHT + 5))
             self.screen.blit(bet_text, (x_pos, y_pos + CARD_HEIGHT + 25))
 
@@ -205,12 +223,12 @@ class GameUI:
     def draw_dealer_info(self, dealer_hand: Hand, card_revealed: bool) -> None:
         """Draw dealer score information."""
         dealer_score = dealer_hand.calculate_score() if card_revealed else "?"
-        dealer_text = self.font.render(f"Dealer: {dealer_score}", True, WHITE)
+        dealer_text = text_cache.render(self.font, f"Dealer: {dealer_score}", WHITE)
         self.screen.blit(dealer_text, (50, 20))
 
     def draw_current_hand_indicator(self, current_hand_index: int) -> None:
         """Draw indicator for which hand is currently being played."""
-        current_hand_text = self.small_font.render(f"Playing Hand {current_hand_index + 1}", True, WHITE)
+        current_hand_text = text_cache.render(self.small_font, f"Playing Hand {current_hand_index + 1}", WHITE)
         self.screen.blit(current_hand_text, (WINDOW_WIDTH - 200, 100))
 
     def draw_message(self, message: str) -> None:
@@ -222,17 +240,39 @@ class GameUI:
         if len(message) > 40:
             parts = message.split(" | ")
             for i, part in enumerate(parts):
-                message_text = self.small_font.render(part, True, WHITE)
+                message_text = text_cache.render(self.small_font, part, WHITE)
                 message_rect = message_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 - 120 + i * 25))
                 self.screen.blit(message_text, message_rect)
         else:
-            message_text = self.font.render(message, True, WHITE)
+            message_text = text_cache.render(self.font, message, WHITE)
             message_rect = message_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 - 120))
             self.screen.blit(message_text, message_rect)
 
+    def draw_hint(self, action: Optional[Action]) -> None:
+        """Draw the basic strategy hint above the action buttons."""
+        if action is None:
+            return
+        
+        hint_text = text_cache.render(self.small_font, f"Hint: {action.value.title()}", GOLD)
+        self.screen.blit(hint_text, (50, WINDOW_HEIGHT - 130))
+
+    def draw_counts(self, counts: Dict[str, Tuple[int, float]]) -> None:
+        """Draw the running and true counts in the bottom right corner."""
+        for i, (name, (running, true)) in enumerate(counts.items()):
+            count_text = text_cache.render(self.small_font, f"{name}: {running:+d} (TC {true:+.1f})", WHITE)
+            self.screen.blit(count_text, (WINDOW_WIDTH - 200, WINDOW_HEIGHT - 90 + i * 25))
+
+    def draw_profile(self, lines: List[str]) -> None:
+        """Draw the frame profiler readout on the left of the table."""
+        if self.mono_font is None:
+            # Looked up on first use, since matching system fonts is slow
+            self.mono_font = fonts.get(16, pygame.font.match_font('monospace'))
+        for i, line in enumerate(lines):
+            self.screen.blit(text_cache.render(self.mono_font, line, WHITE), (10, 300 + i * 16))
+
     def draw_game_over(self) -> None:
         """Draw game over message."""
-        game_over_text = self.font.render("Game Over! No money left!", True, RED)
+        game_over_text = text_cache.render(self.font, "Game Over! No money left!", RED)
         game_over_rect = game_over_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2))
         self.screen.blit(game_over_text, game_over_rect)
 